@@ -0,0 +1,138 @@
+import os
+import random
+import argparse
+
+import docx
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+
+# Base document that defines the custom styles (Contacto, Key Relevance, Bullet...)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_PATH = os.path.join(PROJECT_ROOT, "cv_template", "template.docx")
+
+DEFAULT_SIZES = [10, 100, 1000]
+
+WORDS = (
+    "python sql data pipelines airflow spark analytics dashboards stakeholders reporting cloud aws "
+    "docker kubernetes machine learning models forecasting optimization automation testing api "
+    "design delivery leadership mentoring budget customers growth revenue latency reliability"
+).split()
+
+
+# ---- Helpers ----
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:]
+
+
+def _add_run(paragraph, text: str, bold: bool = False, italic: bool = False) -> None:
+    run = paragraph.add_run(text)
+    # Only write <w:b>/<w:i> when set, like Word does (the converter treats any <w:b> as bold)
+    if bold:
+        run.bold = True
+    if italic:
+        run.italic = True
+
+
+def _add_hyperlink(paragraph, text: str, url: str) -> None:
+    r_id = paragraph.part.relate_to(url, RT.HYPERLINK, is_external=True)
+    hyperlink = OxmlElement("w:hyperlink")
+    hyperlink.set(qn("r:id"), r_id)
+    run = OxmlElement("w:r")
+    text_el = OxmlElement("w:t")
+    text_el.text = text
+    run.append(text_el)
+    hyperlink.append(run)
+    paragraph._p.append(hyperlink)
+
+
+def _clear_body(document) -> None:
+    body = document.element.body
+    for child in list(body):
+        if child.tag != qn("w:sectPr"):
+            body.remove(child)
+
+
+# ---- Corpus ----
+
+def generate_resume(path: str, entries: int, seed: int = 0) -> str:
+    """
+    Write a synthetic resume with `entries` experience entries.
+
+    Every entry has a Key Relevance title, a company line with italic and bold
+    runs, and Bullet paragraphs (one with a hyperlink). A skills table is added
+    every ten entries.
+
+    Returns:
+        str: Path to the generated .docx file.
+    """
+    rng = random.Random(seed)
+    document = docx.Document(TEMPLATE_PATH)
+    _clear_body(document)
+
+    document.add_paragraph("Jane Benchmark", style="Heading 1")
+    contact = document.add_paragraph("jane@example.com · +34 600 000 000 · ", style="Contacto")
+    _add_hyperlink(contact, "linkedin.com/in/jane", "https://linkedin.com/in/jane")
+
+    document.add_paragraph("Summary", style="Heading 2")
+    document.add_paragraph(_sentence(rng, 40) + ".", style="Normal")
+
+    document.add_paragraph("Experience", style="Heading 2")
+    for i in range(entries):
+        document.add_paragraph(f"Senior Engineer {i}", style="Key Relevance")
+        company = document.add_paragraph(style="Normal")
+        _add_run(company, f"Company {i}", italic=True)
+        _add_run(company, " · ")
+        _add_run(company, f"{2000 + i % 25} - {2001 + i % 25}", bold=True)
+        for j in range(4):
+            bullet = document.add_paragraph(style="Bullet")
+            _add_run(bullet, _sentence(rng, 6) + " ")
+            _add_run(bullet, rng.choice(WORDS), bold=True)
+            _add_run(bullet, " " + _sentence(rng, 8).lower())
+            if j == 0:
+                _add_run(bullet, " (")
+                _add_hyperlink(bullet, "case study", f"https://example.com/case/{i}")
+                _add_run(bullet, ")")
+        if i % 10 == 9:
+            table = document.add_table(rows=3, cols=3)
+            for row in table.rows:
+                for cell in row.cells:
+                    cell.text = rng.choice(WORDS)
+
+    document.add_paragraph("Education", style="Heading 2")
+    degree = document.add_paragraph(style="Normal")
+    _add_run(degree, "MSc Computer Science", bold=True)
+    _add_run(degree, ", ")
+    _add_run(degree, "University of Benchmarks", italic=True)
+    _add_run(degree, " · 2010")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    document.save(path)
+    return path
+
+
+def generate_corpus(output_dir: str, sizes: list = None, seed: int = 0) -> dict:
+    """
+    Generate one resume per size.
+
+    Returns:
+        dict: Maps each size to its .docx path.
+    """
+    sizes = sizes or DEFAULT_SIZES
+    return {
+        size: generate_resume(os.path.join(output_dir, f"resume_{size}.docx"), size, seed)
+        for size in sizes
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic DOCX resumes for benchmarking")
+    parser.add_argument("--output", default=os.path.join("benchmarks", "corpus"))
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Number of experience entries per generated resume")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for size, path in generate_corpus(args.output, args.sizes, args.seed).items():
+        print(f"📄 {size:>6} entries → {path}")
@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import urllib.request
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.llm_stub_server import start_in_thread, DEFAULT_CONFIG
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+
+
+# ---- Load generation ----
+
+def percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def run_load(requests: int, workers: int, mode: str) -> dict:
+    """
+    Send `requests` distinct prompts through `generate_adapted_text` with
+    `workers` threads, exactly as batch mode does.
+
+    Returns:
+        dict: Throughput, latency percentiles, providers used and failures.
+    """
+    # Imported late so the endpoint environment variables are already set
+    from src.adapt_resume import generate_adapted_text
+    from src.optimize_resume import generate_prompt
+    from src.rate_limit import limiter_stats
+
+    keys = {"openai": "stub-key", "google": "stub-key"}
+    resume = "# Load Test\n\n## Experience\n" + "\n".join(f"- Achievement {i}" for i in range(40))
+    latencies, providers, failures = [], {}, []
+
+    def one(i):
+        prompt = generate_prompt(resume, f"Job description number {i}: Python, SQL, Airflow.")
+        start = time.perf_counter()
+        if mode == "stream":
+            with tempfile.NamedTemporaryFile(suffix=".md", delete=False) as tmp:
+                output_path = tmp.name
+            try:
+                provider, _, _ = generate_adapted_text(prompt, keys, stream=True, output_path=output_path)
+            finally:
+                os.remove(output_path)
+        else:
+            provider, _, _ = generate_adapted_text(prompt, keys, hedge=(mode == "hedge"))
+        return provider, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(one, i) for i in range(requests)]
+        for future in as_completed(futures):
+            try:
+                provider, latency = future.result()
+                latencies.append(latency)
+                providers[provider] = providers.get(provider, 0) + 1
+            except Exception as e:
+                failures.append(f"{type(e).__name__}: {e}")
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "workers": workers,
+        "mode": mode,
+        "completed": len(latencies),
+        "failed": len(failures),
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_p50": round(percentile(latencies, 50), 3),
+        "latency_p95": round(percentile(latencies, 95), 3),
+        "latency_p99": round(percentile(latencies, 99), 3),
+        "latency_mean": round(statistics.mean(latencies), 3) if latencies else 0.0,
+        "providers": providers,
+        "errors": sorted(set(failures))[:10],
+        "rate_limits": limiter_stats(),
+    }
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the LLM stage against the local stub server")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent requests (like --llm-workers)")
+    parser.add_argument("--mode", choices=["plain", "hedge", "stream"], default="plain")
+    parser.add_argument("--url", help="Use an already running stub server instead of starting one")
+    for key, value in DEFAULT_CONFIG.items():
+        if key != "distribution":
+            parser.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value)
+    parser.add_argument("--distribution", choices=["fixed", "uniform", "lognormal"],
+                        default=DEFAULT_CONFIG["distribution"])
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        url = args.url.rstrip("/")
+    else:
+        config = {key: getattr(args, key) for key in DEFAULT_CONFIG}
+        server = start_in_thread(config=config)
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    os.environ["OPENAI_BASE_URL"] = f"{url}/v1"
+    os.environ["RESUME_GEMINI_ENDPOINT"] = url
+    os.environ["RESUME_CACHE_DISABLED"] = "1"  # Every request must reach the server
+    os.environ.setdefault("RESUME_LATENCY_PATH", os.path.join(tempfile.gettempdir(), "stub_latency.json"))
+
+    print(f"🧪 {args.requests} requests, {args.workers} workers, mode '{args.mode}' against {url}")
+    report = run_load(args.requests, args.workers, args.mode)
+    with urllib.request.urlopen(f"{url}/stats") as response:
+        report["server"] = json.load(response)
+    if server:
+        server.shutdown()
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    result_path = os.path.join(RESULTS_DIR, "load_" + datetime.now().strftime("%Y%m%d_%H%M%S") + ".json")
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"✅ {report['completed']}/{report['requests']} completed in {report['elapsed_seconds']:.1f}s "
+          f"({report['requests_per_second']:.2f} req/s)")
+    print(f"⏱️ p50 {report['latency_p50']:.2f}s · p95 {report['latency_p95']:.2f}s · p99 {report['latency_p99']:.2f}s")
+    print(f"🔀 Providers: {report['providers']} · Server: {report['server']}")
+    for provider, stats in report["rate_limits"].items():
+        print(f"🚦 {provider}: {stats['rate_limited']} throttled, {stats['retried']} retried, "
+              f"concurrency limit {stats['concurrency_limit']}, waited {stats['waited_seconds']:.1f}s in total")
+    for error in report["errors"]:
+        print(f"❌ {error}")
+    print(f"💾 Results saved to {result_path}")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Local stand-in for the OpenAI chat-completions and Gemini generateContent APIs.
+#
+#   python benchmarks/llm_stub_server.py --latency 2 --distribution lognormal --rpm 60
+#   OPENAI_BASE_URL=http://127.0.0.1:8765/v1 RESUME_GEMINI_ENDPOINT=http://127.0.0.1:8765 python main.py ...
+
+# ---- Settings ----
+
+DEFAULT_CONFIG = {
+    "latency": 1.0,            # Median seconds before the first byte
+    "jitter": 0.5,             # Spread: +/- seconds (uniform) or sigma (lognormal)
+    "distribution": "lognormal",  # fixed | uniform | lognormal
+    "rpm": 0,                  # Requests per minute before answering 429 (0 = unlimited)
+    "rate_limit_rate": 0.0,    # Probability of a random 429
+    "error_rate": 0.0,         # Probability of a 500
+    "stream_delay": 0.02,      # Seconds between streamed chunks
+    "chunk_words": 3,          # Words per streamed chunk
+}
+
+# The echoed resume is taken from between these prompt markers
+RESUME_MARKER = re.compile(r"#### \*\*Resume(?: section)? \(Markdown format\):\*\*\s*(.*?)#### \*\*Job Description",
+                           re.DOTALL)
+FALLBACK_RESPONSE = "# Stub Resume\n\n## Experience\n- Adapted by the local stub server.\n"
+
+
+# ---- Behaviour ----
+
+class StubState:
+    """
+    Shared configuration, rate-limit window and counters for the server.
+    """
+
+    def __init__(self, config: dict):
+        self.config = {**DEFAULT_CONFIG, **config}
+        self.lock = threading.Lock()
+        self.window = deque()  # Timestamps of accepted requests in the last minute
+        self.stats = {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0, "streamed": 0}
+
+    def latency(self) -> float:
+        cfg = self.config
+        if cfg["distribution"] == "fixed":
+            return cfg["latency"]
+        if cfg["distribution"] == "uniform":
+            return max(0.0, random.uniform(cfg["latency"] - cfg["jitter"], cfg["latency"] + cfg["jitter"]))
+        return random.lognormvariate(0, cfg["jitter"]) * cfg["latency"]  # Median = latency, long right tail
+
+    def admit(self) -> tuple:
+        """
+        Decide the fate of a request.
+
+        Returns:
+            tuple: ("ok" | "rate_limited" | "error", seconds until the window frees up).
+        """
+        cfg = self.config
+        with self.lock:
+            self.stats["requests"] += 1
+            now = time.monotonic()
+            while self.window and now - self.window[0] >= 60:
+                self.window.popleft()
+            if cfg["rpm"] and len(self.window) >= cfg["rpm"]:
+                self.stats["rate_limited"] += 1
+                return "rate_limited", 60 - (now - self.window[0])
+            if random.random() < cfg["rate_limit_rate"]:
+                self.stats["rate_limited"] += 1
+                return "rate_limited", 1.0
+            if random.random() < cfg["error_rate"]:
+                self.stats["errors"] += 1
+                return "error", 0.0
+            self.window.append(now)
+            self.stats["ok"] += 1
+            return "ok", 0.0
+
+    def remaining(self) -> int:
+        with self.lock:
+            return max(0, self.config["rpm"] - len(self.window)) if self.config["rpm"] else 1_000_000
+
+
+def response_text(prompt: str) -> str:
+    match = RESUME_MARKER.search(prompt)
+    return match.group(1).strip() + "\n" if match else FALLBACK_RESPONSE
+
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
+def chunks(text: str, words_per_chunk: int) -> list:
+    parts = re.findall(r"\S+\s*", text)
+    return ["".join(parts[i:i + words_per_chunk]) for i in range(0, len(parts), words_per_chunk)]
+
+
+# ---- HTTP ----
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real APIs
+    state: StubState = None
+
+    def log_message(self, *args):
+        pass  # Quiet: load tests would flood the console
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_sse(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _send_chunk(self, data: str) -> None:
+        payload = data.encode("utf-8")
+        self.wfile.write(f"{len(payload):X}\r\n".encode("ascii") + payload + b"\r\n")
+        self.wfile.flush()
+
+    def _send_event(self, data: str) -> None:
+        self._send_chunk(f"data: {data}\r\n\r\n")
+
+    def _end_sse(self) -> None:
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _read_body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            with self.state.lock:
+                self._send_json(200, dict(self.state.stats))
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        body = self._read_body()
+        if self.path.startswith("/v1/chat/completions"):
+            self._openai(body)
+        elif ":generateContent" in self.path or ":streamGenerateContent" in self.path:
+            self._gemini(body, stream=":streamGenerateContent" in self.path)
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown endpoint {self.path}"}})
+
+    def _reject(self, verdict: str, retry_after: float, google: bool) -> bool:
+        if verdict == "ok":
+            return False
+        if verdict == "rate_limited":
+            status, message, code = 429, "Rate limit reached (stub)", "RESOURCE_EXHAUSTED"
+        else:
+            status, message, code = 500, "Injected server error (stub)", "INTERNAL"
+        headers = {}
+        if status == 429:
+            headers = {
+                "Retry-After": f"{max(1, round(retry_after))}",
+                "x-ratelimit-limit-requests": str(self.state.config["rpm"] or 0),
+                "x-ratelimit-remaining-requests": "0",
+                "x-ratelimit-reset-requests": f"{retry_after:.1f}s",
+            }
+        error = {"code": status, "message": message, "status": code} if google else \
+            {"message": message, "type": "rate_limit_exceeded" if status == 429 else "server_error"}
+        self._send_json(status, {"error": error}, headers)
+        return True
+
+    def _openai(self, body: dict) -> None:
+        verdict, retry_after = self.state.admit()
+        time.sleep(self.state.latency() if verdict == "ok" else 0.01)
+        if self._reject(verdict, retry_after, google=False):
+            return
+
+        prompt = "\n".join(m.get("content") or "" for m in body.get("messages", []))
+        text = response_text(prompt)
+        usage = {
+            "prompt_tokens": count_words(prompt),
+            "completion_tokens": count_words(text),
+            "total_tokens": count_words(prompt) + count_words(text),
+            "prompt_tokens_details": {"cached_tokens": 0},
+        }
+        base = {"id": f"stub-{time.time_ns()}", "created": int(time.time()), "model": body.get("model", "stub")}
+        headers = {"x-ratelimit-remaining-requests": str(self.state.remaining())}
+
+        if not body.get("stream"):
+            self._send_json(200, {**base, "object": "chat.completion", "usage": usage, "choices": [{
+                "index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": text},
+            }]}, headers)
+            return
+
+        with self.state.lock:
+            self.state.stats["streamed"] += 1
+        self._start_sse()
+        for piece in chunks(text, self.state.config["chunk_words"]):
+            self._send_event(json.dumps({**base, "object": "chat.completion.chunk", "choices": [
+                {"index": 0, "delta": {"content": piece}, "finish_reason": None}]}))
+            time.sleep(self.state.config["stream_delay"])
+        self._send_event(json.dumps({**base, "object": "chat.completion.chunk", "choices": [
+            {"index": 0, "delta": {}, "finish_reason": "stop"}]}))
+        if (body.get("stream_options") or {}).get("include_usage"):
+            self._send_event(json.dumps({**base, "object": "chat.completion.chunk", "choices": [], "usage": usage}))
+        self._send_event("[DONE]")
+        self._end_sse()
+
+    def _gemini(self, body: dict, stream: bool) -> None:
+        verdict, retry_after = self.state.admit()
+        time.sleep(self.state.latency() if verdict == "ok" else 0.01)
+        if self._reject(verdict, retry_after, google=True):
+            return
+
+        prompt = "\n".join(part.get("text", "") for content in body.get("contents", [])
+                           for part in content.get("parts", []))
+        text = response_text(prompt)
+        usage = {"promptTokenCount": count_words(prompt), "candidatesTokenCount": count_words(text),
+                 "totalTokenCount": count_words(prompt) + count_words(text)}
+
+        def candidate(piece, finished):
+            payload = {"content": {"role": "model", "parts": [{"text": piece}]}, "index": 0}
+            if finished:
+                payload["finishReason"] = "STOP"
+            return payload
+
+        if not stream:
+            self._send_json(200, {"candidates": [candidate(text, True)], "usageMetadata": usage})
+            return
+
+        with self.state.lock:
+            self.state.stats["streamed"] += 1
+        sse = "alt=sse" in self.path  # Otherwise the REST client expects a streamed JSON array
+        self._start_sse()
+        pieces = chunks(text, self.state.config["chunk_words"]) or [""]
+        for i, piece in enumerate(pieces):
+            last = i == len(pieces) - 1
+            event = {"candidates": [candidate(piece, last)]}
+            if last:
+                event["usageMetadata"] = usage
+            if sse:
+                self._send_event(json.dumps(event))
+            else:
+                self._send_chunk(("[" if i == 0 else ",\n") + json.dumps(event) + ("]" if last else ""))
+            time.sleep(self.state.config["stream_delay"])
+        self._end_sse()
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, config: dict = None) -> ThreadingHTTPServer:
+    """
+    Build (but do not start) a stub server. Port 0 picks a free port.
+    """
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"state": StubState(config or {})})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(host: str = "127.0.0.1", port: int = 0, config: dict = None) -> ThreadingHTTPServer:
+    """
+    Start a stub server on a daemon thread (for load tests). Call shutdown() when done.
+    """
+    server = make_server(host, port, config)
+    threading.Thread(target=server.serve_forever, name="llm-stub-server", daemon=True).start()
+    return server
+
+
+def parse_config(argv: list = None) -> tuple:
+    parser = argparse.ArgumentParser(description="Local OpenAI/Gemini-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=DEFAULT_CONFIG["latency"],
+                        help="Median response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=DEFAULT_CONFIG["jitter"],
+                        help="Uniform: +/- seconds; lognormal: sigma")
+    parser.add_argument("--distribution", choices=["fixed", "uniform", "lognormal"],
+                        default=DEFAULT_CONFIG["distribution"])
+    parser.add_argument("--rpm", type=int, default=DEFAULT_CONFIG["rpm"],
+                        help="Requests per minute before answering 429 (0 = unlimited)")
+    parser.add_argument("--rate-limit-rate", type=float, default=DEFAULT_CONFIG["rate_limit_rate"],
+                        help="Probability of a random 429")
+    parser.add_argument("--error-rate", type=float, default=DEFAULT_CONFIG["error_rate"],
+                        help="Probability of a 500")
+    parser.add_argument("--stream-delay", type=float, default=DEFAULT_CONFIG["stream_delay"],
+                        help="Seconds between streamed chunks")
+    parser.add_argument("--chunk-words", type=int, default=DEFAULT_CONFIG["chunk_words"])
+    args = vars(parser.parse_args(argv))
+    return args.pop("host"), args.pop("port"), args
+
+
+if __name__ == "__main__":
+    host, port, config = parse_config()
+    server = make_server(host, port, config)
+    print(f"🧪 LLM stub listening on http://{host}:{server.server_address[1]}")
+    print(f"   OPENAI_BASE_URL=http://{host}:{server.server_address[1]}/v1")
+    print(f"   RESUME_GEMINI_ENDPOINT=http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,153 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+from contextlib import redirect_stdout
+
+try:
+    import resource  # Peak memory (Unix only)
+except ImportError:
+    resource = None
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.generate_corpus import generate_corpus
+from benchmarks.llm_load_test import percentile
+from src.convert_to_md import docx_to_markdown
+from src.export_resume import markdown_to_html, get_pdf_backend, PDF_BACKENDS
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+
+
+# ---- Measurement ----
+
+def _peak_rss_mb(who) -> float:
+    if resource is None:
+        return None
+    kilobytes = resource.getrusage(who).ru_maxrss  # kB on Linux
+    return round(kilobytes / 1024, 1)
+
+
+def render_all(backend_name: str, html_paths: list, out_dir: str) -> dict:
+    """
+    Render every HTML file with one backend instance, in this process.
+
+    The first document includes backend startup (Chromium for Qt, nothing for
+    wkhtmltopdf, which pays its startup on every document instead).
+
+    Returns:
+        dict: Latencies, peak memory and PDF sizes.
+    """
+    backend = get_pdf_backend(backend_name)
+    latencies, sizes, errors = [], [], []
+    start = time.perf_counter()
+    for html_path in html_paths:
+        pdf_path = os.path.join(out_dir, os.path.splitext(os.path.basename(html_path))[0] + ".pdf")
+        t = time.perf_counter()
+        try:
+            backend.render_file(html_path, pdf_path)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {str(e).splitlines()[0]}")
+            continue
+        latencies.append(time.perf_counter() - t)
+        sizes.append(os.path.getsize(pdf_path))
+    elapsed = time.perf_counter() - start
+    backend.close()
+
+    warm = latencies[1:] or latencies
+    return {
+        "backend": backend_name,
+        "documents": len(html_paths),
+        "rendered": len(latencies),
+        "elapsed_seconds": round(elapsed, 3),
+        "pdfs_per_second": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "first_seconds": round(latencies[0], 3) if latencies else None,
+        "latency_p50": round(percentile(warm, 50), 3),
+        "latency_p95": round(percentile(warm, 95), 3),
+        "peak_rss_mb": _peak_rss_mb(resource.RUSAGE_SELF) if resource else None,
+        "peak_child_rss_mb": _peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+        "pdf_bytes_mean": int(statistics.mean(sizes)) if sizes else 0,
+        "pdf_bytes_total": sum(sizes),
+        "errors": sorted(set(errors))[:10],
+    }
+
+
+def run_backend(backend_name: str, html_paths: list, out_dir: str) -> dict:
+    # Each backend runs in a fresh process so startup cost and peak memory are its own
+    command = [sys.executable, os.path.abspath(__file__), "--worker", backend_name, "--out-dir", out_dir, *html_paths]
+    completed = subprocess.run(command, capture_output=True, text=True, cwd=PROJECT_ROOT)
+    if completed.returncode != 0:
+        error = (completed.stderr.strip().splitlines() or ["worker failed"])[-1]
+        return {"backend": backend_name, "rendered": 0, "errors": [error]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+# ---- Corpus ----
+
+def build_html(work_dir: str, documents: int, entries: int) -> list:
+    """
+    Generate `documents` synthetic resumes and render them to print HTML.
+    """
+    corpus = generate_corpus(os.path.join(work_dir, "corpus"), [entries])
+    with open(corpus[entries], "rb") as f, redirect_stdout(io.StringIO()):
+        md = docx_to_markdown(f.read())
+    html_paths = []
+    for i in range(documents):
+        # Vary the text a little so documents are not byte-identical
+        html_path = os.path.join(work_dir, f"resume_{i:03d}.html")
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write(markdown_to_html(md.replace("\n## ", f"\n## {i} ", 1), html_dir=work_dir))
+        html_paths.append(html_path)
+    return html_paths
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare PDF backends on latency, memory and output size")
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--entries", type=int, default=20, help="Experience entries per synthetic resume")
+    parser.add_argument("--backends", nargs="+", default=sorted(PDF_BACKENDS))
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--out-dir", help=argparse.SUPPRESS)
+    parser.add_argument("html_paths", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(render_all(args.worker, args.html_paths, args.out_dir)))
+        return 0
+
+    reports = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        html_paths = build_html(work_dir, args.documents, args.entries)
+        for name in args.backends:
+            print(f"⏱️ {name}: {len(html_paths)} documents...")
+            out_dir = os.path.join(work_dir, name)
+            os.makedirs(out_dir, exist_ok=True)
+            reports.append(run_backend(name, html_paths, out_dir))
+
+    print(f"\n{'backend':<12} {'PDFs/s':>7} {'first':>7} {'p50':>7} {'p95':>7} {'RSS MB':>7} {'child MB':>9} {'PDF KB':>7}")
+    for r in reports:
+        if not r.get("rendered"):
+            print(f"{r['backend']:<12} ❌ {'; '.join(r.get('errors', []))}")
+            continue
+        print(f"{r['backend']:<12} {r['pdfs_per_second']:>7.2f} {r['first_seconds']:>7.3f} {r['latency_p50']:>7.3f} "
+              f"{r['latency_p95']:>7.3f} {r['peak_rss_mb'] or 0:>7.1f} {r['peak_child_rss_mb'] or 0:>9.1f} "
+              f"{r['pdf_bytes_mean'] / 1024:>7.1f}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    result_path = os.path.join(RESULTS_DIR, "pdf_backends_" + datetime.now().strftime("%Y%m%d_%H%M%S") + ".json")
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump({"created_at": datetime.now().isoformat(timespec="seconds"), "documents": args.documents,
+                   "entries": args.entries, "backends": reports}, f, indent=2)
+    print(f"💾 Results saved to {result_path}")
+    return 1 if any(not r.get("rendered") for r in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
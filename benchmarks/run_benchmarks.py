@@ -0,0 +1,204 @@
+import os
+import io
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+from datetime import datetime
+from contextlib import redirect_stdout
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.generate_corpus import generate_corpus, DEFAULT_SIZES
+from src.convert_to_md import convert_docx_to_md, merge_education_blocks
+from src.optimize_resume import validate_markdown
+from src.export_resume import convert_md_to_html, convert_html_to_pdf
+from src.pdf_renderer import get_pdfkit_configuration
+
+# ---- Settings ----
+
+BENCH_DIR = os.path.join(PROJECT_ROOT, "benchmarks")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+# A benchmark regresses when it is this much slower than the baseline...
+DEFAULT_THRESHOLD = 1.25
+# ...and the slowdown is larger than this many seconds (ignores timer noise)
+MIN_REGRESSION_SECONDS = 0.002
+
+
+# ---- Timing ----
+
+def measure(func, repeat: int) -> dict:
+    """
+    Run func `repeat` times (after one warm-up call) with stdout silenced.
+
+    Returns:
+        dict: `min`, `median` and `max` seconds.
+    """
+    with redirect_stdout(io.StringIO()):
+        func()
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+    return {
+        "min": round(min(samples), 6),
+        "median": round(statistics.median(samples), 6),
+        "max": round(max(samples), 6),
+    }
+
+
+def wkhtmltopdf_available() -> bool:
+    try:
+        get_pdfkit_configuration()
+        return True
+    except (OSError, IOError):
+        return False
+
+
+def run_benchmarks(sizes: list, repeat: int, include_pdf: bool = True) -> dict:
+    """
+    Time every pipeline stage on a synthetic resume of each size.
+
+    Returns:
+        dict: `{stage: {size: timings}}` plus run metadata.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        corpus = generate_corpus(os.path.join(work_dir, "corpus"), sizes)
+        pdf_enabled = include_pdf and wkhtmltopdf_available()
+        if include_pdf and not pdf_enabled:
+            print("⚠️ wkhtmltopdf not found, skipping convert_html_to_pdf.")
+
+        for size, docx_path in corpus.items():
+            print(f"⏱️ {size} entries...")
+            md_path = os.path.join(work_dir, f"resume_{size}.md")
+            html_path = os.path.join(work_dir, f"resume_{size}.html")
+            pdf_path = os.path.join(work_dir, f"resume_{size}.pdf")
+
+            stages = {"convert_docx_to_md": lambda: convert_docx_to_md(docx_path, md_path)}
+            with redirect_stdout(io.StringIO()):
+                convert_docx_to_md(docx_path, md_path)
+            with open(md_path, "r", encoding="utf-8") as f:
+                md_text = f.read()
+            md_lines = md_text.splitlines()
+
+            stages["merge_education_blocks"] = lambda: merge_education_blocks(md_lines)
+            stages["validate_markdown"] = lambda: validate_markdown(md_text)
+            stages["convert_md_to_html"] = lambda: convert_md_to_html(md_path, html_path, for_editor=False)
+            if pdf_enabled:
+                # Rendering is slow; a single timed run per size is enough
+                stages["convert_html_to_pdf"] = lambda: convert_html_to_pdf(html_path, pdf_path)
+
+            for stage, func in stages.items():
+                runs = 1 if stage == "convert_html_to_pdf" else repeat
+                results.setdefault(stage, {})[str(size)] = measure(func, runs)
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+# ---- Regression check ----
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compare median timings against the baseline.
+
+    A stage regresses when current > baseline * threshold and the difference is
+    above MIN_REGRESSION_SECONDS. Per-stage thresholds may be stored in the
+    baseline under `thresholds`.
+
+    Returns:
+        list: Human-readable regression messages (empty if none).
+    """
+    regressions = []
+    thresholds = baseline.get("thresholds", {})
+    for stage, by_size in current["results"].items():
+        limit = thresholds.get(stage, threshold)
+        for size, timing in by_size.items():
+            base = baseline["results"].get(stage, {}).get(size)
+            if not base:
+                continue
+            now, before = timing["median"], base["median"]
+            if now > before * limit and now - before > MIN_REGRESSION_SECONDS:
+                regressions.append(f"{stage} [{size} entries]: {before * 1000:.1f} ms → {now * 1000:.1f} ms "
+                                   f"(x{now / before:.2f}, limit x{limit:.2f})")
+    return regressions
+
+
+def print_table(current: dict, baseline: dict = None) -> None:
+    for stage, by_size in current["results"].items():
+        for size, timing in by_size.items():
+            line = f"  {stage:<24} {size:>6} entries  {timing['median'] * 1000:9.2f} ms"
+            base = (baseline or {}).get("results", {}).get(stage, {}).get(size)
+            if base:
+                line += f"  (baseline {base['median'] * 1000:.2f} ms, x{timing['median'] / base['median']:.2f})"
+            print(line)
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the resume pipeline on synthetic DOCX resumes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Experience entries per synthetic resume")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stage and size")
+    parser.add_argument("--no-pdf", action="store_true", help="Skip convert_html_to_pdf")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown factor before a stage counts as a regression")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Save this run as the new baseline instead of comparing")
+    parser.add_argument("--check", action="store_true",
+                        help="CI mode: fail (exit code 2) when there is no baseline to compare against")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.sizes, args.repeat, include_pdf=not args.no_pdf)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    result_path = os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + ".json")
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    print(f"💾 Results saved to {result_path}")
+
+    if args.update_baseline:
+        previous = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                previous = json.load(f)
+        current["thresholds"] = previous.get("thresholds", {})  # Keep hand-tuned per-stage limits
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print_table(current)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print_table(current)
+        print(f"⚠️ No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 2 if args.check else 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    print_table(current, baseline)
+    regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        print("❌ Performance regressions:")
+        for message in regressions:
+            print(f"  - {message}")
+        return 1
+    print("✅ No regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
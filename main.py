@@ -1,15 +1,33 @@
 import os
 import sys
+import json
+import time
+import psutil
 import logging
+import cProfile
+import argparse
 import webbrowser
-import docx 
 from datetime import datetime
 from dotenv import load_dotenv, find_dotenv
 
-from src.convert_to_md import convert_docx_to_md
-from src.optimize_resume import generate_prompt
-from src.adapt_resume import adapt_resume
-from src.export_resume import convert_md_to_html, convert_html_to_pdf, edit_html_content
+from src.convert_to_md import convert_docx_to_md_incremental, convert_docx_folder, is_up_to_date
+from src.docx_stream import iter_blocks
+from src.optimize_resume import generate_compact_prompt, PROMPT_INSTRUCTIONS, SECTION_PROMPT_INSTRUCTIONS, SYSTEM_PROMPT
+from src.adapt_resume import adapt_resume_text, OPENAI_MODEL, GOOGLE_MODEL, TEMPERATURE
+from src.section_adapt import adapt_sections, compact_for_sections
+from src.ats_score import score_delta
+from src.timing import span, get_tracer
+from src.export_resume import (
+    markdown_to_html, html_to_pdf, convert_html_to_pdf, edit_html_content, get_pdf_backend, theme_fingerprint
+)
+from src.artifacts import artifacts_enabled, save_artifact
+from src.batch_resume import load_job_descriptions, run_batch
+from src.checkpoints import RunCheckpoint, checkpoints_enabled
+from src.watch import scan, watch, DEFAULT_DEBOUNCE
+from src.llm_clients import get_openai_client
+
+# Time from interpreter start until all pipeline modules are imported
+STARTUP_SECONDS = time.time() - psutil.Process().create_time()
 
 def setup_logger() -> logging.Logger:
     """
@@ -80,11 +98,11 @@ def get_latest_docx_file(folder: str, logger) -> str:
     Raises:
         SystemExit: If no .docx file is found.
     """
-    docs = [f for f in os.listdir(folder) if f.endswith(".docx")]
+    docs = scan(folder, ".docx")  # One os.scandir pass; mtimes come from the directory entries
     if not docs:
         logger.info(f"❌ No .docx file found in '{folder}'")
         sys.exit(1)
-    return sorted(docs, key=lambda f: os.path.getmtime(os.path.join(folder, f)))[-1]
+    return max(docs, key=lambda f: docs[f][0])
 
 
 def validate_docx_content(docx_path: str, logger) -> None:
@@ -99,10 +117,11 @@ def validate_docx_content(docx_path: str, logger) -> None:
         SystemExit: If the file is empty or invalid.
     """
     try:
-        doc = docx.Document(docx_path)
-        has_paragraphs = any(p.text.strip() for p in doc.paragraphs)
-        has_tables = any(t.rows for t in doc.tables)
-        if not has_paragraphs and not has_tables:
+        has_content = any(
+            block["text"].strip() if block["type"] == "paragraph" else block["rows"]
+            for block in iter_blocks(docx_path)
+        )
+        if not has_content:
             logger.info(f"❌ The .docx file '{docx_path}' is empty or contains no valid content.")
             sys.exit(1)
         logger.info("✅ .docx file validated: content found.")
@@ -145,7 +164,169 @@ def save_file(path: str, content: str, logger) -> None:
         sys.exit(1)
 
 
-def main():
+def log_footprint(logger) -> None:
+    """
+    Log process startup time, memory usage and whether Qt was loaded.
+    Used to keep headless runs lean.
+    """
+    process = psutil.Process()
+    uptime = time.time() - process.create_time()
+    rss_mb = process.memory_info().rss / (1024 * 1024)
+    qt_loaded = any(name.startswith("PyQt5") for name in sys.modules)
+    logger.info(f"📊 Footprint: startup {STARTUP_SECONDS * 1000:.0f} ms, total {uptime:.2f}s, "
+                f"RSS {rss_mb:.1f} MB, Qt loaded: {'yes' if qt_loaded else 'no'}.")
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    """
+    Parse command-line options for the pipeline.
+
+    Parameters:
+        argv (list): Argument list (defaults to sys.argv[1:]).
+
+    Returns:
+        Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Resume Optimization Pipeline")
+    parser.add_argument("--batch", metavar="JOBS",
+                        help="Folder of .txt job descriptions or a .jsonl file; tailors the resume to each one")
+    parser.add_argument("--folder", action="store_true",
+                        help="Convert every .docx in original_docx/ to Markdown in parallel and stop (no LLM step)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running: process each new .docx and re-run when job_description.txt changes (headless)")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                        help=f"In watch mode, seconds a file must stay unchanged before it is processed (default: {DEFAULT_DEBOUNCE})")
+    parser.add_argument("--headless", action="store_true",
+                        help="Skip the visual editor and never load Qt (unless --pdf-backend qt); renders the print layout straight to PDF")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream LLM tokens into the adapted resume and refresh an HTML preview per section")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Also ask Gemini when OpenAI is slower than its usual latency; keep the first answer")
+    parser.add_argument("--sections", action="store_true",
+                        help="Adapt each ## section separately and in parallel; unchanged sections are reused from the cache")
+    parser.add_argument("--token-budget", type=int, default=None,
+                        help="Maximum prompt size in tokens (default: RESUME_PROMPT_TOKEN_BUDGET or unlimited)")
+    parser.add_argument("--min-score", type=float, default=None,
+                        help="In batch mode, skip postings whose local match score (0-100) is below this value")
+    parser.add_argument("--theme", default=None,
+                        help="Theme name under assets/themes/ or path to a theme folder (default: RESUME_THEME or 'default')")
+    parser.add_argument("--pdf-backend", default=None,
+                        help="PDF renderer: 'wkhtmltopdf' or 'qt' (in-process QtWebEngine; default: RESUME_PDF_BACKEND or wkhtmltopdf)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Reuse the stages a previous run completed (per-run checkpoints) and restart from the first "
+                             "stage whose inputs changed or that did not finish")
+    parser.add_argument("--artifacts", action="store_true",
+                        help="Also save intermediate files (prompt, adapted Markdown, HTML) for debugging or auditing")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run under cProfile and save the stats next to the log (logs/resume_<timestamp>.prof)")
+    parser.add_argument("--llm-workers", type=int, default=8,
+                        help="Maximum concurrent LLM requests in batch mode (default: 8)")
+    parser.add_argument("--render-workers", type=int, default=None,
+                        help="Rendering processes in batch mode (default: CPU count)")
+    parser.add_argument("--convert-workers", type=int, default=None,
+                        help="Conversion processes in folder mode (default: CPU count)")
+    args = parser.parse_args(argv)
+    if args.stream and args.sections:
+        parser.error("--stream cannot be combined with --sections (sections are adapted in parallel, not streamed)")
+    return args
+
+
+def run_folder_mode(args: argparse.Namespace, input_dir: str, output_dir: str, logger) -> None:
+    """
+    Convert every .docx in input_dir to Markdown on a process pool and record
+    each file's result in a manifest. Unchanged documents are skipped.
+    """
+    logger.info(f"\n📂 Folder mode: converting every .docx in '{input_dir}'...")
+    report = convert_docx_folder(input_dir, output_dir, workers=args.convert_workers)
+    total = len(report["results"])
+    if not total:
+        logger.info(f"❌ No .docx file found in '{input_dir}'")
+        sys.exit(1)
+    logger.info(f"✅ {total} file(s) in {report['elapsed_seconds']:.2f}s on {report['workers']} process(es) "
+                f"({report['files_per_second']:.1f} files/s): {len(report['converted'])} converted, "
+                f"{len(report['skipped'])} unchanged, {len(report['failed'])} failed.")
+    for result in report["results"]:
+        if result["status"] == "failed":
+            logger.info(f"❌ {result['file']}: {result['error']}")
+    logger.info(f"🗂️ Manifest saved to {report['manifest_path']}")
+    if report["failed"]:
+        sys.exit(1)
+
+
+def run_batch_mode(args: argparse.Namespace, md_content: str, docx_filename: str,
+                   output_dir: str, pdf_dir: str, logger) -> None:
+    """
+    Tailor the converted resume against every job description in args.batch.
+    No visual editor is opened; each job produces its own PDF.
+    """
+    try:
+        jobs = load_job_descriptions(args.batch)
+    except Exception as e:
+        logger.info(f"❌ Could not load job descriptions from {args.batch}: {e}")
+        sys.exit(1)
+    if not jobs:
+        logger.info(f"❌ No job descriptions found in {args.batch}")
+        sys.exit(1)
+
+    base_name = os.path.splitext(docx_filename)[0]
+    logger.info(f"\n📦 Batch mode: tailoring resume to {len(jobs)} job descriptions...")
+    results = run_batch(
+        md_content, jobs,
+        output_dir=os.path.join(output_dir, "batch", base_name),
+        pdf_dir=os.path.join(pdf_dir, base_name),
+        logger=logger,
+        llm_workers=args.llm_workers,
+        render_workers=args.render_workers,
+        token_budget=args.token_budget,
+        min_score=args.min_score,
+        keep_artifacts=artifacts_enabled(args.artifacts),
+        theme=args.theme,
+    )
+    failed = [r["id"] for r in results if r["status"] == "failed"]
+    if failed:
+        logger.info(f"⚠️ {len(failed)} job(s) failed: {', '.join(failed)}")
+
+
+def run_watch_mode(args: argparse.Namespace, logger) -> None:
+    """
+    Watch original_docx/ and job_description.txt and run the headless pipeline
+    for each affected resume until interrupted.
+
+    Everything runs in this process, so the pooled LLM clients, the response
+    cache and the PDF backend stay warm between events. A failed run is logged
+    and the watcher keeps going.
+    """
+    args.headless = True  # Nobody is there to close an editor window
+    load_dotenv()
+    ensure_directories(["original_docx"])
+    if os.getenv("OPENAI_API_KEY"):
+        get_openai_client(os.getenv("OPENAI_API_KEY"))
+    get_pdf_backend(args.pdf_backend)
+
+    def handle(docx_filename: str, reason: str) -> None:
+        change = "new or edited resume" if reason == "docx" else "job description changed"
+        logger.info(f"\n👀 {docx_filename}: {change}.")
+        record = None
+        try:
+            with span("watch.event", docx=docx_filename, reason=reason) as record:
+                run_pipeline(args, logger, docx_filename)
+        except SystemExit:
+            logger.info(f"⚠️ Run for {docx_filename} stopped; still watching.")
+        except Exception as e:
+            logger.info(f"❌ Run for {docx_filename} failed: {e}; still watching.")
+        finally:
+            if record is not None:
+                report_event_timings(record, logger)
+
+    logger.info(f"👀 Watching 'original_docx/' and 'job_description.txt' (debounce {args.debounce:.1f}s). "
+                f"Press Ctrl+C to stop.")
+    try:
+        watch("original_docx", "job_description.txt", handle, debounce=args.debounce)
+    except KeyboardInterrupt:
+        logger.info("👋 Watch mode stopped.")
+
+
+def run_pipeline(args: argparse.Namespace, logger, docx_filename: str = None) -> None:
     """
     Execute the full resume optimization pipeline:
     1. Convert .docx to .md
@@ -154,15 +335,18 @@ def main():
     4. Convert to HTML
     5. Open visual HTML editor
     6. Export to PDF
-    """
-
-    # Setup logger
-    logger = setup_logger()
 
+    The newest .docx in original_docx/ is used unless docx_filename is given.
+    With --folder, every .docx is converted in parallel and the pipeline stops there.
+    With --headless, step 5 is skipped and Qt is never imported.
+    Every step's inputs and output are checkpointed under processed_cv/.runs/;
+    with --resume, steps whose inputs are unchanged are reused.
+    With --batch, steps 2-6 run concurrently for every job description
+    (without the visual editor). Every step is recorded as a timing span.
+    """
     if not find_dotenv():
         logger.info("⚠️ .env file not found.")
     load_dotenv()
-    validate_api_keys(logger)
 
     # Set directories
     input_dir = "original_docx"
@@ -172,41 +356,178 @@ def main():
 
     ensure_directories([input_dir, output_dir, pdf_dir])
 
+    # Folder mode only converts documents, so no API keys are needed
+    if args.folder:
+        with span("convert_folder"):
+            run_folder_mode(args, input_dir, output_dir, logger)
+        return
+
+    validate_api_keys(logger)
+    if args.token_budget is None and os.getenv("RESUME_PROMPT_TOKEN_BUDGET"):
+        args.token_budget = int(os.getenv("RESUME_PROMPT_TOKEN_BUDGET"))
+
     # Step 1: Convert DOCX to Markdown
     logger.info("\n🔍 Step 1: Converting .docx to Markdown...")
-    docx_filename = get_latest_docx_file(input_dir, logger)
-    docx_path = os.path.join(input_dir, docx_filename)
-    validate_docx_content(docx_path, logger)
-    md_path = os.path.join(output_dir, os.path.splitext(docx_filename)[0] + ".md")
-    convert_docx_to_md(docx_path, md_path)
-
-    # Step 2: Generate LLM prompt
-    logger.info("\n🧠 Step 2: Generating prompt for LLM...")
+    with span("convert_docx") as record:
+        docx_filename = docx_filename or get_latest_docx_file(input_dir, logger)
+        docx_path = os.path.join(input_dir, docx_filename)
+        md_path = os.path.join(output_dir, os.path.splitext(docx_filename)[0] + ".md")
+        if is_up_to_date(docx_path, md_path):
+            record["attrs"] = {"skipped": True}
+            logger.info("⏭️ Source .docx unchanged, reusing existing Markdown.")
+        else:
+            with span("validate_docx"):
+                validate_docx_content(docx_path, logger)
+            convert_docx_to_md_incremental(docx_path, md_path)
+
     md_content = read_file(md_path, logger)
-    job_description = read_file(job_path, logger)
-    prompt = generate_prompt(md_content, job_description)
-    save_file(os.path.join(output_dir, "prompt.txt"), prompt, logger)
+    if args.batch:
+        with span("batch"):
+            run_batch_mode(args, md_content, docx_filename, output_dir, pdf_dir, logger)
+        return
 
-    # Step 3: Adapt resume via LLM
-    logger.info("\n🤖 Step 3: Adapting resume using LLM...")
+    # Intermediate results stay in memory unless --artifacts (or RESUME_ARTIFACTS) asks for them
+    artifacts_dir = output_dir if artifacts_enabled(args.artifacts) else None
+    job_description = read_file(job_path, logger)
     adapted_md_path = os.path.join(output_dir, "adapted_resume.md")
-    adapt_resume(os.path.join(output_dir, "prompt.txt"), adapted_md_path)
-
-    # Step 4: Generate editable HTML
-    logger.info("\n🌐 Step 4: Generating editable HTML for visual editor...")
-    html_path = os.path.join(output_dir, os.path.splitext(docx_filename)[0] + ".html")
-    convert_md_to_html(adapted_md_path, html_path, for_editor=True)
-
-    # Step 5: Launch visual HTML editor (with Georgia font)
-    logger.info("\n✍️ Step 5: Opening visual HTML editor...")
-    edit_html_content(html_path)
 
-    # Step 6: Export to PDF (based on edited HTML)
-    logger.info("\n📄 Step 6: Exporting final resume to PDF...")
-    pdf_path = os.path.join(pdf_dir, os.path.splitext(docx_filename)[0] + ".pdf")
-    convert_html_to_pdf(html_path, pdf_path)
+    # Each stage's inputs and output are checkpointed so --resume can skip completed work
+    base_name = os.path.splitext(docx_filename)[0]
+    checkpoint_dir = os.path.join(output_dir, ".runs", base_name)
+    checkpoint = RunCheckpoint(checkpoint_dir if checkpoints_enabled() or args.resume else None, args.resume)
+    # Editing the prompt instructions or switching models also makes the LLM stages stale
+    llm_settings = {"system_prompt": SYSTEM_PROMPT, "models": [OPENAI_MODEL, GOOGLE_MODEL, TEMPERATURE]}
+    if args.sections:
+        sections_inputs = {"resume": md_content, "job_description": job_description, "token_budget": args.token_budget,
+                           "instructions": SECTION_PROMPT_INSTRUCTIONS, **llm_settings}
+        adapted_md = checkpoint.lookup("adapt_sections", sections_inputs)
+    else:
+        prompt_inputs = {"resume": md_content, "job_description": job_description, "token_budget": args.token_budget,
+                         "instructions": PROMPT_INSTRUCTIONS}
+        prompt = checkpoint.lookup("generate_prompt", prompt_inputs)
+        adapt_inputs = {"prompt": prompt, **llm_settings}
+        adapted_md = checkpoint.lookup("adapt_resume", adapt_inputs) if prompt is not None else None
+    if adapted_md is not None:
+        logger.info("\n⏩ Steps 2-3: Reusing the adapted resume from the last run's checkpoint.")
+    elif args.sections:
+        # Steps 2-3: One prompt per section; unchanged sections come from the cache
+        logger.info("\n🧩 Steps 2-3: Adapting resume section by section...")
+        with span("adapt_sections"):
+            try:
+                # Scoring below still uses the full job description
+                section_jd, report = compact_for_sections(md_content, job_description, args.token_budget)
+            except ValueError as e:
+                logger.info(f"❌ {e}")
+                sys.exit(1)
+            logger.info(f"✂️ Job description compacted: {report['original_tokens']} → {report['compacted_tokens']} "
+                        f"tokens ({report['saved_tokens']} saved); largest section prompt is "
+                        f"{report['prompt_tokens']} tokens.")
+            try:
+                result = adapt_sections(md_content, section_jd,
+                                        adapted_md_path if artifacts_dir else None, hedge=args.hedge)
+            except Exception as e:
+                logger.info(f"❌ Resume adaptation failed: {e}")
+                sys.exit(1)
+        adapted_md = result["markdown"]
+        checkpoint.record("adapt_sections", sections_inputs, adapted_md)
+        logger.info(f"🧩 {result['adapted']} of {result['sections']} sections sent to the LLM, "
+                    f"{result['reused']} reused ({result['elapsed_seconds']:.1f}s).")
+    else:
+        if prompt is None:
+            # Step 2: Generate LLM prompt
+            logger.info("\n🧠 Step 2: Generating prompt for LLM...")
+            with span("generate_prompt"):
+                try:
+                    prompt, report = generate_compact_prompt(md_content, job_description, args.token_budget)
+                except ValueError as e:
+                    logger.info(f"❌ {e}")
+                    sys.exit(1)
+                logger.info(f"✂️ Job description compacted: {report['original_tokens']} → {report['compacted_tokens']} "
+                            f"tokens ({report['saved_tokens']} saved); prompt is {report['prompt_tokens']} tokens.")
+                save_artifact(artifacts_dir, "prompt.txt", prompt)
+            checkpoint.record("generate_prompt", prompt_inputs, prompt)
+        else:
+            logger.info("\n⏩ Step 2: Reusing the prompt from the last run's checkpoint.")
+
+        # Step 3: Adapt resume via LLM (streaming always writes the live Markdown file)
+        logger.info("\n🤖 Step 3: Adapting resume using LLM...")
+        preview_path = os.path.join(output_dir, "adapted_resume.preview.html") if args.stream else None
+        if preview_path:
+            logger.info(f"👀 Live preview: {os.path.abspath(preview_path)}")
+        with span("adapt_resume"):
+            try:
+                adapted_md = adapt_resume_text(prompt, stream=args.stream,
+                                               output_path=adapted_md_path if args.stream else None,
+                                               preview_path=preview_path, hedge=args.hedge)
+            except Exception as e:
+                logger.info(f"❌ Resume adaptation failed: {e}")
+                sys.exit(1)
+        adapt_inputs["prompt"] = prompt  # Set now if the prompt was generated in this run
+        checkpoint.record("adapt_resume", adapt_inputs, adapted_md)
+        if args.stream or artifacts_dir:
+            save_file(adapted_md_path, adapted_md, logger)
+
+    with span("ats_score"):
+        score = score_delta(md_content, adapted_md, job_description)
+    logger.info(f"🎯 Match score: {score['original']:.1f} → {score['adapted']:.1f} ({score['delta']:+.1f}).")
+
+    # Step 4: Generate HTML (editor variant unless running headless)
+    pdf_path = os.path.join(pdf_dir, base_name + ".pdf")
+    # The theme is keyed by content (template, CSS, fonts), so editing it re-renders
+    html_inputs = {"markdown": adapted_md, "editor": not args.headless, "theme": theme_fingerprint(args.theme)}
+    html = checkpoint.lookup("convert_md_to_html", html_inputs)
+    if html is not None:
+        logger.info("\n⏩ Step 4: Reusing the HTML from the last run's checkpoint.")
+    elif args.headless:
+        logger.info("\n🌐 Step 4: Generating print HTML...")
+        with span("convert_md_to_html"):
+            html = markdown_to_html(adapted_md, for_editor=False, theme=args.theme)
+        checkpoint.record("convert_md_to_html", html_inputs, html)
+    else:
+        logger.info("\n🌐 Step 4: Generating editable HTML for visual editor...")
+        with span("convert_md_to_html"):
+            html = markdown_to_html(adapted_md, for_editor=True, html_dir=output_dir, theme=args.theme)
+        checkpoint.record("convert_md_to_html", html_inputs, html)
+
+    if args.headless:
+        save_artifact(artifacts_dir, base_name + ".html", html)
+    else:
+        # Step 5: Launch visual HTML editor (with Georgia font); the editor works on a file
+        html_path = os.path.join(output_dir, base_name + ".html")
+        edited = checkpoint.lookup("visual_editor", {"html": html})
+        if edited is not None:
+            logger.info("\n⏩ Step 5: Reusing the edited HTML from the last run's checkpoint.")
+            save_file(html_path, edited, logger)  # Step 6 renders the file
+        else:
+            save_file(html_path, html, logger)
+            logger.info("\n✍️ Step 5: Opening visual HTML editor...")
+            with span("visual_editor"):
+                edit_html_content(html_path)
+            edited = read_file(html_path, logger)
+            checkpoint.record("visual_editor", {"html": html}, edited)
+        html = edited
+
+    # Step 6: Export to PDF (headless: straight from memory; otherwise from the edited HTML file)
+    # Editor HTML only links the stylesheets, so the theme fingerprint is part of the PDF key too
+    pdf_inputs = {"html": html, "theme": html_inputs["theme"],
+                  "backend": args.pdf_backend or os.getenv("RESUME_PDF_BACKEND")}
+    if checkpoint.lookup("convert_html_to_pdf", pdf_inputs) is not None:
+        logger.info("\n⏩ Step 6: PDF is up to date with the last run's checkpoint.")
+    else:
+        logger.info("\n📄 Step 6: Exporting final resume to PDF...")
+        with span("convert_html_to_pdf"):
+            if args.headless:
+                pdf = html_to_pdf(html, pdf_path, backend=args.pdf_backend)
+            else:
+                convert_html_to_pdf(html_path, pdf_path, backend=args.pdf_backend)
+                with open(pdf_path, "rb") as f:
+                    pdf = f.read()
+        checkpoint.record("convert_html_to_pdf", pdf_inputs, pdf, path=pdf_path)
 
     logger.info(f"\n✅ DONE: Resume PDF saved at: {pdf_path}")
+    if args.headless:
+        log_footprint(logger)
+        return
     try:
         webbrowser.open(f"file://{os.path.abspath(pdf_path)}")
         logger.info("📂 PDF opened in default viewer.")
@@ -214,6 +535,66 @@ def main():
         logger.warning(f"⚠️ Could not open PDF automatically: {e}")
 
 
+def log_file_stem(logger) -> str:
+    """
+    Path of the run's log file without its extension, used to name sibling reports.
+    """
+    log_path = next(h.baseFilename for h in logger.handlers if isinstance(h, logging.FileHandler))
+    return os.path.splitext(log_path)[0]
+
+
+def write_timings(logger) -> None:
+    """
+    Save the run's timing spans as JSON next to the log file and log the top-level steps.
+    """
+    timings_path = log_file_stem(logger) + ".timings.json"
+    tracer = get_tracer()
+    tracer.write(timings_path)
+    for root in tracer.to_dict()["spans"]:
+        for step in root.get("children", []):
+            logger.info(f"⏱️ {step['name']}: {step['duration']:.3f}s")
+    logger.info(f"⏱️ Timings saved to {timings_path}")
+
+
+def report_event_timings(record: dict, logger) -> None:
+    """
+    Log a watch event's step durations, append its spans to the session's
+    `.timings.jsonl` file and drop them from the tracer, so a long-running
+    watcher does not keep every event in memory.
+    """
+    for step in record.get("children", []):
+        logger.info(f"⏱️ {step['name']}: {step['duration']:.3f}s")
+    with open(log_file_stem(logger) + ".timings.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    get_tracer().discard(record)
+
+
+def main(argv: list = None):
+    """
+    Parse options, run the pipeline inside a root timing span (and under
+    cProfile with --profile), then save timings and profile stats next to the log.
+    """
+    args = parse_args(argv)
+
+    # Setup logger
+    logger = setup_logger()
+
+    profiler = cProfile.Profile() if args.profile else None
+    try:
+        if profiler:
+            profiler.enable()
+        if args.watch:
+            run_watch_mode(args, logger)
+        else:
+            with span("pipeline"):
+                run_pipeline(args, logger)
+    finally:
+        if profiler:
+            profiler.disable()
+            profile_path = log_file_stem(logger) + ".prof"
+            profiler.dump_stats(profile_path)
+            logger.info(f"🔬 Profile saved to {profile_path} (inspect with: python -m pstats {profile_path})")
+        write_timings(logger)
 
 
 if __name__ == "__main__":
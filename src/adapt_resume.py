@@ -1,8 +1,39 @@
 import os  # Module for interacting with the operating system
+import json  # Module for writing streaming metrics
+import time  # Module for measuring time-to-first-token and throughput
+import asyncio  # Module for running blocking SDK calls off the shared event loop
+import itertools  # Module for re-joining the first streamed chunk with the rest
+import functools  # Module for binding arguments to calls run in an executor
 from dotenv import load_dotenv  # Module for loading environment variables from a .env file
-from openai import OpenAI, RateLimitError, OpenAIError  # OpenAI SDK for interacting with OpenAI APIs
-import google.generativeai as genai  # Google Generative AI SDK
-from google.api_core import retry  # Retry mechanism for handling transient errors
+from openai import RateLimitError, OpenAIError, APIConnectionError, InternalServerError  # OpenAI SDK errors
+from google.api_core import exceptions as google_exceptions  # Gemini API errors
+from src.llm_clients import (  # Long-lived, pooled LLM clients shared across calls and threads
+    get_openai_client, get_async_openai_client, get_gemini_model, run_async
+)
+from src.hedging import hedged_call, hedge_delay, get_latency_tracker  # Hedged requests across providers
+from src.llm_cache import get_default_cache  # Persistent cache for LLM responses
+from src.export_resume import convert_md_to_html  # Markdown to HTML for progressive previews
+from src.optimize_resume import SYSTEM_PROMPT  # Stable system message shared by every request
+from src.timing import span  # Nested timing spans for provider calls
+from src.prompt_compaction import count_tokens  # Token estimates for the tokens-per-minute budget
+from src.rate_limit import (  # Per-provider RPM/TPM budgets, adaptive concurrency and backoff
+    get_limiter, call_with_limits, call_with_limits_async, open_with_limits, retry_after_seconds,
+    DEFAULT_OUTPUT_TOKENS
+)
+
+# Model settings (also part of the response cache key)
+OPENAI_MODEL = "gpt-4o-mini"
+GOOGLE_MODEL = "gemini-2.0-flash-lite-001"
+TEMPERATURE = 0.25
+
+# Seconds before a Gemini call running in an executor thread gives up
+GEMINI_TIMEOUT = 120
+
+# Streaming metrics are appended here, one JSON object per generation
+STREAM_METRICS_PATH = "logs/llm_stream_metrics.jsonl"
+
+# Token usage (including provider-cached prompt tokens) is appended here
+USAGE_LOG_PATH = "logs/llm_usage.jsonl"
 
 def load_api_keys() -> dict:
     """
@@ -30,50 +61,403 @@ def read_prompt_file(prompt_path: str) -> str:
     with open(prompt_path, "r", encoding="utf-8") as file:  # Open the file in read mode with UTF-8 encoding
         return file.read()  # Read and return the file content
 
-def generate_resume_openai(prompt: str, api_key: str) -> str:
+def build_messages(prompt: str) -> list:
+    """
+    Build the chat messages for OpenAI. The system message never changes, so
+    together with the static start of the prompt it forms a cacheable prefix.
+    """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},  # Stable system message
+        {"role": "user", "content": prompt}  # Prompt: instructions, resume, then job description
+    ]
+
+def openai_usage(usage_obj) -> dict:
+    """
+    Extract token counts, including cached prompt tokens, from an OpenAI usage object.
+    """
+    details = getattr(usage_obj, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": usage_obj.prompt_tokens,
+        "cached_tokens": (getattr(details, "cached_tokens", None) or 0) if details else 0,
+        "output_tokens": usage_obj.completion_tokens,
+    }
+
+def gemini_usage(metadata) -> dict:
+    """
+    Extract token counts, including cached prompt tokens, from Gemini usage metadata.
+    """
+    return {
+        "prompt_tokens": metadata.prompt_token_count,
+        "cached_tokens": getattr(metadata, "cached_content_token_count", 0) or 0,
+        "output_tokens": metadata.candidates_token_count,
+    }
+
+def record_usage(provider: str, usage: dict) -> None:
+    """
+    Append token usage to USAGE_LOG_PATH and print the share of cached prompt tokens.
+    """
+    if not usage:
+        return
+    entry = {"timestamp": time.time(), "provider": provider, **usage}
+    os.makedirs(os.path.dirname(USAGE_LOG_PATH), exist_ok=True)  # Ensure the logs/ directory exists
+    with open(USAGE_LOG_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    if usage.get("prompt_tokens"):
+        share = 100 * usage.get("cached_tokens", 0) / usage["prompt_tokens"]
+        print(f"💾 {provider}: {usage.get('cached_tokens', 0)}/{usage['prompt_tokens']} prompt tokens "
+              f"served from the provider cache ({share:.0f}%)")
+
+def estimate_tokens(prompt: str) -> int:
+    """
+    Tokens a request is charged against the tokens-per-minute budget before the
+    provider reports real usage: system message + prompt + expected output.
+    """
+    return count_tokens(SYSTEM_PROMPT) + count_tokens(prompt) + DEFAULT_OUTPUT_TOKENS
+
+def classify_openai_error(error: Exception) -> tuple:
+    """
+    Map an OpenAI error to (kind, retry_after, headers) for the rate limiter.
+    Exhausted quota is not retried: only the Gemini fallback can help then.
+    """
+    response = getattr(error, "response", None)
+    headers = response.headers if response is not None else None
+    if isinstance(error, RateLimitError):
+        if getattr(error, "code", None) == "insufficient_quota":
+            return None, None, headers
+        return "rate_limit", retry_after_seconds(headers), headers
+    if isinstance(error, (APIConnectionError, InternalServerError)):  # Includes timeouts
+        return "transient", retry_after_seconds(headers), headers
+    return None, None, headers
+
+def classify_google_error(error: Exception) -> tuple:
+    """
+    Map a Gemini error to (kind, retry_after, headers) for the rate limiter.
+    Only throttling and transient server errors are retried.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    retry_after = retry_after_seconds(headers)
+    for detail in getattr(error, "details", None) or []:
+        delay = getattr(detail, "retry_delay", None)  # google.rpc.RetryInfo
+        if delay is not None and retry_after is None:
+            retry_after = delay.seconds + delay.nanos / 1e9
+    if isinstance(error, google_exceptions.TooManyRequests):  # Also ResourceExhausted
+        return "rate_limit", retry_after, headers
+    if isinstance(error, (google_exceptions.ServiceUnavailable, google_exceptions.InternalServerError,
+                          google_exceptions.DeadlineExceeded, google_exceptions.GatewayTimeout)):
+        return "transient", retry_after, headers
+    return None, None, headers
+
+def generate_resume_openai(prompt: str, api_key: str, usage: dict = None) -> str:
     """
     Generate the adapted resume using OpenAI's GPT-4o-mini model.
 
     Parameters:
         prompt (str): The prompt to send.
         api_key (str): Your OpenAI API key.
+        usage (dict): Optional dict that receives token counts (incl. `cached_tokens`).
 
     Returns:
         str: Adapted resume in Markdown format.
     """
-    client = OpenAI(api_key=api_key)  # Initialize OpenAI client with the provided API key
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",  # Specify the model to use
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant."},  # System message for context
-            {"role": "user", "content": prompt}  # User-provided prompt
-        ],
-        temperature=0.25  # Control randomness in the response
-    )
+    client = get_openai_client(api_key)  # Reuse the pooled OpenAI client for this key
+
+    def _generate(feedback):
+        raw = client.chat.completions.with_raw_response.create(
+            model=OPENAI_MODEL,  # Specify the model to use
+            messages=build_messages(prompt),  # Stable system message + prompt (cache-friendly prefix)
+            temperature=TEMPERATURE  # Control randomness in the response
+        )
+        feedback["headers"] = raw.headers  # x-ratelimit-* headers tune the limiter
+        response = raw.parse()
+        if response.usage:
+            feedback["used_tokens"] = response.usage.total_tokens
+        return response
+
+    # Throttled and transient errors are retried under the limiter; RateLimitError
+    # still surfaces once retries run out, so callers can fall back to Gemini
+    response = call_with_limits("openai", _generate, estimate_tokens(prompt), classify_openai_error)
+    if usage is not None and response.usage:
+        usage.update(openai_usage(response.usage))  # Token counts, including cached prompt tokens
     return response.choices[0].message.content  # Extract and return the generated content
 
-def generate_resume_google(prompt: str, api_key: str) -> str:
+def generate_resume_google(prompt: str, api_key: str, usage: dict = None) -> str:
     """
     Generate the adapted resume using Google's Gemini model (fallback).
 
     Parameters:
         prompt (str): The prompt to send.
         api_key (str): Your Google API key.
+        usage (dict): Optional dict that receives token counts (incl. `cached_tokens`).
 
     Returns:
         str: Adapted resume in Markdown format.
     """
-    genai.configure(api_key=api_key)  # Configure the Google Generative AI client with the API key
+    model = get_gemini_model(api_key, GOOGLE_MODEL, TEMPERATURE, SYSTEM_PROMPT)  # Reuse the configured Gemini model
+
+    def _generate(feedback):
+        response = model.generate_content(prompt)  # Generate the content
+        metadata = getattr(response, "usage_metadata", None)
+        if metadata:
+            feedback["used_tokens"] = metadata.total_token_count
+        return response
+
+    # Retry throttling and transient server errors with jittered backoff (other errors raise at once)
+    response = call_with_limits("google", _generate, estimate_tokens(prompt), classify_google_error)
+    if usage is not None and getattr(response, "usage_metadata", None):
+        usage.update(gemini_usage(response.usage_metadata))  # Token counts, including cached prompt tokens
+    return response.text
 
-    @retry.Retry(predicate=retry.if_exception_type(Exception), deadline=60.0)  # Retry on transient errors
-    def _generate():
-        model = genai.GenerativeModel(
-            "gemini-2.0-flash-lite-001",  # Specify the Gemini model to use
-            generation_config={"temperature": 0.25}  # Control randomness in the response
+async def generate_resume_openai_async(prompt: str, api_key: str, usage: dict = None) -> str:
+    """
+    Async variant of `generate_resume_openai`. Must run on the shared client
+    event loop (see `src.llm_clients.run_async`).
+    """
+    client = get_async_openai_client(api_key)  # Reuse the pooled async OpenAI client for this key
+
+    async def _generate(feedback):
+        raw = await client.chat.completions.with_raw_response.create(
+            model=OPENAI_MODEL,  # Specify the model to use
+            messages=build_messages(prompt),  # Stable system message + prompt (cache-friendly prefix)
+            temperature=TEMPERATURE  # Control randomness in the response
         )
-        return model.generate_content(prompt).text  # Generate and return the content
+        feedback["headers"] = raw.headers  # x-ratelimit-* headers tune the limiter
+        response = raw.parse()
+        if response.usage:
+            feedback["used_tokens"] = response.usage.total_tokens
+        return response
+
+    response = await call_with_limits_async("openai", _generate, estimate_tokens(prompt), classify_openai_error)
+    if usage is not None and response.usage:
+        usage.update(openai_usage(response.usage))  # Token counts, including cached prompt tokens
+    return response.choices[0].message.content  # Extract and return the generated content
+
+async def generate_resume_google_async(prompt: str, api_key: str, usage: dict = None) -> str:
+    """
+    Async variant of `generate_resume_google`. Must run on the shared client
+    event loop (see `src.llm_clients.run_async`).
+    """
+    model = get_gemini_model(api_key, GOOGLE_MODEL, TEMPERATURE, SYSTEM_PROMPT)  # Reuse the configured Gemini model
+
+    async def _generate(feedback):
+        if os.getenv("RESUME_GEMINI_ENDPOINT"):
+            # The REST transport has no async client: run the blocking call off the loop. Cancelling
+            # this await (a lost hedge) does not stop the thread, so the timeout bounds how long it lives
+            timeout = float(os.getenv("RESUME_GEMINI_TIMEOUT", GEMINI_TIMEOUT))
+            response = await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(model.generate_content, prompt, request_options={"timeout": timeout})
+            )
+        else:
+            response = await model.generate_content_async(prompt)  # Generate the content without blocking the loop
+        metadata = getattr(response, "usage_metadata", None)
+        if metadata:
+            feedback["used_tokens"] = metadata.total_token_count
+        return response
 
-    return _generate()  # Call the retry-wrapped function
+    response = await call_with_limits_async("google", _generate, estimate_tokens(prompt), classify_google_error)
+    if usage is not None and getattr(response, "usage_metadata", None):
+        usage.update(gemini_usage(response.usage_metadata))  # Token counts, including cached prompt tokens
+    return response.text
+
+def generate_resume_hedged(prompt: str, keys: dict) -> tuple:
+    """
+    Generate the adapted resume with a hedged request: OpenAI first, and Gemini
+    as well if OpenAI has not answered within its configured latency percentile
+    (or fails). The first response wins and the other request is cancelled.
+
+    Parameters:
+        prompt (str): The prompt to send.
+        keys (dict): API keys as returned by `load_api_keys`.
+
+    Returns:
+        tuple: (provider, raw text, usage dict of the winning provider).
+    """
+    usage = {"openai": {}, "google": {}}  # Filled by whichever requests complete
+    tracker = get_latency_tracker()  # Latency history shared across runs
+    delay = hedge_delay(tracker, "openai")  # Wait this long before firing the Gemini request
+    result = run_async(hedged_call(
+        ("openai", lambda: generate_resume_openai_async(prompt, keys["openai"], usage["openai"])),
+        ("google", lambda: generate_resume_google_async(prompt, keys["google"], usage["google"])),
+        delay,
+        tracker,
+    ))
+    if result["loser"]:
+        # Report the winner and how long the cancelled request had been running
+        print(f"🏁 {result['provider']} won in {result['elapsed']:.2f}s; "
+              f"{result['loser']} cancelled after {result['loser_elapsed']:.2f}s (hedge delay {delay:.1f}s)")
+    else:
+        print(f"🏁 {result['provider']} answered in {result['elapsed']:.2f}s (hedge delay {delay:.1f}s)")
+    return result["provider"], result["text"], usage[result["provider"]]
+
+def stream_resume_openai(prompt: str, api_key: str, usage: dict = None):
+    """
+    Stream the adapted resume from OpenAI token by token.
+
+    Parameters:
+        prompt (str): The prompt to send.
+        api_key (str): Your OpenAI API key.
+        usage (dict): Optional dict that receives token counts (incl. `cached_tokens`) when the stream ends.
+
+    Yields:
+        str: Text fragments as they arrive.
+    """
+    client = get_openai_client(api_key)  # Reuse the pooled OpenAI client for this key
+    limiter = get_limiter("openai")
+    estimated = estimate_tokens(prompt)
+
+    def _open(feedback):
+        raw = client.chat.completions.with_raw_response.create(
+            model=OPENAI_MODEL,  # Specify the model to use
+            messages=build_messages(prompt),  # Stable system message + prompt (cache-friendly prefix)
+            temperature=TEMPERATURE,  # Control randomness in the response
+            stream=True,  # Receive tokens as they are generated
+            stream_options={"include_usage": True}  # Final chunk carries token usage
+        )
+        feedback["headers"] = raw.headers  # x-ratelimit-* headers tune the limiter
+        return raw.parse()
+
+    # Errors before the first token are retried; the slot is then held until the stream ends
+    stream, feedback = open_with_limits("openai", _open, estimated, classify_openai_error)
+    used = None
+    try:
+        for chunk in stream:
+            if chunk.usage:
+                used = chunk.usage.total_tokens
+                if usage is not None:
+                    usage.update(openai_usage(chunk.usage))  # Exact token counts, including cached prompt tokens
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        limiter.release()
+    limiter.on_success(feedback["headers"], estimated, used)
+
+def stream_resume_google(prompt: str, api_key: str, usage: dict = None):
+    """
+    Stream the adapted resume from Google's Gemini model.
+
+    Parameters:
+        prompt (str): The prompt to send.
+        api_key (str): Your Google API key.
+        usage (dict): Optional dict that receives token counts (incl. `cached_tokens`) as the stream progresses.
+
+    Yields:
+        str: Text fragments as they arrive.
+    """
+    model = get_gemini_model(api_key, GOOGLE_MODEL, TEMPERATURE, SYSTEM_PROMPT)  # Reuse the configured Gemini model
+    limiter = get_limiter("google")
+    estimated = estimate_tokens(prompt)
+
+    def _open(feedback):
+        responses = iter(model.generate_content(prompt, stream=True))
+        return responses, next(responses, None)  # Wait for the first chunk, so errors surface here
+
+    # Errors before the first chunk are retried; the slot is then held until the stream ends
+    (responses, first), _ = open_with_limits("google", _open, estimated, classify_google_error)
+    used = None
+    try:
+        for chunk in itertools.chain([first] if first is not None else [], responses):
+            metadata = getattr(chunk, "usage_metadata", None)
+            if metadata:
+                used = metadata.total_token_count
+                if usage is not None:
+                    usage.update(gemini_usage(metadata))  # Running token counts, including cached prompt tokens
+            if chunk.parts:
+                yield chunk.text
+    finally:
+        limiter.release()
+    limiter.on_success(None, estimated, used)
+
+def stream_to_file(chunks, output_path: str, on_section=None) -> dict:
+    """
+    Write streamed text to a file as it arrives.
+
+    Parameters:
+        chunks: Iterable of text fragments.
+        output_path (str): Destination Markdown file (flushed after every fragment).
+        on_section (callable): Called with the text so far whenever a new `##`
+            section starts, i.e. each time the previous section is complete.
+
+    Returns:
+        dict: `text`, `ttft_seconds`, `total_seconds` and `chunks`.
+    """
+    start = time.perf_counter()
+    ttft = None
+    parts = []
+    tail = ""  # Last characters of the previous fragment, to catch headings split across chunks
+    with open(output_path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            if ttft is None:
+                ttft = time.perf_counter() - start  # Time to first token
+            f.write(chunk)
+            f.flush()  # Make the partial resume visible immediately
+            parts.append(chunk)
+            if on_section and "\n## " in tail + chunk:
+                on_section("".join(parts))
+            tail = (tail + chunk)[-3:]  # A heading seen whole in this fragment must not fire again
+    return {
+        "text": "".join(parts),
+        "ttft_seconds": ttft,
+        "total_seconds": time.perf_counter() - start,
+        "chunks": len(parts),
+    }
+
+def record_stream_metrics(metrics: dict) -> None:
+    """
+    Append streaming metrics to STREAM_METRICS_PATH and print a summary.
+    """
+    os.makedirs(os.path.dirname(STREAM_METRICS_PATH), exist_ok=True)  # Ensure the logs/ directory exists
+    with open(STREAM_METRICS_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(metrics) + "\n")
+    print(f"⏱️ {metrics['provider']}: first token after {metrics['ttft_seconds']:.2f}s, "
+          f"{metrics['tokens_per_second']:.1f} tokens/s")
+
+def render_stream_preview(output_path: str, preview_path: str) -> None:
+    """
+    Render the streamed Markdown file to the live HTML preview.
+    """
+    convert_md_to_html(output_path, preview_path, for_editor=False, embed_fonts=False)
+
+def generate_resume_streaming(prompt: str, keys: dict, output_path: str, preview_path: str = None) -> tuple:
+    """
+    Generate the adapted resume in streaming mode, writing tokens to output_path
+    as they arrive and re-rendering the HTML preview at every section boundary.
+
+    Priority: Use OpenAI, fallback to Gemini if rate-limited.
+
+    Returns:
+        tuple: (provider, raw text, metrics dict).
+    """
+    def render_preview(_):
+        render_stream_preview(output_path, preview_path)  # Render what has arrived so far
+
+    on_section = render_preview if preview_path else None
+    usage = {}
+    try:
+        provider, model = "openai", OPENAI_MODEL
+        result = stream_to_file(stream_resume_openai(prompt, keys["openai"], usage), output_path, on_section)
+    except RateLimitError:  # Handle OpenAI rate limit errors (raised before the first token)
+        print("⚠️ OpenAI rate limit hit, using Gemini...")  # Notify the user about fallback
+        usage = {}
+        provider, model = "google", GOOGLE_MODEL
+        result = stream_to_file(stream_resume_google(prompt, keys["google"], usage), output_path, on_section)
+
+    if preview_path:
+        render_preview(result["text"])  # Final render including the last section
+
+    output_tokens = usage.get("output_tokens") or result["chunks"]
+    generation_time = result["total_seconds"] - (result["ttft_seconds"] or 0)
+    metrics = {
+        "timestamp": time.time(),
+        "provider": provider,
+        "model": model,
+        "ttft_seconds": round(result["ttft_seconds"] or 0.0, 3),
+        "total_seconds": round(result["total_seconds"], 3),
+        "output_tokens": output_tokens,
+        "tokens_per_second": round(output_tokens / generation_time, 1) if generation_time > 0 else 0.0,
+    }
+    record_stream_metrics(metrics)
+    record_usage(provider, usage)
+    return provider, result["text"], metrics
 
 def clean_adapted_markdown(md: str) -> str:
     """
@@ -101,32 +485,116 @@ def write_to_file(content: str, path: str) -> None:
     with open(path, "w", encoding="utf-8") as f:  # Open the file in write mode with UTF-8 encoding
         f.write(content)  # Write the content to the file
 
-def adapt_resume(prompt_path: str, output_path: str) -> None:
+def generate_adapted_text(prompt: str, keys: dict = None, stream: bool = False, output_path: str = None,
+                          preview_path: str = None, hedge: bool = False) -> tuple:
     """
-    Main function to adapt the resume using LLM APIs.
+    Turn a prompt into the raw LLM response, going through the response cache.
 
-    Priority: Use OpenAI, fallback to Gemini if rate-limited.
+    Priority: Reuse a cached response for an identical prompt, otherwise use
+    OpenAI and fall back to Gemini if rate-limited (or race them with `hedge`).
 
     Parameters:
-        prompt_path (str): Path to the input prompt.txt file.
-        output_path (str): Destination path for adapted Markdown resume.
+        prompt (str): The prompt to send.
+        keys (dict): API keys (loaded from the .env file if omitted).
+        stream (bool): Write tokens to output_path as they arrive.
+        output_path (str): Destination file for streaming mode.
+        preview_path (str): In streaming mode, HTML preview re-rendered at each section boundary.
+        hedge (bool): Race Gemini against a slow or failing OpenAI call (ignored when streaming).
+
+    Returns:
+        tuple: (provider, raw text, True if served from the cache).
     """
-    try:
-        keys = load_api_keys()  # Load API keys from the .env file
-        prompt = read_prompt_file(prompt_path)  # Read the prompt from the specified file
+    keys = keys or load_api_keys()  # Load API keys from the .env file
+    cache = get_default_cache()  # Shared response cache (None if disabled)
+
+    if cache:
+        provider, raw = cache.get_any(prompt, [
+            ("openai", OPENAI_MODEL, TEMPERATURE),
+            ("google", GOOGLE_MODEL, TEMPERATURE),
+        ])
+        if raw is not None:
+            print(f"⚡ Cache hit ({provider}), skipping API call.")  # Notify the user about the cache hit
+            if stream and output_path:
+                stream_to_file([raw], output_path)  # The file a live stream would have written
+                if preview_path:
+                    render_stream_preview(output_path, preview_path)  # One preview with the cached text
+            return provider, raw, True
 
+    if stream:
+        with span("llm.stream") as record:
+            provider, raw, _ = generate_resume_streaming(prompt, keys, output_path, preview_path)
+            record["attrs"] = {"provider": provider}
+    elif hedge:
+        with span("llm.hedged") as record:
+            provider, raw, usage = generate_resume_hedged(prompt, keys)
+            record["attrs"] = {"provider": provider}
+        record_usage(provider, usage)
+    else:
+        usage = {}  # Token counts reported by the provider
         try:
-            raw = generate_resume_openai(prompt, keys["openai"])  # Try generating the resume using OpenAI
+            with span("llm.openai", model=OPENAI_MODEL):
+                raw = generate_resume_openai(prompt, keys["openai"], usage)  # Try generating the resume using OpenAI
+            provider = "openai"
         except RateLimitError:  # Handle OpenAI rate limit errors
             print("⚠️ OpenAI rate limit hit, using Gemini...")  # Notify the user about fallback
-            raw = generate_resume_google(prompt, keys["google"])  # Fallback to Google's Gemini model
+            with span("llm.google", model=GOOGLE_MODEL):
+                raw = generate_resume_google(prompt, keys["google"], usage)  # Fallback to Google's Gemini model
+            provider = "google"
+        record_usage(provider, usage)
+
+    if cache:
+        model = OPENAI_MODEL if provider == "openai" else GOOGLE_MODEL
+        cache.put(prompt, provider, model, TEMPERATURE, raw)  # Store the response for identical reruns
+    return provider, raw, False
+
+def adapt_resume_text(prompt: str, stream: bool = False, output_path: str = None, preview_path: str = None,
+                      hedge: bool = False) -> str:
+    """
+    Adapt the resume in memory: prompt in, cleaned Markdown out.
+
+    Parameters:
+        prompt (str): The prompt to send.
+        stream (bool): Write tokens to output_path as they arrive (requires output_path).
+        output_path (str): Live output file for streaming mode.
+        preview_path (str): In streaming mode, HTML preview re-rendered at each section boundary.
+        hedge (bool): Race Gemini against a slow or failing OpenAI call (ignored when streaming).
 
-        resume = clean_adapted_markdown(raw)  # Clean the generated Markdown content
+    Returns:
+        str: Adapted resume in Markdown format.
+    """
+    _, raw, _ = generate_adapted_text(prompt, stream=stream, output_path=output_path,
+                                      preview_path=preview_path, hedge=hedge)
+    return clean_adapted_markdown(raw)  # Clean the generated Markdown content
+
+def adapt_resume(prompt_path: str, output_path: str, stream: bool = False, preview_path: str = None,
+                 hedge: bool = False) -> bool:
+    """
+    Main function to adapt the resume using LLM APIs.
+
+    Priority: Reuse a cached response for an identical prompt, otherwise use
+    OpenAI and fall back to Gemini if rate-limited.
+
+    Parameters:
+        prompt_path (str): Path to the input prompt.txt file.
+        output_path (str): Destination path for adapted Markdown resume.
+        stream (bool): Write tokens to output_path as they arrive.
+        preview_path (str): In streaming mode, HTML preview re-rendered at each section boundary.
+        hedge (bool): Race Gemini against a slow or failing OpenAI call (ignored when streaming).
+
+    Returns:
+        bool: True if the adapted resume was written, False otherwise.
+    """
+    try:
+        prompt = read_prompt_file(prompt_path)  # Read the prompt from the specified file
+        resume = adapt_resume_text(prompt, stream=stream, output_path=output_path,
+                                   preview_path=preview_path, hedge=hedge)
         write_to_file(resume, output_path)  # Write the cleaned content to the output file
         print(f"✅ Resume saved to {output_path}")  # Notify the user about successful completion
+        return True
 
     except Exception as e:  # Catch any unexpected errors
         print(f"❌ Error: {e}")  # Print the error message
+        return False
 
 if __name__ == "__main__":
     # Define the input prompt file and output resume file paths
@@ -0,0 +1,37 @@
+import os  # Module for interacting with the operating system
+
+def artifacts_enabled(flag: bool = False) -> bool:
+    """
+    Whether intermediate files (prompt, adapted Markdown, HTML) should be kept.
+
+    Parameters:
+        flag (bool): Value of the --artifacts command-line option.
+
+    Returns:
+        bool: True if the flag or the RESUME_ARTIFACTS environment variable asks for them.
+    """
+    return flag or os.getenv("RESUME_ARTIFACTS", "0").lower() in ("1", "true", "yes")
+
+def save_artifact(directory: str, name: str, content) -> str:
+    """
+    Write an intermediate result for debugging or auditing.
+
+    Parameters:
+        directory (str): Folder for the artifact, or None to skip saving.
+        name (str): File name inside the folder.
+        content (str | bytes): Data to write.
+
+    Returns:
+        str: Path of the written file, or None if nothing was saved.
+    """
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    if isinstance(content, bytes):
+        with open(path, "wb") as f:
+            f.write(content)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+    return path
@@ -0,0 +1,133 @@
+import re  # Module for tokenizing resumes and job descriptions
+import numpy as np  # Vectorized weighting and scoring
+from scipy import sparse  # Sparse term matrices
+
+# Markdown syntax and placeholders that are not content
+MARKDOWN_NOISE = re.compile(r"\[\[CONTACT\]\]|\]\([^)]*\)|https?://\S+|[*_#`>|\[\]]")
+
+# Words with letters/digits, keeping tech names such as c++, c#, node.js
+TOKEN_RE = re.compile(r"\w[\w+#.]*[\w+#]|\w")
+
+# Function words ignored when matching (English and Spanish)
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the their this to was we
+were will with you your yours they them us not but if into than then there these those who what which
+el la los las un una unos unas y o u de del al en con por para que se su sus es son como más mas
+muy sin sobre entre tu tus nuestro nuestra nuestros nuestras lo le les ya este esta estos estas
+""".split())
+
+def tokenize(text: str) -> list:
+    """
+    Lower-case content words and adjacent word pairs of a Markdown or plain text.
+
+    Parameters:
+        text (str): Resume Markdown or job description.
+
+    Returns:
+        list: Unigram and bigram terms.
+    """
+    words = [w.strip(".") for w in TOKEN_RE.findall(MARKDOWN_NOISE.sub(" ", text.lower()))]
+    words = [w for w in words if w and w not in STOPWORDS and not w.isdigit()]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+class ATSScorer:
+    """
+    TF-IDF keyword matcher between resumes and job descriptions.
+
+    Inverse document frequencies are fitted once on a corpus (typically every
+    posting in a batch); scoring is then a single sparse matrix product, so
+    thousands of postings are ranked in milliseconds.
+    """
+
+    def __init__(self, corpus: list):
+        self.vocab = {}
+        doc_terms = []  # (unique term ids, counts) per corpus document
+        for text in corpus:
+            ids = [self.vocab.setdefault(term, len(self.vocab)) for term in tokenize(text)]
+            doc_terms.append(np.unique(np.array(ids, dtype=np.int64), return_counts=True))
+        df = np.bincount(np.concatenate([ids for ids, _ in doc_terms] or [np.array([], dtype=np.int64)]),
+                         minlength=len(self.vocab))
+        n = len(corpus)
+        self.idf = np.log((1 + n) / (1 + df)) + 1  # Smoothed idf, always positive
+        self.unseen_idf = np.log(1 + n) + 1  # Weight of terms that never appear in the corpus
+        self.matrix = self._weigh(doc_terms, np.zeros(n))  # TF-IDF rows of the corpus itself
+
+    def _weigh(self, doc_terms: list, unseen_sq: np.ndarray) -> sparse.csr_matrix:
+        # Sublinear tf times idf, L2-normalized per row (unseen terms only add to the norm)
+        rows = np.repeat(np.arange(len(doc_terms)), [len(ids) for ids, _ in doc_terms])
+        cols = np.concatenate([ids for ids, _ in doc_terms] or [np.array([], dtype=np.int64)])
+        counts = np.concatenate([cnt for _, cnt in doc_terms] or [np.array([], dtype=np.int64)])
+        weights = (1 + np.log(counts)) * self.idf[cols]
+        matrix = sparse.csr_matrix((weights, (rows, cols)), shape=(len(doc_terms), len(self.vocab)))
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel() + unseen_sq)
+        norms[norms == 0] = 1.0
+        return sparse.diags(1 / norms) @ matrix
+
+    def transform(self, texts: list) -> sparse.csr_matrix:
+        """
+        Turn texts into L2-normalized TF-IDF rows over the fitted vocabulary.
+
+        Terms outside the vocabulary cannot match anything, but they still count
+        towards each row's norm so a resume padded with unrelated words scores lower.
+        """
+        doc_terms = []
+        unseen_sq = np.zeros(len(texts))
+        for i, text in enumerate(texts):
+            ids, unseen = [], {}
+            for term in tokenize(text):
+                term_id = self.vocab.get(term)
+                if term_id is None:
+                    unseen[term] = unseen.get(term, 0) + 1
+                else:
+                    ids.append(term_id)
+            doc_terms.append(np.unique(np.array(ids, dtype=np.int64), return_counts=True))
+            if unseen:
+                tf = 1 + np.log(np.fromiter(unseen.values(), dtype=float))
+                unseen_sq[i] = np.sum((tf * self.unseen_idf) ** 2)
+        return self._weigh(doc_terms, unseen_sq)
+
+    def score(self, resumes: list, jobs: list) -> np.ndarray:
+        """
+        Match score (0-100, cosine similarity) of every resume against every job.
+
+        Returns:
+            ndarray: Shape (len(resumes), len(jobs)).
+        """
+        return np.asarray((self.transform(resumes) @ self.transform(jobs).T).todense()) * 100
+
+    def score_last(self) -> np.ndarray:
+        """
+        Scores of the last corpus document (the resume) against every other one (the postings).
+        """
+        return (self.matrix[:-1] @ self.matrix[-1].T).toarray().ravel() * 100
+
+def score_postings(md_resume: str, job_descriptions: list) -> np.ndarray:
+    """
+    Score one resume against many job descriptions.
+
+    Parameters:
+        md_resume (str): Resume in Markdown format.
+        job_descriptions (list): Job description texts.
+
+    Returns:
+        ndarray: One score (0-100) per job description.
+    """
+    return ATSScorer(list(job_descriptions) + [md_resume]).score_last()
+
+def score_delta(original_md: str, adapted_md: str, job_description: str, scorer: ATSScorer = None) -> dict:
+    """
+    Compare the match score of the original and adapted resumes for one job.
+
+    Parameters:
+        original_md (str): Resume before adaptation.
+        adapted_md (str): Resume after adaptation.
+        job_description (str): Job description text.
+        scorer (ATSScorer): Optional scorer already fitted on a larger corpus.
+
+    Returns:
+        dict: `original`, `adapted` and `delta` scores, rounded to one decimal.
+    """
+    scorer = scorer or ATSScorer([job_description, original_md])
+    original, adapted = scorer.score([original_md, adapted_md], [job_description])[:, 0]
+    return {"original": round(float(original), 1), "adapted": round(float(adapted), 1),
+            "delta": round(float(adapted - original), 1)}
@@ -0,0 +1,225 @@
+import os
+import re
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.optimize_resume import generate_compact_prompt
+from src.adapt_resume import adapt_resume_text
+from src.export_resume import markdown_to_html
+from src.artifacts import save_artifact
+from src.pdf_renderer import PDFRenderer, DEFAULT_CHUNK_SIZE
+from src.llm_cache import get_default_cache
+from src.ats_score import ATSScorer, score_delta
+
+# -------------------- JOB LOADING --------------------
+
+def slugify(value: str) -> str:
+    """
+    Turn an arbitrary job identifier into a safe file name.
+    """
+    slug = re.sub(r"[^\w\-]+", "_", value.strip()).strip("_")
+    return slug or "job"
+
+def load_job_descriptions(source: str) -> list:
+    """
+    Load job descriptions from a folder of .txt files or from a JSONL file.
+
+    JSONL lines must contain a `description` (or `job_description`) field and
+    may contain an `id` field; missing ids fall back to the line number.
+
+    Parameters:
+        source (str): Path to a directory or a .jsonl file.
+
+    Returns:
+        list: List of dicts with `id` and `description` keys.
+    """
+    jobs = []
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if not name.endswith(".txt"):
+                continue
+            with open(os.path.join(source, name), "r", encoding="utf-8") as f:
+                description = f.read().strip()
+            if description:
+                jobs.append({"id": slugify(os.path.splitext(name)[0]), "description": description})
+    elif source.endswith(".jsonl"):
+        with open(source, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                description = (record.get("description") or record.get("job_description") or "").strip()
+                if description:
+                    job_id = slugify(str(record.get("id", line_no)))
+                    jobs.append({"id": job_id, "description": description})
+    else:
+        raise ValueError(f"Unsupported job source (expected a folder or .jsonl file): {source}")
+
+    # Keep ids unique so outputs never overwrite each other
+    seen = {}
+    for job in jobs:
+        count = seen.get(job["id"], 0)
+        seen[job["id"]] = count + 1
+        if count:
+            job["id"] = f"{job['id']}_{count + 1}"
+    return jobs
+
+# -------------------- STAGES --------------------
+
+def _adapt_job(md_resume: str, job: dict, job_dir: str, token_budget: int = None,
+               scorer: ATSScorer = None, keep_artifacts: bool = False, theme: str = None) -> str:
+    """
+    Build the prompt for one job, adapt the resume with the LLM, record the
+    match score change and render the adapted Markdown to print-ready HTML.
+
+    Everything stays in memory except the HTML handed to the renderer; the
+    prompt and adapted Markdown are saved only with `keep_artifacts`.
+
+    Returns:
+        str: Path to the HTML file.
+    """
+    os.makedirs(job_dir, exist_ok=True)
+    artifacts_dir = job_dir if keep_artifacts else None
+    prompt, report = generate_compact_prompt(md_resume, job["description"], token_budget)
+    job["saved_tokens"] = report["saved_tokens"]
+    save_artifact(artifacts_dir, "prompt.txt", prompt)
+
+    try:
+        adapted_md = adapt_resume_text(prompt)
+    except Exception as e:
+        raise RuntimeError(f"LLM adaptation failed for job '{job['id']}': {e}") from e
+    save_artifact(artifacts_dir, "adapted_resume.md", adapted_md)
+    job["score"] = score_delta(md_resume, adapted_md, job["description"], scorer)
+
+    # wkhtmltopdf renders chunks of files, so the HTML is the one file always written
+    html_path = os.path.join(job_dir, "resume.html")
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(markdown_to_html(adapted_md, for_editor=False, html_dir=job_dir, theme=theme))
+    return html_path
+
+# -------------------- BATCH RUNNER --------------------
+
+def run_batch(md_resume: str, jobs: list, output_dir: str, pdf_dir: str, logger,
+              llm_workers: int = 8, render_workers: int = None, render_chunk_size: int = DEFAULT_CHUNK_SIZE,
+              token_budget: int = None, min_score: float = None, keep_artifacts: bool = False,
+              theme: str = None) -> list:
+    """
+    Tailor one Markdown resume against many job descriptions concurrently.
+
+    Postings are first scored locally against the resume (TF-IDF match, no
+    LLM call); those below `min_score` are skipped and the rest are adapted
+    best match first.
+
+    LLM calls are I/O bound and run on a bounded thread pool. PDF rendering
+    runs on a PDFRenderer process pool: finished jobs are grouped into chunks
+    of `render_chunk_size` and each chunk is rendered by one wkhtmltopdf process.
+
+    Parameters:
+        md_resume (str): Resume content in Markdown format.
+        jobs (list): Jobs as returned by `load_job_descriptions`.
+        output_dir (str): Folder for per-job intermediate files.
+        pdf_dir (str): Folder for the final PDFs.
+        logger: Logger instance.
+        llm_workers (int): Maximum number of concurrent LLM requests.
+        render_workers (int): Number of rendering processes (defaults to CPU count).
+        render_chunk_size (int): Documents per wkhtmltopdf invocation.
+        token_budget (int): Optional maximum prompt size in tokens.
+        min_score (float): Skip postings whose match score (0-100) is below this value.
+        keep_artifacts (bool): Also save each job's prompt and adapted Markdown.
+        theme (str): Theme name or folder for the rendered resumes.
+
+    Returns:
+        list: One result dict per job with `id`, `status`, `pdf`, `error` and `score` keys.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(pdf_dir, exist_ok=True)
+    results = {job["id"]: {"id": job["id"], "status": "pending", "pdf": None, "error": None, "score": None}
+               for job in jobs}
+    start = time.perf_counter()
+
+    # Pre-rank postings locally before spending LLM calls
+    scorer = ATSScorer([job["description"] for job in jobs] + [md_resume])
+    for job, value in zip(jobs, scorer.score_last()):
+        job["match_score"] = round(float(value), 1)
+        results[job["id"]]["score"] = {"original": job["match_score"]}
+    ranked = sorted(jobs, key=lambda job: job["match_score"], reverse=True)
+    if min_score is not None:
+        for job in ranked:
+            if job["match_score"] < min_score:
+                results[job["id"]]["status"] = "skipped"
+                logger.info(f"⏭️ [{job['id']}] Match score {job['match_score']:.1f} below {min_score:g}, skipped.")
+        ranked = [job for job in ranked if job["match_score"] >= min_score]
+
+    with ThreadPoolExecutor(max_workers=llm_workers) as llm_pool, \
+            PDFRenderer(workers=render_workers, chunk_size=render_chunk_size) as renderer:
+
+        llm_futures = {
+            llm_pool.submit(_adapt_job, md_resume, job, os.path.join(output_dir, job["id"]),
+                            token_budget, scorer, keep_artifacts, theme): job
+            for job in ranked
+        }
+        render_futures = {}
+        pending = []
+
+        def flush():
+            chunk = list(pending)
+            pending.clear()
+            render_futures[renderer.submit_chunk(chunk)] = chunk
+
+        for future in as_completed(llm_futures):
+            job_id = llm_futures[future]["id"]
+            try:
+                html_path = future.result()
+            except Exception as e:
+                results[job_id].update(status="failed", error=str(e))
+                logger.info(f"❌ [{job_id}] Adaptation failed: {e}")
+                continue
+            score = llm_futures[future]["score"]
+            results[job_id]["score"] = score
+            logger.info(f"🤖 [{job_id}] Resume adapted (match {score['original']:.1f} → {score['adapted']:.1f}), "
+                        f"queued for rendering.")
+            pdf_path = os.path.join(pdf_dir, f"{job_id}.pdf")
+            results[job_id]["pdf"] = pdf_path
+            pending.append((html_path, pdf_path))
+            if len(pending) >= renderer.chunk_size:
+                flush()
+        if pending:
+            flush()
+
+        pdf_to_job = {r["pdf"]: job_id for job_id, r in results.items() if r["pdf"]}
+        for future in as_completed(render_futures):
+            try:
+                errors = future.result()
+            except Exception as e:
+                errors = {pdf: str(e) for _, pdf in render_futures[future]}
+            for pdf_path, error in errors.items():
+                job_id = pdf_to_job[pdf_path]
+                if error:
+                    results[job_id].update(status="failed", pdf=None, error=error)
+                    logger.info(f"❌ [{job_id}] Rendering failed: {error}")
+                else:
+                    results[job_id]["status"] = "done"
+                    logger.info(f"📄 [{job_id}] PDF saved.")
+
+    elapsed = time.perf_counter() - start
+    done = sum(1 for r in results.values() if r["status"] == "done")
+    throughput = done / elapsed if elapsed > 0 else 0.0
+    saved = sum(job.get("saved_tokens", 0) for job in jobs)
+    logger.info(f"✂️ Job description compaction saved {saved} input tokens.")
+    deltas = [job["score"]["delta"] for job in jobs if "score" in job]
+    if deltas:
+        logger.info(f"🎯 Match score change after adaptation: {sum(deltas) / len(deltas):+.1f} on average.")
+    skipped = sum(1 for r in results.values() if r["status"] == "skipped")
+    if skipped:
+        logger.info(f"⏭️ {skipped} posting(s) skipped below the minimum match score.")
+    logger.info(f"✅ Batch finished: {done}/{len(jobs)} resumes in {elapsed:.1f}s ({throughput:.2f} PDFs/s).")
+    cache = get_default_cache()
+    if cache:
+        stats = cache.stats()
+        logger.info(f"⚡ LLM cache: {stats['hits']} hits, {stats['misses']} misses.")
+
+    summary = list(results.values())
+    with open(os.path.join(output_dir, "batch_summary.json"), "w", encoding="utf-8") as f:
+        json.dump({"elapsed_seconds": round(elapsed, 3), "results": summary}, f, indent=2, ensure_ascii=False)
+    return summary
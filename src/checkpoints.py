@@ -0,0 +1,118 @@
+import os  # Module for interacting with the operating system
+import json  # Module for the run manifest
+import time  # Module for stage timestamps
+import hashlib  # Module for content hashes
+from datetime import datetime  # Module for readable timestamps
+
+MANIFEST_NAME = "run.json"
+
+def content_hash(value) -> str:
+    """
+    SHA-256 of a stage input or output (text, bytes, or any JSON-serializable value).
+    """
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+    elif isinstance(value, bytes):
+        data = value
+    else:
+        data = json.dumps(value, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+def checkpoints_enabled() -> bool:
+    """
+    Whether runs record checkpoints (RESUME_CHECKPOINTS, default on).
+    """
+    return os.getenv("RESUME_CHECKPOINTS", "1").lower() not in ("0", "false", "no")
+
+class RunCheckpoint:
+    """
+    Per-run manifest of completed stages.
+
+    Each stage records the hashes of its inputs and of its output; the output
+    itself is kept in the checkpoint folder (or, for files the pipeline already
+    writes such as the PDF, referenced by path). With `resume`, a stage whose
+    inputs hash the same and whose output is intact is skipped and its output
+    reused. The first stage that has to run again invalidates every later
+    stage, so a resumed run restarts from that point.
+
+    Parameters:
+        directory (str): Folder for the manifest and stage outputs, or None to
+            record nothing (checkpoints disabled).
+        resume (bool): Reuse completed stages (otherwise they are only recorded).
+    """
+
+    def __init__(self, directory: str, resume: bool = False):
+        self.directory = directory
+        self.resume = resume and directory is not None
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME) if directory else None
+        self.restarted = False  # True once a stage has run in this invocation
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except (OSError, TypeError, ValueError):
+            self.manifest = {"stages": {}}
+
+    def _output_path(self, stage: str, binary: bool) -> str:
+        return os.path.join(self.directory, f"{stage}.{'bin' if binary else 'txt'}")
+
+    def lookup(self, stage: str, inputs: dict):
+        """
+        Return the recorded output of `stage` if it can be reused, else None.
+
+        Parameters:
+            stage (str): Stage name.
+            inputs (dict): Values the stage depends on.
+
+        Returns:
+            str | bytes: The stage output, or None if the stage must run.
+        """
+        entry = self.manifest["stages"].get(stage)
+        if not self.resume or self.restarted or not entry or entry.get("status") != "done":
+            return None
+        if entry["inputs"] != {name: content_hash(value) for name, value in inputs.items()}:
+            return None
+        path, binary = entry["output"]["path"], entry["output"]["binary"]
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if content_hash(data) != entry["output"]["sha256"]:
+            return None  # Output was edited or truncated since it was recorded
+        return data if binary else data.decode("utf-8")
+
+    def record(self, stage: str, inputs: dict, output, path: str = None) -> None:
+        """
+        Save a completed stage and its output, then rewrite the manifest.
+
+        Parameters:
+            stage (str): Stage name.
+            inputs (dict): Values the stage depended on.
+            output (str | bytes): What the stage produced.
+            path (str): File the pipeline already wrote the output to; when
+                omitted the output is stored in the checkpoint folder.
+        """
+        self.restarted = True
+        if self.directory is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        binary = isinstance(output, bytes)
+        if path is None:
+            path = self._output_path(stage, binary)
+            with open(path, "wb") as f:
+                f.write(output if binary else output.encode("utf-8"))
+        self.manifest["stages"][stage] = {
+            "status": "done",
+            "inputs": {name: content_hash(value) for name, value in inputs.items()},
+            "output": {"path": path, "sha256": content_hash(output), "binary": binary},
+            "completed_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.save()
+
+    def save(self) -> None:
+        # Write then rename, so an interrupted run never leaves a half-written manifest
+        self.manifest["updated_at"] = time.time()
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
@@ -1,8 +1,19 @@
+import io
 import os
 import re
+import json
+import time
+import hashlib
 import docx
-from lxml import etree
 from pathlib import Path
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+
+from src.docx_stream import iter_blocks, extract_paragraph_runs, runs_to_markdown
+
+# Bump whenever a change to this module alters the generated Markdown,
+# so incremental builds reconvert documents produced by older versions.
+CONVERTER_VERSION = "2"
 
 # === Style to Markdown mapping ===
 
@@ -33,51 +44,14 @@ def extract_hyperlinks(doc: docx.Document) -> dict:
     }
 
 def extract_runs(para: docx.text.paragraph.Paragraph, rels: dict) -> str:
-    result = []
-    root = etree.fromstring(para._element.xml)
-    ns = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
-    seen_texts = set()
-
-    for elem in root.xpath(".//w:hyperlink | .//w:r", namespaces=ns):
-        if etree.QName(elem).localname == "hyperlink":
-            rel_id = elem.get("{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id")
-            if rel_id in rels:
-                url = rels[rel_id]
-                text = "".join(t.text for t in elem.xpath(".//w:t", namespaces=ns) if t.text).strip()
-                norm_text = re.sub(r"\s+", " ", text)
-                if norm_text and norm_text not in seen_texts:
-                    result.append(f"[{norm_text}]({url})")
-                    seen_texts.add(norm_text)
-        elif etree.QName(elem).localname == "r":
-            if elem.getparent() is not None and etree.QName(elem.getparent()).localname == "hyperlink":
-                continue
-            t = elem.xpath(".//w:t", namespaces=ns)
-            if t and t[0].text:
-                text = t[0].text.strip()
-                norm_text = re.sub(r"\s+", " ", text)
-                if not norm_text or norm_text in seen_texts:
-                    continue
-                is_bold = elem.xpath(".//w:b", namespaces=ns)
-                is_italic = elem.xpath(".//w:i", namespaces=ns)
-
-                if is_bold and is_italic:
-                    result.append(f"***{norm_text}***")
-                elif is_bold:
-                    result.append(f"**{norm_text}**")
-                elif is_italic:
-                    result.append(f"*{norm_text}*")
-                else:
-                    result.append(norm_text)
-                seen_texts.add(norm_text)
-
-    return " ".join(result)
+    return runs_to_markdown(extract_paragraph_runs(para._element, rels))
 
 
-def process_paragraph(para: docx.text.paragraph.Paragraph, rels: dict) -> str:
-    text = extract_runs(para, rels).strip()
+def format_paragraph(text: str, style_name: str) -> str:
+    text = text.strip()
     if not text:
         return ""
-    style = para.style.name.strip().lower()
+    style = style_name.strip().lower()
     if style in STYLE_TO_MD:
         return STYLE_TO_MD[style](text)
     if text.startswith("- ") or "•" in text:
@@ -85,11 +59,12 @@ def process_paragraph(para: docx.text.paragraph.Paragraph, rels: dict) -> str:
     return text
 
 
-def process_table(table: docx.table.Table) -> str:
-    rows = []
-    for row in table.rows:
-        cells = [cell.text.strip().replace("\n", " ") for cell in row.cells]
-        rows.append("| " + " | ".join(cells) + " |")
+def process_paragraph(para: docx.text.paragraph.Paragraph, rels: dict) -> str:
+    return format_paragraph(extract_runs(para, rels), para.style.name)
+
+
+def rows_to_markdown(rows: list) -> str:
+    rows = ["| " + " | ".join(cell.strip().replace("\n", " ") for cell in cells) + " |" for cells in rows]
 
     if len(rows) >= 2:
         header_sep = "| " + " | ".join("---" for _ in rows[0].split("|") if _ and _ != " ") + " |"
@@ -97,6 +72,10 @@ def process_table(table: docx.table.Table) -> str:
     return "\n".join(rows)
 
 
+def process_table(table: docx.table.Table) -> str:
+    return rows_to_markdown([[cell.text for cell in row.cells] for row in table.rows])
+
+
 def merge_education_blocks(md_lines: list) -> list:
     merged = []
     i = 0
@@ -124,19 +103,28 @@ def merge_education_blocks(md_lines: list) -> list:
 
 # === Main Conversion Function ===
 
-def convert_docx_to_md(input_path: str, output_path: str) -> None:
-    
-    doc = docx.Document(input_path)
-    rels = extract_hyperlinks(doc)
+def docx_to_markdown(source) -> str:
+    """
+    Convert a .docx document (path, file object or raw bytes) to Markdown in memory.
+    """
     md_lines = []
+    tables = []
+    detected_styles = set()
     previous_style = ""
 
-    for para in doc.paragraphs:
-        line = process_paragraph(para, rels)
-        if not line:
+    # Single streaming pass over word/document.xml (see src/docx_stream.py)
+    for block in iter_blocks(source):
+        if block["type"] == "table":
+            tables.append(rows_to_markdown(block["rows"]))
             continue
 
-        current_style = para.style.name
+        current_style = block["style"]
+        if block["text"].strip():
+            detected_styles.add(current_style)
+
+        line = format_paragraph(runs_to_markdown(block["runs"]), current_style)
+        if not line:
+            continue
 
         if previous_style in ("Bullet", "Normal") and current_style not in ("Bullet", "Normal"):
             md_lines.append("")
@@ -144,20 +132,149 @@ def convert_docx_to_md(input_path: str, output_path: str) -> None:
         md_lines.append(line)
         previous_style = current_style
 
-    for table in doc.tables:
-        md_lines.append(process_table(table))
+    md_lines.extend(tables)
 
     md_lines = merge_education_blocks(md_lines)
-    detected_styles = set(para.style.name for para in doc.paragraphs if para.text.strip())
     print("🧾 Estilos detectados en el documento:")
     for s in sorted(detected_styles):
         print("  -", s)
 
     content = "\n".join(md_lines)
-    content = normalize_spacing(content)
+    return normalize_spacing(content)
+
+
+def convert_docx_to_md(input_path: str, output_path: str) -> None:
+    content = docx_to_markdown(input_path)
 
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
     with open(output_path, "w", encoding="utf-8") as md_file:
         md_file.write(content)
 
     print(f"✅ Markdown saved to {output_path}")
+
+
+# === Incremental Build ===
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def build_info_path(output_path: str) -> str:
+    return str(Path(output_path).with_suffix(".build.json"))
+
+def is_up_to_date(input_path: str, output_path: str, source_hash: str = None) -> bool:
+    """
+    Check whether output_path was generated from the current input_path
+    by the current converter version.
+    """
+    if not os.path.exists(output_path):
+        return False
+    try:
+        with open(build_info_path(output_path), "r", encoding="utf-8") as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return (
+        info.get("converter_version") == CONVERTER_VERSION
+        and info.get("source_sha256") == (source_hash or file_sha256(input_path))
+    )
+
+def convert_docx_to_md_incremental(input_path: str, output_path: str) -> bool:
+    """
+    Convert a DOCX file to Markdown unless the existing output already matches
+    the input's content hash and the converter version.
+
+    Returns:
+        bool: True if the document was (re)converted, False if it was skipped.
+    """
+    source_hash = file_sha256(input_path)
+    if is_up_to_date(input_path, output_path, source_hash):
+        print(f"⏭️ {output_path} is up to date, skipping conversion")
+        return False
+
+    convert_docx_to_md(input_path, output_path)
+    with open(build_info_path(output_path), "w", encoding="utf-8") as f:
+        json.dump({
+            "source": os.path.basename(input_path),
+            "source_sha256": source_hash,
+            "converter_version": CONVERTER_VERSION,
+        }, f, indent=2)
+    return True
+
+def list_docx_files(input_dir: str) -> list:
+    """
+    Names of the DOCX files in input_dir (Word lock files `~$*.docx` excluded), sorted.
+    """
+    with os.scandir(input_dir) as entries:
+        return sorted(
+            entry.name for entry in entries
+            if entry.name.endswith(".docx") and not entry.name.startswith("~$") and entry.is_file()
+        )
+
+def _convert_one(input_path: str, output_path: str) -> dict:
+    # Runs in a worker process; per-document output is silenced and errors are returned, not raised
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(io.StringIO()):
+            converted = convert_docx_to_md_incremental(input_path, output_path)
+        status, error = ("converted" if converted else "skipped"), None
+    except Exception as e:
+        status, error = "failed", f"{type(e).__name__}: {e}"
+    return {
+        "file": os.path.basename(input_path),
+        "markdown": output_path,
+        "status": status,
+        "seconds": round(time.perf_counter() - start, 4),
+        "error": error,
+    }
+
+def convert_docx_folder(input_dir: str, output_dir: str, workers: int = None, manifest_path: str = None) -> dict:
+    """
+    Incrementally convert every DOCX file in input_dir to Markdown in output_dir
+    on a process pool. Only new or edited documents are reconverted, and a
+    document that fails does not stop the others.
+
+    Parameters:
+        input_dir (str): Folder with the .docx files.
+        output_dir (str): Folder for the .md files.
+        workers (int): Worker processes (defaults to the CPU count).
+        manifest_path (str): Where to write the per-file results
+            (defaults to `conversion_manifest.json` in output_dir).
+
+    Returns:
+        dict: Lists of `converted`, `skipped` and `failed` file names, per-file
+        `results`, `elapsed_seconds`, `files_per_second` and `manifest_path`.
+    """
+    start = time.perf_counter()
+    names = list_docx_files(input_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(names) or 1))
+
+    tasks = [(os.path.join(input_dir, name), os.path.join(output_dir, os.path.splitext(name)[0] + ".md"))
+             for name in names]
+    if workers == 1:
+        results = [_convert_one(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_convert_one, *zip(*tasks)))
+
+    elapsed = time.perf_counter() - start
+    report = {status: [r["file"] for r in results if r["status"] == status]
+              for status in ("converted", "skipped", "failed")}
+    report.update({
+        "results": results,
+        "workers": workers,
+        "elapsed_seconds": round(elapsed, 3),
+        "files_per_second": round(len(results) / elapsed, 2) if elapsed > 0 else 0.0,
+        "manifest_path": manifest_path or os.path.join(output_dir, "conversion_manifest.json"),
+    })
+    with open(report["manifest_path"], "w", encoding="utf-8") as f:
+        json.dump({
+            "input_dir": input_dir,
+            "converter_version": CONVERTER_VERSION,
+            **{key: report[key] for key in ("workers", "elapsed_seconds", "files_per_second", "results")},
+        }, f, indent=2, ensure_ascii=False)
+    return report
@@ -0,0 +1,254 @@
+import re
+import io
+import zipfile
+import posixpath
+from lxml import etree
+
+# === Namespaces and tags ===
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+OFFICE_DOCUMENT_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+
+
+def _w(tag: str) -> str:
+    return f"{{{W_NS}}}{tag}"
+
+
+W_BODY, W_P, W_TBL, W_TR, W_TC = _w("body"), _w("p"), _w("tbl"), _w("tr"), _w("tc")
+W_R, W_T, W_B, W_I, W_HYPERLINK = _w("r"), _w("t"), _w("b"), _w("i"), _w("hyperlink")
+W_TAB, W_PTAB, W_BR, W_CR, W_NO_BREAK_HYPHEN = _w("tab"), _w("ptab"), _w("br"), _w("cr"), _w("noBreakHyphen")
+W_PPR, W_PSTYLE, W_TCPR, W_GRID_SPAN, W_VMERGE = _w("pPr"), _w("pStyle"), _w("tcPr"), _w("gridSpan"), _w("vMerge")
+W_TBL_GRID, W_GRID_COL = _w("tblGrid"), _w("gridCol")
+W_STYLE, W_NAME = _w("style"), _w("name")
+W_VAL, W_TYPE, W_DEFAULT, W_STYLE_ID = _w("val"), _w("type"), _w("default"), _w("styleId")
+R_ID = f"{{{R_NS}}}id"
+
+# Word stores some built-in style names in lowercase; python-docx shows them
+# title-cased, and the converter relies on the python-docx spelling.
+UI_STYLE_NAMES = {name.lower(): name for name in ["Caption", "Footer", "Header"] + [f"Heading {i}" for i in range(1, 10)]}
+
+
+# === Package parts ===
+
+def _read_rels(zf: zipfile.ZipFile, part_name: str) -> list:
+    folder, name = posixpath.split(part_name)
+    rels_name = posixpath.join(folder, "_rels", f"{name}.rels")
+    if rels_name not in zf.namelist():
+        return []
+    root = etree.fromstring(zf.read(rels_name))
+    return [
+        (rel.get("Id"), rel.get("Type", ""), rel.get("Target", ""), rel.get("TargetMode"))
+        for rel in root.iter(f"{{{PKG_REL_NS}}}Relationship")
+    ]
+
+
+def _document_part_name(zf: zipfile.ZipFile) -> str:
+    for _, rel_type, target, _ in _read_rels(zf, ""):
+        if rel_type == OFFICE_DOCUMENT_REL:
+            return target.lstrip("/")
+    return "word/document.xml"
+
+
+def _read_styles(zf: zipfile.ZipFile, part_name: str, rels: list) -> tuple:
+    """
+    Map paragraph style ids to display names and find the default paragraph style.
+    """
+    folder = posixpath.dirname(part_name)
+    styles_part = next(
+        (posixpath.normpath(posixpath.join(folder, target)) for _, rel_type, target, _ in rels
+         if rel_type.endswith("/styles")),
+        None,
+    )
+    names, default_name = {}, "Normal"
+    if not styles_part or styles_part not in zf.namelist():
+        return names, default_name
+
+    root = etree.fromstring(zf.read(styles_part))
+    for style in root.iter(W_STYLE):
+        if style.get(W_TYPE) != "paragraph":
+            continue
+        style_id = style.get(W_STYLE_ID)
+        name_elem = style.find(W_NAME)
+        name = name_elem.get(W_VAL) if name_elem is not None else style_id
+        name = UI_STYLE_NAMES.get(name, name)
+        names.setdefault(style_id, name)
+        if style.get(W_DEFAULT) in ("1", "true", "on"):
+            default_name = name
+    return names, default_name
+
+
+# === Element helpers ===
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text)
+
+
+def paragraph_style_id(p) -> str:
+    ppr = p.find(W_PPR)
+    pstyle = ppr.find(W_PSTYLE) if ppr is not None else None
+    return pstyle.get(W_VAL) if pstyle is not None else None
+
+
+def paragraph_text(p) -> str:
+    """
+    Plain text of a paragraph, matching python-docx's `Paragraph.text`.
+    """
+    parts = []
+    for child in p:
+        if child.tag == W_R:
+            runs = (child,)
+        elif child.tag == W_HYPERLINK:
+            runs = child.iterchildren(W_R)
+        else:
+            continue
+        for run in runs:
+            for elem in run:
+                if elem.tag == W_T:
+                    parts.append(elem.text or "")
+                elif elem.tag in (W_TAB, W_PTAB):
+                    parts.append("\t")
+                elif elem.tag == W_CR or (elem.tag == W_BR and elem.get(W_TYPE, "textWrapping") == "textWrapping"):
+                    parts.append("\n")
+                elif elem.tag == W_NO_BREAK_HYPHEN:
+                    parts.append("-")
+    return "".join(parts)
+
+
+def extract_paragraph_runs(p, rels: dict) -> list:
+    """
+    Extract formatted runs and hyperlinks from a <w:p> element in document order.
+
+    Returns:
+        list: Dicts with `text`, `bold`, `italic` and `url` keys. Hyperlinks carry
+        a `url`; runs nested directly in a hyperlink are folded into it.
+    """
+    runs = []
+    for elem in p.iter(W_HYPERLINK, W_R):
+        if elem.tag == W_HYPERLINK:
+            url = rels.get(elem.get(R_ID))
+            if url is None:
+                continue
+            text = "".join(t.text for t in elem.iter(W_T) if t.text).strip()
+            runs.append({"text": normalize_text(text), "bold": False, "italic": False, "url": url})
+        else:
+            parent = elem.getparent()
+            if parent is not None and parent.tag == W_HYPERLINK:
+                continue
+            t = next(elem.iter(W_T), None)
+            if t is None or not t.text:
+                continue
+            runs.append({
+                "text": normalize_text(t.text.strip()),
+                "bold": next(elem.iter(W_B), None) is not None,
+                "italic": next(elem.iter(W_I), None) is not None,
+                "url": None,
+            })
+    return runs
+
+
+def runs_to_markdown(runs: list) -> str:
+    """
+    Render extracted runs as inline Markdown, dropping empty and repeated fragments.
+    """
+    result = []
+    seen_texts = set()
+    for run in runs:
+        text = run["text"]
+        if not text or text in seen_texts:
+            continue
+        if run["url"]:
+            result.append(f"[{text}]({run['url']})")
+        elif run["bold"] and run["italic"]:
+            result.append(f"***{text}***")
+        elif run["bold"]:
+            result.append(f"**{text}**")
+        elif run["italic"]:
+            result.append(f"*{text}*")
+        else:
+            result.append(text)
+        seen_texts.add(text)
+    return " ".join(result)
+
+
+def _grid_span(tc) -> int:
+    tcpr = tc.find(W_TCPR)
+    span = tcpr.find(W_GRID_SPAN) if tcpr is not None else None
+    return int(span.get(W_VAL)) if span is not None else 1
+
+
+def _is_vmerge_continue(tc) -> bool:
+    tcpr = tc.find(W_TCPR)
+    vmerge = tcpr.find(W_VMERGE) if tcpr is not None else None
+    return vmerge is not None and vmerge.get(W_VAL, "continue") == "continue"
+
+
+def table_rows(tbl) -> list:
+    """
+    Cell texts of a <w:tbl> element laid out like python-docx's `row.cells`:
+    horizontally merged cells repeat per grid column and vertically merged
+    cells repeat the text of the cell above.
+    """
+    grid = tbl.find(W_TBL_GRID)
+    col_count = len(grid.findall(W_GRID_COL)) if grid is not None else 0
+    cells = []
+    for tr in tbl.iterchildren(W_TR):
+        for tc in tr.iterchildren(W_TC):
+            text = "\n".join(paragraph_text(p) for p in tc.iterchildren(W_P))
+            for span_idx in range(_grid_span(tc)):
+                if _is_vmerge_continue(tc) and col_count and len(cells) >= col_count:
+                    cells.append(cells[-col_count])
+                elif span_idx > 0:
+                    cells.append(cells[-1])
+                else:
+                    cells.append(text)
+    if not col_count:
+        return [cells] if cells else []
+    return [cells[i:i + col_count] for i in range(0, len(cells), col_count)]
+
+
+# === Streaming engine ===
+
+def iter_blocks(docx_path):
+    """
+    Stream the body of a DOCX file in a single pass, yielding top-level
+    paragraphs and tables in document order.
+
+    `docx_path` may be a path, a binary file object or the raw .docx bytes.
+
+    Each element is released as soon as it has been processed, so memory stays
+    bounded by the largest single paragraph or table rather than the document.
+
+    Yields:
+        dict: {"type": "paragraph", "style", "text", "runs"} or {"type": "table", "rows"}.
+    """
+    if isinstance(docx_path, (bytes, bytearray)):
+        docx_path = io.BytesIO(docx_path)
+    with zipfile.ZipFile(docx_path) as zf:
+        part_name = _document_part_name(zf)
+        rels = _read_rels(zf, part_name)
+        hyperlinks = {rel_id: target for rel_id, rel_type, target, _ in rels if "hyperlink" in rel_type}
+        style_names, default_style = _read_styles(zf, part_name, rels)
+
+        with zf.open(part_name) as stream:
+            for _, elem in etree.iterparse(stream, events=("end",), tag=(W_P, W_TBL)):
+                parent = elem.getparent()
+                if parent is None or parent.tag != W_BODY:
+                    continue  # Nested in a table or content control; handled with its container
+
+                if elem.tag == W_P:
+                    style_id = paragraph_style_id(elem)
+                    yield {
+                        "type": "paragraph",
+                        "style": style_names.get(style_id, default_style),
+                        "text": paragraph_text(elem),
+                        "runs": extract_paragraph_runs(elem, hyperlinks),
+                    }
+                else:
+                    yield {"type": "table", "rows": table_rows(elem)}
+
+                # Free the processed element and everything before it
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del parent[0]
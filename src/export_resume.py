@@ -1,14 +1,25 @@
-import sys
 import os
 import re
+import html
+import hashlib
 import markdown2
-import pdfkit
-from PyQt5.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QPushButton, QMessageBox, 
-    QHBoxLayout, QLineEdit, QDialog, QFileDialog, QFormLayout, QLabel
-)
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtCore import QUrl
+from pathlib import Path
+from string import Template
+import threading
+from functools import lru_cache
+from src.pdf_renderer import WkhtmltopdfBackend
+from src.timing import span
+from src.font_subset import subsetting_enabled, glyphs_for, font_digest, FONT_SRC, embed_fonts as embed_font_faces
+
+# Fonts, themes and the page template live in assets/ at the project root
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+FONTS_DIR = os.path.join(ASSETS_DIR, "fonts")
+THEMES_DIR = os.path.join(ASSETS_DIR, "themes")
+TEMPLATE_PATH = os.path.join(ASSETS_DIR, "templates", "resume.html")
+DEFAULT_THEME = "default"
+
+# Image sources in untrusted documents other than inline data (file://, internal URLs...)
+UNSAFE_IMAGE_SRC = re.compile(r'(<img\b[^>]*?\bsrc=)(["\'])(?!data:image/)[^"\']*\2', re.IGNORECASE)
 
 # -------------------- UTILITIES --------------------
 
@@ -30,22 +41,131 @@ def normalize_markdown(md_text: str) -> str:
 
 # -------------------- MARKDOWN TO HTML --------------------
 
-def convert_md_to_html(md_path: str, html_path: str, for_editor: bool = False):
+def resolve_theme(theme: str = None) -> str:
     """
-    Convert a Markdown (.md) file into a styled HTML document.
+    Find a theme folder. A theme is a folder with a `resume.css` stylesheet and
+    optional `print.css`/`editor.css` overrides for each variant.
 
     Parameters:
-        md_path (str): Path to the input Markdown file.
-        html_path (str): Path to save the resulting HTML file.
+        theme (str): Theme name under assets/themes/, a path to a theme folder,
+            or None for RESUME_THEME (default: "default").
+
+    Returns:
+        str: Absolute path of the theme folder.
     """
-    # Check if the Markdown file exists
-    if not os.path.exists(md_path):
-        raise FileNotFoundError(f"Markdown file not found: {md_path}")
+    theme = theme or os.getenv("RESUME_THEME") or DEFAULT_THEME
+    theme_dir = theme if os.path.isdir(theme) else os.path.join(THEMES_DIR, theme)
+    if not os.path.isfile(os.path.join(theme_dir, "resume.css")):
+        raise FileNotFoundError(f"Theme not found (expected {theme_dir}/resume.css)")
+    return os.path.abspath(theme_dir)
 
-    # Read the Markdown file content
-    with open(md_path, "r", encoding="utf-8") as md_file:
-        md_content = md_file.read()
+def theme_fingerprint(theme: str = None) -> str:
+    """
+    Hash of everything a theme contributes to rendered output: the page
+    template, the theme's stylesheets and the fonts they reference. Editing
+    any of them changes the fingerprint, so checkpoints keyed on it go stale.
+
+    Parameters:
+        theme (str): Theme name or folder (see `resolve_theme`).
 
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    theme_dir = resolve_theme(theme)
+    digest = hashlib.sha256()
+    stylesheets = sorted(entry.path for entry in os.scandir(theme_dir) if entry.name.endswith(".css"))
+    for path in [TEMPLATE_PATH] + stylesheets:
+        with open(path, "rb") as f:
+            content = f.read()
+        digest.update(os.path.basename(path).encode("utf-8") + b"\0" + content)
+        if path == TEMPLATE_PATH:
+            continue
+        for url, _ in FONT_SRC.findall(content.decode("utf-8", errors="replace")):
+            if url.startswith("data:"):
+                continue
+            font_path = os.path.normpath(os.path.join(theme_dir, url))
+            digest.update(url.encode("utf-8") + b"\0")
+            digest.update(font_digest(font_path).encode("ascii") if os.path.isfile(font_path) else b"missing")
+    return digest.hexdigest()
+
+def list_themes() -> list:
+    """
+    Names of the themes under assets/themes/.
+    """
+    with os.scandir(THEMES_DIR) as entries:
+        return sorted(entry.name for entry in entries
+                      if entry.is_dir() and os.path.isfile(os.path.join(entry.path, "resume.css")))
+
+def check_theme_name(theme: str) -> str:
+    """
+    Validate a theme name coming from an untrusted client: only themes under
+    assets/themes/ are accepted, never a path.
+
+    Raises:
+        ValueError: If the name contains a path or names no bundled theme.
+    """
+    if "/" in theme or "\\" in theme or ".." in theme or theme not in list_themes():
+        raise ValueError(f"Unknown theme '{theme}' (available: {', '.join(list_themes())})")
+    return theme
+
+@lru_cache(maxsize=32)
+def compile_template(theme_dir: str, variant: str, embed_fonts: bool = False) -> tuple:
+    """
+    Read the page template and find the theme stylesheets for a theme and
+    variant once per process. The output folder is not part of the key, so
+    documents saved to different folders share one compiled template; their
+    stylesheet links are filled in by `stylesheet_links` at render time.
+
+    Parameters:
+        theme_dir (str): Theme folder from `resolve_theme`.
+        variant (str): "print" or "editor".
+        embed_fonts (bool): Leave `resume.css` out; it is inlined with embedded fonts instead.
+
+    Returns:
+        tuple: (Template with `$inline_styles`, `$stylesheets`, `$header_html` and
+            `$html_body` placeholders, stylesheet paths).
+    """
+    paths = []
+    for name in ("resume.css", f"{variant}.css"):
+        path = os.path.join(theme_dir, name)
+        if not os.path.isfile(path) or (embed_fonts and name == "resume.css"):
+            continue
+        paths.append(path)
+    with open(TEMPLATE_PATH, "r", encoding="utf-8") as f:
+        return Template(f.read()), tuple(paths)
+
+def stylesheet_links(paths: tuple, html_dir: str = None) -> str:
+    """
+    `<link>` tags for the stylesheets, relative to html_dir or as file:// URLs.
+    """
+    links = []
+    for path in paths:
+        href = os.path.relpath(path, html_dir).replace(os.sep, "/") if html_dir else Path(path).as_uri()
+        links.append(f'<link rel="stylesheet" href="{href}">')
+    return "\n    ".join(links)
+
+def markdown_to_html(md_content: str, for_editor: bool = False, html_dir: str = None, theme: str = None,
+                     embed_fonts: bool = None, safe: bool = False) -> str:
+    """
+    Convert Markdown text into a styled HTML document in memory.
+
+    Parameters:
+        md_content (str): Markdown resume.
+        for_editor (bool): Use the editor variant (Georgia, wider line height).
+        html_dir (str): Folder the HTML will be saved in, so stylesheets are linked
+            relatively; without it they are linked by absolute file:// URL.
+        theme (str): Theme name or folder (see `resolve_theme`).
+        embed_fonts (bool): Inline the theme stylesheet with its fonts subset to the
+            resume's glyphs. Defaults to on for the print variant when fontTools is
+            available and RESUME_FONT_SUBSET is not 0. The editor variant never embeds,
+            since edits may need glyphs the subset dropped.
+        safe (bool): The Markdown is untrusted (e.g. uploaded to the service): raw HTML
+            is escaped, unsafe link targets are dropped and images must be inline data,
+            so it cannot embed tags such as `<iframe src="file:///...">`.
+
+    Returns:
+        str: The HTML document.
+    """
     # Remove code block wrappers and normalize whitespace
     md_content = remove_code_block_wrapper(md_content)
     md_content = normalize_markdown(md_content)
@@ -73,13 +193,18 @@ def convert_md_to_html(md_path: str, html_path: str, for_editor: bool = False):
     # Ensure proper spacing between blocks for correct HTML conversion
     content = "\n".join(lines[i:])
     content = re.sub(r'\n(?=\S)', '\n\n', content)
-    html_body = markdown2.markdown(content, extras=[
-        "fenced-code-blocks", "tables", "strike", "cuddled-lists", "metadata", "footnotes"
-    ])
+    with span("html.markdown2", chars=len(content)):
+        html_body = markdown2.markdown(content, safe_mode="escape" if safe else None, extras=[
+            "fenced-code-blocks", "tables", "strike", "cuddled-lists", "metadata", "footnotes"
+        ])
+    if safe:
+        html_body = UNSAFE_IMAGE_SRC.sub(r'\1""', html_body)  # markdown2's safe mode leaves image URLs alone
 
 
     # Compose the header HTML
     header_html = ""
+    if safe:
+        name, role = html.escape(name), html.escape(role)
     if name:
         header_html += f"<h1>{name}</h1>\n"
     if role:
@@ -93,343 +218,163 @@ def convert_md_to_html(md_path: str, html_path: str, for_editor: bool = False):
 
             # If the line contains a link, convert it to HTML
             if "[" in clean and "](" in clean:
-                rendered = markdown2.markdown(clean).strip()
+                rendered = markdown2.markdown(clean, safe_mode="escape" if safe else None).strip()
                 if rendered.startswith("<p>") and rendered.endswith("</p>"):
                     rendered = rendered[3:-4]  # elimina <p> envolvente
                 header_html += f'<p class="contact">{rendered}</p>\n'
             else:
-                header_html += f'<p class="contact">{clean}</p>\n'
-
-    body_font = "Georgia, serif" if for_editor else "'Source Sans 3', sans-serif"
-    header_font = "Georgia, serif" if for_editor else "'Garamond Premier Pro', serif"
-    line_height = "1.4" if not for_editor else "1.6"
-
-    html_document = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>Resume</title>
-<style>
-    /* === Fonts === */
-    @font-face {{
-        font-family: 'Garamond Premier Pro';
-        src: url('../assets/fonts/GaramondPremrPro.otf') format('opentype');
-        font-weight: normal;
-        font-style: normal;
-    }}
-    @font-face {{
-        font-family: 'Garamond Premier Pro';
-        src: url('../assets/fonts/GaramondPremrPro-Bd.otf') format('opentype');
-        font-weight: bold;
-        font-style: normal;
-    }}
-    @font-face {{
-        font-family: 'Garamond Premier Pro Subhead';
-        src: url('../assets/fonts/GaramondPremrPro-Subh.otf') format('opentype');
-        font-weight: normal;
-        font-style: normal;
-    }}
-    @font-face {{
-        font-family: 'Source Sans 3';
-        src: url('../assets/fonts/SourceSans3-Regular.ttf') format('truetype');
-        font-weight: 100 900;
-        font-style: normal;
-    }}
-
-    /* === Base === */
-    body {{
-        font-family: {body_font};
-        font-size: 11pt;
-        line-height: {line_height};
-        margin: 2em auto;
-        max-width: 800px;
-        color: #222;
-        text-align: left;
-    }}
-
-    /* === Headings === */
-    h1 {{
-        font-family: {header_font}, serif;
-        font-size: 15pt;
-        font-weight: bold;
-        margin-top: 1em;
-        margin-bottom: 0.3em;
-        text-align: center;
-        color: #111;
-    }}
-    h2 {{
-        font-family: 'Garamond Premier Pro Subhead', serif;
-        font-size: 13pt;
-        margin-top: 1.2em;
-        margin-bottom: 0.3em;
-        color: #111;
-        text-transform: uppercase;
-        letter-spacing: 0.03em;
-        border-bottom: 1px solid #ccc;
-    }}
-
-    /* === Content === */
-    p, li {{
-        margin-bottom: 0.4em;
-        line-height: 1.3;
-    }}
-
-    ul, ol {{
-        padding-left: 2em;              /* Indent list items */
-        margin-top: 0.2em;              /* Space before the list */
-        margin-bottom: 0.6em;           /* Space after the list */
-    }}
-
-    ul li, ol li {{
-        margin-top: 0;
-        margin-bottom: 0.1em;           /* Tight spacing between bullets */
-        padding: 0;
-    }}
-
-    /* Fix extra spacing when <li> contains a <p> */
-    li > p {{
-        margin: 0.1em;                      /* Remove internal paragraph spacing */
-        line-height: 1.3;               /* Consistent line spacing inside bullets */
-    }}
-
-    strong, b {{
-        font-weight: 700;
-    }}
-
-    em, i {{
-        font-style: italic;
-    }}
-
-    .contact {{
-        font-family: 'Garamond Premier Pro', serif;
-        font-weight: bold;
-        font-size: 13pt;
-        margin-bottom: 0.3em;
-    }}
-
-    /* === Links === */
-    a {{
-        color: #0056b3;
-        text-decoration: none;
-    }}
-
-    a:hover {{
-        text-decoration: underline;
-    }}
-</style>
-</head>
-<body contenteditable="true">
-<div class="resume-container">
-  <div class="header" style="text-align: center; margin-bottom: 1.5em;">
-    {header_html}
-  </div>
-  <div class="main">
-    {html_body}
-  </div>
-</div>
-</body>
-</html>"""
+                header_html += f'<p class="contact">{html.escape(clean) if safe else clean}</p>\n'
+
+    theme_dir = resolve_theme(theme)
+    if embed_fonts is None:
+        embed_fonts = not for_editor and subsetting_enabled()
+    template, stylesheets = compile_template(theme_dir, "editor" if for_editor else "print", embed_fonts)
+
+    # Subset fonts to the glyphs on the page and inline them, so nothing is loaded from disk
+    inline_styles = ""
+    if embed_fonts:
+        with span("html.embed_fonts"):
+            css = embed_font_faces(os.path.join(theme_dir, "resume.css"), glyphs_for(header_html + html_body))
+        inline_styles = f"<style>\n{css}\n</style>"
+    html_document = template.substitute(
+        inline_styles=inline_styles,
+        stylesheets=stylesheet_links(stylesheets, os.path.abspath(html_dir) if html_dir else None),
+        header_html=header_html,
+        html_body=html_body,
+    )
+    return html_document
+
+
+def convert_md_to_html(md_path: str, html_path: str, for_editor: bool = False, theme: str = None,
+                       embed_fonts: bool = None):
+    """
+    Convert a Markdown (.md) file into a styled HTML document.
+
+    Parameters:
+        md_path (str): Path to the input Markdown file.
+        html_path (str): Path to save the resulting HTML file.
+        for_editor (bool): Use the editor variant.
+        theme (str): Theme name or folder (see `resolve_theme`).
+        embed_fonts (bool): See `markdown_to_html`.
+    """
+    # Check if the Markdown file exists
+    if not os.path.exists(md_path):
+        raise FileNotFoundError(f"Markdown file not found: {md_path}")
+
+    # Read the Markdown file content
+    with open(md_path, "r", encoding="utf-8") as md_file:
+        md_content = md_file.read()
+
+    # Link the stylesheets relative to the output file so HTML written to any folder finds them
+    html_document = markdown_to_html(md_content, for_editor, os.path.dirname(os.path.abspath(html_path)), theme,
+                                     embed_fonts)
 
     # Save the HTML content to the specified file
     with open(html_path, "w", encoding="utf-8") as html_file:
         html_file.write(html_document)
 
 
+# -------------------- PDF BACKENDS --------------------
+
+DEFAULT_PDF_BACKEND = "wkhtmltopdf"
+
+def _qt_backend():
+    # PyQt5 is imported only when this backend is selected
+    from src.qt_pdf_renderer import QtPdfBackend
+    return QtPdfBackend()
+
+# Backend name -> factory. A backend provides render_string(html, base_dir=None) -> bytes,
+# render_file(html_path, pdf_path) -> str and close().
+PDF_BACKENDS = {
+    "wkhtmltopdf": WkhtmltopdfBackend,
+    "qt": _qt_backend,
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+def register_pdf_backend(name: str, factory) -> None:
+    """
+    Make a PDF backend available to `get_pdf_backend`, `--pdf-backend` and RESUME_PDF_BACKEND.
+
+    Parameters:
+        name (str): Backend name.
+        factory (callable): Returns a new backend instance.
+    """
+    PDF_BACKENDS[name] = factory
+
+def get_pdf_backend(name: str = None):
+    """
+    Return the process-wide instance of a PDF backend, creating it on first use
+    so it stays warm for every later document.
+
+    Parameters:
+        name (str): Backend name, or None for RESUME_PDF_BACKEND (default: "wkhtmltopdf").
+    """
+    name = name or os.getenv("RESUME_PDF_BACKEND") or DEFAULT_PDF_BACKEND
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{name}' (available: {', '.join(sorted(PDF_BACKENDS))})")
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = PDF_BACKENDS[name]()
+        return _backends[name]
+
+def close_pdf_backends() -> None:
+    """
+    Release every backend created by `get_pdf_backend`.
+    """
+    with _backends_lock:
+        for backend in _backends.values():
+            backend.close()
+        _backends.clear()
+
 # -------------------- HTML TO PDF --------------------
 
-def convert_html_to_pdf(html_path: str, pdf_path: str) -> None:
+def convert_html_to_pdf(html_path: str, pdf_path: str, backend: str = None) -> None:
     """
-    Convert an HTML file to a styled PDF using pdfkit.
+    Convert an HTML file to a styled PDF.
 
     Parameters:
         html_path (str): Input HTML file.
         pdf_path (str): Output PDF path.
+        backend (str): PDF backend name (see `get_pdf_backend`).
     """
     # Check if the HTML file exists
     if not os.path.exists(html_path):
         raise FileNotFoundError(f"HTML file not found: {html_path}")
 
-    # Define PDF conversion options
-    options = {
-        'encoding': 'UTF-8',
-        'page-size': 'A4',
-        'margin-top': '12.7mm',
-        'margin-bottom': '12.7mm',
-        'margin-left': '12.7mm',
-        'margin-right': '12.7mm',
-        'minimum-font-size': '14',
-        'enable-local-file-access': '',
-        'dpi': '300',
-    }
+    get_pdf_backend(backend).render_file(html_path, pdf_path)
 
-    # Configure pdfkit and generate the PDF
-    config = pdfkit.configuration()
-    pdfkit.from_file(html_path, pdf_path, configuration=config, options=options)
 
+def html_to_pdf(html: str, pdf_path: str = None, backend: str = None) -> bytes:
+    """
+    Render an HTML string to PDF without an intermediate HTML file.
 
-# -------------------- HTML EDITOR --------------------
+    Parameters:
+        html (str): HTML document (fonts embedded or linked by absolute URL, see `markdown_to_html`).
+        pdf_path (str): Optional path to also save the PDF to.
+        backend (str): PDF backend name (see `get_pdf_backend`).
 
-class InsertLinkDialog(QDialog):
-    """
-    Dialog to insert a hyperlink with custom URL and anchor text.
-    """
-    def __init__(self, selected_text=""):
-        super().__init__()
-        self.setWindowTitle("Insert Link")
-        self.layout = QFormLayout(self)
-        self.url_input = QLineEdit(self)  # Input field for the URL
-        self.text_input = QLineEdit(self)  # Input field for the link text
-        self.text_input.setText(selected_text)
-
-        # Add input fields to the dialog layout
-        self.layout.addRow(QLabel("URL:"), self.url_input)
-        self.layout.addRow(QLabel("Link Text:"), self.text_input)
-
-        # Add buttons for inserting or canceling
-        self.button_box = QHBoxLayout()
-        insert_btn = QPushButton("Insert")
-        cancel_btn = QPushButton("Cancel")
-        insert_btn.clicked.connect(self.accept)
-        cancel_btn.clicked.connect(self.reject)
-        self.button_box.addWidget(insert_btn)
-        self.button_box.addWidget(cancel_btn)
-        self.layout.addRow(self.button_box)
-
-    def get_data(self):
-        """
-        Retrieve the entered URL and link text.
-        """
-        return self.url_input.text(), self.text_input.text()
-
-
-class HTMLEditor(QWidget):
-    """
-    Full-featured HTML editor using PyQt5 with formatting toolbar.
-    """
-    def __init__(self, html_path):
-        super().__init__()
-        self.html_path = html_path  # Path to the HTML file being edited
-        self.setWindowTitle("HTML Editor")
-        self.resize(1000, 700)
-
-        # Main layout for the editor
-        self.layout = QVBoxLayout(self)
-        self.web_view = QWebEngineView()  # Web view to display and edit HTML
-        self.web_view.setUrl(QUrl.fromLocalFile(os.path.abspath(self.html_path)))
-        self.web_view.page().loadFinished.connect(self.enable_style_with_css)
-        self.layout.addWidget(self.web_view)
-
-        # Toolbar for formatting options
-        self.toolbar = QHBoxLayout()
-        self.add_toolbar_buttons()
-        self.layout.addLayout(self.toolbar)
-
-        # Save button to save changes and close the editor
-        save_button = QPushButton("Save and Close")
-        save_button.clicked.connect(self.save_html)
-        self.layout.addWidget(save_button)
-
-    def add_toolbar_buttons(self):
-        """
-        Add formatting buttons (bold, italic, lists, alignments, etc.)
-        """
-        buttons = {
-            "Bold": "bold", "Italic": "italic", "Underline": "underline", "Strikethrough": "strikeThrough",
-            "H1": "formatBlock|<h1>", "H2": "formatBlock|<h2>", "H3": "formatBlock|<h3>",
-            "Ordered List": "insertOrderedList", "Unordered List": "insertUnorderedList",
-            "Indent": "indent", "Outdent": "outdent",
-            "Align Left": "justifyLeft", "Align Center": "justifyCenter", "Align Right": "justifyRight",
-            "Undo": "undo", "Redo": "redo",
-            "Insert Link": "insertLink",
-            "Insert Image": "insertImage"
-        }
-        for label, cmd in buttons.items():
-            btn = QPushButton(label)  # Create a button for each command
-            btn.clicked.connect(lambda _, c=cmd: self.execute_command(c))  # Connect button to command execution
-            self.toolbar.addWidget(btn)
-
-    def execute_command(self, command):
-        """
-        Execute a formatting command on the HTML content.
-        """
-        if command == "insertLink":
-            self.insert_link()
-        elif command == "insertImage":
-            self.insert_image()
-        elif "formatBlock" in command:
-            tag = command.split("|")[1]
-            self.run_js(f"document.execCommand('formatBlock', false, '{tag}');")
-        else:
-            self.run_js(f"document.execCommand('{command}');")
-
-    def insert_link(self):
-        """
-        Insert a hyperlink into the HTML content.
-        """
-        self.web_view.page().runJavaScript('window.getSelection().toString()', self.handle_selected_text)
-
-    def handle_selected_text(self, selected_text):
-        """
-        Handle the selected text for inserting a hyperlink.
-        """
-        dialog = InsertLinkDialog(selected_text)
-        if dialog.exec_() == QDialog.Accepted:
-            url, text = dialog.get_data()
-            if url and text:
-                self.run_js(f"document.execCommand('insertHTML', false, '<a href=\"{url}\">{text}</a>');")
-
-    def run_js(self, js_code):
-        """
-        Run JavaScript code in the web view.
-        """
-        self.web_view.page().runJavaScript(js_code)
-
-    def save_html(self):
-        """
-        Save the edited HTML content to the file.
-        """
-        self.web_view.page().toHtml(self.save_to_file)
-
-    def save_to_file(self, html_content):
-        """
-        Write the HTML content to the file and close the editor.
-        """
-        with open(self.html_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-        QMessageBox.information(self, "Saved", f"HTML content saved to {self.html_path}")
-        self.close()
-
-    def insert_image(self):
-        """
-        Open a file dialog to select an image and insert it into the HTML.
-        """
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select Image", "", "Images (*.png *.jpg *.jpeg *.gif)")
-        if file_path:
-            uri = QUrl.fromLocalFile(file_path).toString()
-            img_tag = f'''
-            <div style="float:right; margin: 0 0 10px 20px;">
-                <img src="{uri}" alt="Profile Photo" style="max-width:150px; height:auto; border-radius:8px;">
-            </div>
-            '''
-            self.run_js(f"document.execCommand('insertHTML', false, `{img_tag}`);")
-
-    def enable_style_with_css(self):
-        """
-        Ensure formatting commands like Bold/Italic use inline styles.
-        """
-        js = "document.execCommand('styleWithCSS', false, true);"
-        self.web_view.page().runJavaScript(js)
+    Returns:
+        bytes: The PDF document.
+    """
+    pdf = get_pdf_backend(backend).render_string(html)
+    if pdf_path:
+        with open(pdf_path, "wb") as pdf_file:
+            pdf_file.write(pdf)
+    return pdf
 
 
+# -------------------- HTML EDITOR --------------------
 
 def edit_html_content(html_path: str) -> None:
     """
     Launch the HTML editor for manual visual editing.
 
+    PyQt5 is imported only here, so converting and exporting never loads Qt.
+
     Parameters:
         html_path (str): Path to the HTML file to edit.
     """
-    app = QApplication(sys.argv)  # Create the PyQt application
-    editor = HTMLEditor(html_path)  # Initialize the HTML editor
-    editor.show()  # Show the editor window
-    app.exec_()  # Run the application event loop
+    from src.html_editor import edit_html_content as run_editor
+    run_editor(html_path)
@@ -0,0 +1,141 @@
+import os  # Module for interacting with the operating system
+import re  # Module for finding font URLs in stylesheets
+import html  # Module for unescaping HTML entities before collecting glyphs
+import base64  # Module for data: URIs
+import hashlib  # Module for glyph-set and font hashes
+import threading  # Module for guarding the in-process caches
+from functools import lru_cache  # Cache stylesheet reads
+
+try:
+    from fontTools import subset  # Font subsetter (optional)
+except ImportError:
+    subset = None
+
+# Bump when subsetting options change so cached subsets are rebuilt
+SUBSET_VERSION = "1"
+
+DEFAULT_CACHE_DIR = ".cache/fonts"
+
+# url('...') format('...') pairs inside @font-face rules
+FONT_SRC = re.compile(r"url\(\s*['\"]?([^'\")]+)['\"]?\s*\)\s*format\(\s*['\"]?([\w-]+)['\"]?\s*\)")
+
+MIME_TYPES = {"opentype": "font/otf", "truetype": "font/ttf", "woff": "font/woff", "woff2": "font/woff2"}
+
+# Always kept so small edits after rendering (numbers, punctuation) still have glyphs
+BASE_GLYPHS = " 0123456789.,;:!?-–—·•()[]/&@+%'\"«»"
+
+_lock = threading.Lock()
+_subsets = {}  # subset cache key -> subset bytes
+
+def subsetting_enabled() -> bool:
+    """
+    Whether fonts should be subset and embedded (fontTools installed and
+    RESUME_FONT_SUBSET not set to 0).
+    """
+    return subset is not None and os.getenv("RESUME_FONT_SUBSET", "1").lower() not in ("0", "false", "no")
+
+def glyphs_for(document: str) -> str:
+    """
+    Collect the characters a rendered HTML document needs.
+
+    Upper-case variants are included because headings use `text-transform: uppercase`.
+
+    Parameters:
+        document (str): HTML body (tags are ignored).
+
+    Returns:
+        str: Sorted unique characters.
+    """
+    text = html.unescape(re.sub(r"<[^>]+>", " ", document))
+    return "".join(sorted(set(text) | set(text.upper()) | set(BASE_GLYPHS)))
+
+@lru_cache(maxsize=16)
+def _font_digest(path: str, mtime: float, size: int) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def font_digest(font_path: str) -> str:
+    """
+    SHA-256 of a font file, recomputed only when its mtime or size changes.
+    """
+    stat = os.stat(font_path)
+    return _font_digest(font_path, stat.st_mtime, stat.st_size)
+
+def subset_font(font_path: str, glyphs: str) -> bytes:
+    """
+    Return `font_path` reduced to `glyphs`, reusing subsets cached in memory
+    and on disk under RESUME_FONT_CACHE_DIR (default: .cache/fonts).
+
+    Parameters:
+        font_path (str): Path to a .otf/.ttf file.
+        glyphs (str): Characters to keep.
+
+    Returns:
+        bytes: The subset font, in the same format as the original.
+    """
+    stat = os.stat(font_path)
+    font_hash = _font_digest(font_path, stat.st_mtime, stat.st_size)
+    key = hashlib.sha256(f"{SUBSET_VERSION}:{font_hash}:{glyphs}".encode("utf-8")).hexdigest()
+
+    with _lock:
+        cached = _subsets.get(key)
+    if cached is not None:
+        return cached
+
+    cache_dir = os.getenv("RESUME_FONT_CACHE_DIR", DEFAULT_CACHE_DIR)
+    cache_path = os.path.join(cache_dir, key[:2], key + os.path.splitext(font_path)[1])
+    try:
+        with open(cache_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        options = subset.Options()
+        options.hinting = False  # Hinting only helps screen rasterization, not PDF output
+        options.desubroutinize = True  # Smaller CFF subsets once unused glyphs are gone
+        options.name_IDs = ["*"]  # Keep family names so the PDF lists the real fonts
+        font = subset.load_font(font_path, options)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(text=glyphs)
+        subsetter.subset(font)
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        subset.save_font(font, tmp_path, options)
+        os.replace(tmp_path, cache_path)  # Atomic: concurrent renders never read half a file
+        with open(cache_path, "rb") as f:
+            data = f.read()
+
+    with _lock:
+        _subsets[key] = data
+    return data
+
+@lru_cache(maxsize=16)
+def _read_stylesheet(css_path: str, mtime: float) -> str:
+    with open(css_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def embed_fonts(css_path: str, glyphs: str) -> str:
+    """
+    Return the stylesheet at `css_path` with every font URL replaced by a
+    data: URI of the font subset to `glyphs`.
+
+    Fonts are then part of the HTML itself: they always resolve (no relative
+    paths) and only the glyphs the resume uses reach wkhtmltopdf and the PDF.
+
+    Parameters:
+        css_path (str): Stylesheet with @font-face rules (URLs relative to it).
+        glyphs (str): Characters to keep, see `glyphs_for`.
+
+    Returns:
+        str: CSS text with embedded fonts.
+    """
+    css = _read_stylesheet(css_path, os.path.getmtime(css_path))
+    css_dir = os.path.dirname(css_path)
+
+    def replace(match):
+        url, fmt = match.groups()
+        if url.startswith("data:"):
+            return match.group(0)
+        data = subset_font(os.path.normpath(os.path.join(css_dir, url)), glyphs)
+        mime = MIME_TYPES.get(fmt.lower(), "application/octet-stream")
+        return f"url(data:{mime};base64,{base64.b64encode(data).decode('ascii')}) format('{fmt}')"
+
+    return FONT_SRC.sub(replace, css)
@@ -0,0 +1,178 @@
+import os  # Module for interacting with the operating system
+import json  # Module for persisting latency samples
+import time  # Module for measuring request latency
+import asyncio  # Module for racing and cancelling requests
+import atexit  # Module for saving pending latency samples on exit
+import threading  # Module for guarding the latency history
+
+# Defaults (overridable through the .env file)
+DEFAULT_LATENCY_PATH = ".cache/llm_latency.json"
+DEFAULT_PERCENTILE = 95
+DEFAULT_HEDGE_DELAY = 20.0  # Seconds, used until enough latency samples exist
+MIN_SAMPLES = 10
+MAX_SAMPLES = 200
+FLUSH_INTERVAL = 10.0  # Seconds between writes of the latency file
+
+class LatencyTracker:
+    """
+    Rolling window of request latencies per provider, persisted to disk so
+    hedge delays are based on previous runs as well.
+
+    Samples are written at most every FLUSH_INTERVAL seconds, on a background
+    thread (and once more at exit), never on the caller's thread: `record` is
+    called from the shared event loop.
+    """
+
+    def __init__(self, path: str = DEFAULT_LATENCY_PATH, max_samples: int = MAX_SAMPLES):
+        self.path = path
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.samples = json.load(f)
+        except (OSError, ValueError):
+            self.samples = {}
+
+    def record(self, provider: str, seconds: float) -> None:
+        """
+        Add a latency sample. Cancelled requests are recorded with the time they
+        had been running, a lower bound that keeps slow calls in the window.
+        """
+        with self._lock:
+            window = self.samples.setdefault(provider, [])
+            window.append(round(seconds, 3))
+            del window[:-self.max_samples]
+            self._dirty = True
+            due = time.monotonic() - self._last_flush >= FLUSH_INTERVAL
+            if due:
+                self._last_flush = time.monotonic()
+        if due:
+            threading.Thread(target=self.flush, name="latency-flush", daemon=True).start()
+
+    def flush(self) -> None:
+        """
+        Write the samples to disk if any were added since the last write.
+        """
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = json.dumps(self.samples)
+                self._dirty = False
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+            os.replace(tmp_path, self.path)
+
+    def percentile(self, provider: str, pct: float):
+        """
+        Return the pct-th percentile latency for provider, or None without enough samples.
+        """
+        with self._lock:
+            window = sorted(self.samples.get(provider, []))
+        if len(window) < MIN_SAMPLES:
+            return None
+        index = min(len(window) - 1, int(round(pct / 100 * (len(window) - 1))))
+        return window[index]
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+def get_latency_tracker() -> LatencyTracker:
+    """
+    Return the process-wide latency tracker (path from RESUME_LATENCY_PATH).
+    """
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = LatencyTracker(os.getenv("RESUME_LATENCY_PATH", DEFAULT_LATENCY_PATH))
+            atexit.register(_tracker.flush)
+        return _tracker
+
+def hedge_delay(tracker: LatencyTracker, provider: str) -> float:
+    """
+    Seconds to wait for `provider` before firing the backup request.
+
+    Environment variables:
+        RESUME_HEDGE_PERCENTILE: Latency percentile that triggers the hedge (default: 95).
+        RESUME_HEDGE_DELAY: Fallback delay in seconds while history is short (default: 20).
+    """
+    pct = float(os.getenv("RESUME_HEDGE_PERCENTILE", DEFAULT_PERCENTILE))
+    observed = tracker.percentile(provider, pct)
+    return observed if observed is not None else float(os.getenv("RESUME_HEDGE_DELAY", DEFAULT_HEDGE_DELAY))
+
+async def hedged_call(primary: tuple, backup: tuple, delay: float, tracker: LatencyTracker = None) -> dict:
+    """
+    Race two providers: start `primary`, and start `backup` if the primary has
+    not answered within `delay` seconds or fails. The first successful response
+    wins and the other request is cancelled.
+
+    Cancelling a request that runs in an executor thread (Gemini over REST)
+    only abandons it: the thread keeps going until the call returns or hits
+    its timeout (RESUME_GEMINI_TIMEOUT), so such calls must be given one.
+
+    Parameters:
+        primary (tuple): (provider name, zero-argument coroutine function).
+        backup (tuple): (provider name, zero-argument coroutine function).
+        delay (float): Seconds to wait before hedging.
+        tracker (LatencyTracker): Optional tracker updated with the winner's latency
+            and the cancelled request's elapsed time.
+
+    Returns:
+        dict: `provider`, `text`, `elapsed`, `hedged`, `loser` and `loser_elapsed`.
+
+    Raises:
+        Exception: The last error if both providers fail.
+    """
+    start = time.perf_counter()
+    started = {}
+    names = {}
+
+    def launch(name, factory):
+        task = asyncio.ensure_future(factory())
+        started[task] = time.perf_counter()
+        names[task] = name
+        return task
+
+    pending = {launch(*primary)}
+    hedged = False
+    last_error = None
+
+    while pending:
+        timeout = None if hedged else max(0.0, delay - (time.perf_counter() - start))
+        done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+        for task in done:
+            if task.exception() is None:
+                now = time.perf_counter()
+                for other in pending:
+                    other.cancel()  # Abandon the slower request
+                loser = next(iter(pending), None)
+                if tracker:
+                    tracker.record(names[task], now - started[task])
+                    if loser:
+                        # It was at least this slow; leaving it out would bias the percentile low
+                        tracker.record(names[loser], now - started[loser])
+                return {
+                    "provider": names[task],
+                    "text": task.result(),
+                    "elapsed": now - start,
+                    "hedged": hedged,
+                    "loser": names[loser] if loser else None,
+                    "loser_elapsed": now - started[loser] if loser else None,
+                }
+            last_error = task.exception()
+            print(f"⚠️ {names[task]} failed: {last_error}")  # Notify the user about the failure
+
+        if not hedged:
+            # Primary is slow (timeout) or failed: fire the backup request
+            hedged = True
+            if not done:
+                print(f"⏳ {primary[0]} slower than {delay:.1f}s, hedging with {backup[0]}...")
+            pending.add(launch(*backup))
+
+    raise last_error
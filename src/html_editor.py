@@ -0,0 +1,175 @@
+import sys
+import os
+from PyQt5.QtWidgets import (
+    QApplication, QWidget, QVBoxLayout, QPushButton, QMessageBox, 
+    QHBoxLayout, QLineEdit, QDialog, QFileDialog, QFormLayout, QLabel
+)
+from PyQt5.QtWebEngineWidgets import QWebEngineView
+from PyQt5.QtCore import QUrl
+
+# -------------------- HTML EDITOR --------------------
+
+class InsertLinkDialog(QDialog):
+    """
+    Dialog to insert a hyperlink with custom URL and anchor text.
+    """
+    def __init__(self, selected_text=""):
+        super().__init__()
+        self.setWindowTitle("Insert Link")
+        self.layout = QFormLayout(self)
+        self.url_input = QLineEdit(self)  # Input field for the URL
+        self.text_input = QLineEdit(self)  # Input field for the link text
+        self.text_input.setText(selected_text)
+
+        # Add input fields to the dialog layout
+        self.layout.addRow(QLabel("URL:"), self.url_input)
+        self.layout.addRow(QLabel("Link Text:"), self.text_input)
+
+        # Add buttons for inserting or canceling
+        self.button_box = QHBoxLayout()
+        insert_btn = QPushButton("Insert")
+        cancel_btn = QPushButton("Cancel")
+        insert_btn.clicked.connect(self.accept)
+        cancel_btn.clicked.connect(self.reject)
+        self.button_box.addWidget(insert_btn)
+        self.button_box.addWidget(cancel_btn)
+        self.layout.addRow(self.button_box)
+
+    def get_data(self):
+        """
+        Retrieve the entered URL and link text.
+        """
+        return self.url_input.text(), self.text_input.text()
+
+
+class HTMLEditor(QWidget):
+    """
+    Full-featured HTML editor using PyQt5 with formatting toolbar.
+    """
+    def __init__(self, html_path):
+        super().__init__()
+        self.html_path = html_path  # Path to the HTML file being edited
+        self.setWindowTitle("HTML Editor")
+        self.resize(1000, 700)
+
+        # Main layout for the editor
+        self.layout = QVBoxLayout(self)
+        self.web_view = QWebEngineView()  # Web view to display and edit HTML
+        self.web_view.setUrl(QUrl.fromLocalFile(os.path.abspath(self.html_path)))
+        self.web_view.page().loadFinished.connect(self.enable_style_with_css)
+        self.layout.addWidget(self.web_view)
+
+        # Toolbar for formatting options
+        self.toolbar = QHBoxLayout()
+        self.add_toolbar_buttons()
+        self.layout.addLayout(self.toolbar)
+
+        # Save button to save changes and close the editor
+        save_button = QPushButton("Save and Close")
+        save_button.clicked.connect(self.save_html)
+        self.layout.addWidget(save_button)
+
+    def add_toolbar_buttons(self):
+        """
+        Add formatting buttons (bold, italic, lists, alignments, etc.)
+        """
+        buttons = {
+            "Bold": "bold", "Italic": "italic", "Underline": "underline", "Strikethrough": "strikeThrough",
+            "H1": "formatBlock|<h1>", "H2": "formatBlock|<h2>", "H3": "formatBlock|<h3>",
+            "Ordered List": "insertOrderedList", "Unordered List": "insertUnorderedList",
+            "Indent": "indent", "Outdent": "outdent",
+            "Align Left": "justifyLeft", "Align Center": "justifyCenter", "Align Right": "justifyRight",
+            "Undo": "undo", "Redo": "redo",
+            "Insert Link": "insertLink",
+            "Insert Image": "insertImage"
+        }
+        for label, cmd in buttons.items():
+            btn = QPushButton(label)  # Create a button for each command
+            btn.clicked.connect(lambda _, c=cmd: self.execute_command(c))  # Connect button to command execution
+            self.toolbar.addWidget(btn)
+
+    def execute_command(self, command):
+        """
+        Execute a formatting command on the HTML content.
+        """
+        if command == "insertLink":
+            self.insert_link()
+        elif command == "insertImage":
+            self.insert_image()
+        elif "formatBlock" in command:
+            tag = command.split("|")[1]
+            self.run_js(f"document.execCommand('formatBlock', false, '{tag}');")
+        else:
+            self.run_js(f"document.execCommand('{command}');")
+
+    def insert_link(self):
+        """
+        Insert a hyperlink into the HTML content.
+        """
+        self.web_view.page().runJavaScript('window.getSelection().toString()', self.handle_selected_text)
+
+    def handle_selected_text(self, selected_text):
+        """
+        Handle the selected text for inserting a hyperlink.
+        """
+        dialog = InsertLinkDialog(selected_text)
+        if dialog.exec_() == QDialog.Accepted:
+            url, text = dialog.get_data()
+            if url and text:
+                self.run_js(f"document.execCommand('insertHTML', false, '<a href=\"{url}\">{text}</a>');")
+
+    def run_js(self, js_code):
+        """
+        Run JavaScript code in the web view.
+        """
+        self.web_view.page().runJavaScript(js_code)
+
+    def save_html(self):
+        """
+        Save the edited HTML content to the file.
+        """
+        self.web_view.page().toHtml(self.save_to_file)
+
+    def save_to_file(self, html_content):
+        """
+        Write the HTML content to the file and close the editor.
+        """
+        with open(self.html_path, "w", encoding="utf-8") as f:
+            f.write(html_content)
+        QMessageBox.information(self, "Saved", f"HTML content saved to {self.html_path}")
+        self.close()
+
+    def insert_image(self):
+        """
+        Open a file dialog to select an image and insert it into the HTML.
+        """
+        file_path, _ = QFileDialog.getOpenFileName(self, "Select Image", "", "Images (*.png *.jpg *.jpeg *.gif)")
+        if file_path:
+            uri = QUrl.fromLocalFile(file_path).toString()
+            img_tag = f'''
+            <div style="float:right; margin: 0 0 10px 20px;">
+                <img src="{uri}" alt="Profile Photo" style="max-width:150px; height:auto; border-radius:8px;">
+            </div>
+            '''
+            self.run_js(f"document.execCommand('insertHTML', false, `{img_tag}`);")
+
+    def enable_style_with_css(self):
+        """
+        Ensure formatting commands like Bold/Italic use inline styles.
+        """
+        js = "document.execCommand('styleWithCSS', false, true);"
+        self.web_view.page().runJavaScript(js)
+
+
+
+def edit_html_content(html_path: str) -> None:
+    """
+    Launch the HTML editor for manual visual editing.
+
+    Parameters:
+        html_path (str): Path to the HTML file to edit.
+    """
+    app = QApplication(sys.argv)  # Create the PyQt application
+    editor = HTMLEditor(html_path)  # Initialize the HTML editor
+    editor.show()  # Show the editor window
+    app.exec_()  # Run the application event loop
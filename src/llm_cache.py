@@ -0,0 +1,238 @@
+import os  # Module for interacting with the operating system
+import json  # Module for reading and writing cache entries
+import time  # Module for timestamps used by age-based eviction
+import hashlib  # Module for content-addressed cache keys
+import threading  # Module for guarding counters shared across threads
+
+# Default cache settings (overridable through the .env file)
+DEFAULT_CACHE_DIR = ".cache/llm"
+DEFAULT_MAX_MB = 200
+DEFAULT_MAX_AGE_DAYS = 30
+EVICT_EVERY = 50  # Writes between full eviction scans (sooner if a limit is exceeded)
+LOW_WATER = 0.9  # Eviction trims to this share of the limits, so a full cache is not rescanned on every write
+
+class ResponseCache:
+    """
+    Persistent, content-addressed cache for LLM responses.
+
+    Entries are keyed by a SHA-256 hash of (prompt, provider, model, temperature)
+    and stored as one JSON file each. A file's modification time is refreshed on
+    every hit, so eviction drops the least recently used entries first once the
+    cache exceeds its size or entry limit. Entries not used for `max_age_seconds`
+    (by modification time, both on read and when evicting) are treated as misses
+    and removed.
+
+    Writes keep a running estimate of the cache size; the directory is only
+    scanned every EVICT_EVERY writes or when the estimate exceeds a limit.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+                 max_entries: int = None, max_age_seconds: float = DEFAULT_MAX_AGE_DAYS * 86400):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._bytes = None  # Size and entry count as of the last scan, plus later writes
+        self._entries = None
+        self._writes = 0
+
+    @staticmethod
+    def make_key(prompt: str, provider: str, model: str, temperature: float) -> str:
+        """
+        Build the content hash that identifies a cached response.
+        """
+        payload = json.dumps([prompt, provider, model, float(temperature)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _read(self, key: str):
+        path = self._path(key)
+        try:
+            last_used = os.stat(path).st_mtime
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self.max_age_seconds and time.time() - last_used > self.max_age_seconds:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # Mark as recently used for LRU eviction
+        except OSError:
+            pass  # Evicted by another process since the read; the response is still valid
+        return entry["response"]
+
+    def get(self, prompt: str, provider: str, model: str, temperature: float):
+        """
+        Return the cached response for this request, or None on a miss.
+        """
+        response = self._read(self.make_key(prompt, provider, model, temperature))
+        self._count(response is not None)
+        return response
+
+    def get_any(self, prompt: str, candidates: list):
+        """
+        Return the first cached response among several (provider, model, temperature)
+        candidates. Counts as a single hit or miss.
+
+        Returns:
+            tuple: (provider, response), or (None, None) on a miss.
+        """
+        for provider, model, temperature in candidates:
+            response = self._read(self.make_key(prompt, provider, model, temperature))
+            if response is not None:
+                self._count(True)
+                return provider, response
+        self._count(False)
+        return None, None
+
+    def put(self, prompt: str, provider: str, model: str, temperature: float, response: str) -> None:
+        """
+        Store a response, evicting old entries when the cache may have grown past
+        its limits (see EVICT_EVERY).
+        """
+        key = self.make_key(prompt, provider, model, temperature)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {
+            "provider": provider,
+            "model": model,
+            "temperature": temperature,
+            "created": time.time(),
+            "response": response,
+        }
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        try:
+            replaced = os.path.getsize(path)  # Overwriting an entry only changes its size
+        except OSError:
+            replaced = None
+        os.replace(tmp_path, path)  # Atomic swap so readers never see partial files
+
+        with self._lock:
+            self._writes += 1
+            if self._bytes is not None:
+                self._bytes += len(data) - (replaced or 0)
+                if replaced is None:
+                    self._entries += 1
+            due = (self._bytes is None or self._writes >= EVICT_EVERY
+                   or (self.max_bytes and self._bytes > self.max_bytes)
+                   or (self.max_entries and self._entries > self.max_entries))
+            if due:
+                self._writes = 0
+        if due:
+            self.evict()
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+            with self._lock:
+                self.evictions += 1
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """
+        Drop expired entries, then, if the cache exceeds `max_bytes` or
+        `max_entries`, least recently used ones until it is within LOW_WATER of them.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+        now = time.time()
+        entries = []
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # Removed by another process during the scan
+                if self.max_age_seconds and now - stat.st_mtime > self.max_age_seconds:
+                    self._remove(entry.path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        entries.sort()  # Oldest access first
+        total_bytes = sum(size for _, size, _ in entries)
+        over = ((self.max_bytes and total_bytes > self.max_bytes)
+                or (self.max_entries and len(entries) > self.max_entries))
+        while over and entries and ((self.max_bytes and total_bytes > self.max_bytes * LOW_WATER)
+                                    or (self.max_entries and len(entries) > self.max_entries * LOW_WATER)):
+            _, size, path = entries.pop(0)
+            total_bytes -= size
+            self._remove(path)
+        with self._lock:
+            self._bytes, self._entries = total_bytes, len(entries)
+
+    def clear(self) -> None:
+        """
+        Remove every cached entry.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+        for shard in os.scandir(self.cache_dir):
+            if shard.is_dir():
+                for entry in os.scandir(shard.path):
+                    self._remove(entry.path)
+        with self._lock:
+            self._bytes, self._entries = 0, 0
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss/eviction counters for this process.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_default_cache():
+    """
+    Return the process-wide response cache configured from environment variables,
+    or None if caching is disabled with RESUME_CACHE_DISABLED=1.
+
+    Environment variables:
+        RESUME_CACHE_DIR: Cache folder (default: .cache/llm).
+        RESUME_CACHE_MAX_MB: Maximum cache size in megabytes (default: 200).
+        RESUME_CACHE_MAX_ENTRIES: Maximum number of entries (default: unlimited).
+        RESUME_CACHE_MAX_AGE_DAYS: Days an entry may go unused before it expires (default: 30).
+    """
+    global _default_cache
+    if os.getenv("RESUME_CACHE_DISABLED", "").lower() in ("1", "true", "yes"):
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            max_entries = os.getenv("RESUME_CACHE_MAX_ENTRIES")
+            _default_cache = ResponseCache(
+                cache_dir=os.getenv("RESUME_CACHE_DIR", DEFAULT_CACHE_DIR),
+                max_bytes=int(float(os.getenv("RESUME_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024),
+                max_entries=int(max_entries) if max_entries else None,
+                max_age_seconds=float(os.getenv("RESUME_CACHE_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS)) * 86400,
+            )
+        return _default_cache
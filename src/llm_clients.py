@@ -0,0 +1,113 @@
+import os  # Module for reading connection pool settings from the environment
+import asyncio  # Module for the shared event loop used by async clients
+import threading  # Module for guarding the registry across threads
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient  # OpenAI SDK clients
+import httpx  # HTTP client with keep-alive connection pooling
+import google.generativeai as genai  # Google Generative AI SDK
+
+_lock = threading.Lock()
+_openai_clients = {}  # api_key -> OpenAI
+_async_openai_clients = {}  # api_key -> AsyncOpenAI (bound to the shared event loop)
+_gemini_models = {}  # (model_name, temperature, system_instruction) -> GenerativeModel
+_gemini_api_key = None  # Key genai is currently configured with
+_loop = None  # Shared event loop running in a background thread
+
+def _limits() -> httpx.Limits:
+    # Connection pool settings (overridable through the .env file)
+    return httpx.Limits(
+        max_connections=int(os.getenv("RESUME_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("RESUME_HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("RESUME_HTTP_KEEPALIVE_EXPIRY", "60")),
+    )
+
+def get_openai_client(api_key: str) -> OpenAI:
+    """
+    Return a process-wide OpenAI client for this key, creating it on first use.
+
+    The client owns a keep-alive connection pool, so TLS handshakes are paid once
+    per process and reused across calls and threads. SDK retries are off:
+    retries go through the shared rate limiter (src.rate_limit) instead, so
+    backoff and concurrency adapt across every caller.
+    """
+    with _lock:
+        client = _openai_clients.get(api_key)
+        if client is None:
+            client = OpenAI(api_key=api_key, max_retries=0, http_client=DefaultHttpxClient(limits=_limits()))
+            _openai_clients[api_key] = client
+        return client
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the shared event loop that async clients are bound to.
+    It runs forever in a daemon thread so pooled connections survive between calls.
+    """
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-client-loop", daemon=True).start()
+        return _loop
+
+def run_async(coro, timeout: float = None):
+    """
+    Run a coroutine on the shared event loop from synchronous code and wait for its result.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result(timeout)
+
+def get_async_openai_client(api_key: str) -> AsyncOpenAI:
+    """
+    Return a process-wide AsyncOpenAI client for this key.
+
+    Use it only from coroutines running on `get_event_loop()` (e.g. through `run_async`);
+    its connection pool is tied to that loop.
+    """
+    with _lock:
+        client = _async_openai_clients.get(api_key)
+        if client is None:
+            client = AsyncOpenAI(api_key=api_key, max_retries=0,
+                                 http_client=DefaultAsyncHttpxClient(limits=_limits()))
+            _async_openai_clients[api_key] = client
+        return client
+
+def get_gemini_model(api_key: str, model_name: str, temperature: float,
+                     system_instruction: str = None) -> genai.GenerativeModel:
+    """
+    Return a cached Gemini model, configuring the SDK only when the key changes.
+
+    genai keeps one global client (and its gRPC channel), so reconfiguring on
+    every call would throw the connection away each time. When RESUME_GEMINI_ENDPOINT
+    is set, requests go over REST to that endpoint instead.
+    """
+    global _gemini_api_key
+    with _lock:
+        if api_key != _gemini_api_key:
+            endpoint = os.getenv("RESUME_GEMINI_ENDPOINT")  # e.g. the local stub server for load tests
+            if endpoint:
+                genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": endpoint})
+            else:
+                genai.configure(api_key=api_key)
+            _gemini_api_key = api_key
+            _gemini_models.clear()
+        key = (model_name, temperature, system_instruction)
+        model = _gemini_models.get(key)
+        if model is None:
+            model = genai.GenerativeModel(model_name, generation_config={"temperature": temperature},
+                                          system_instruction=system_instruction)
+            _gemini_models[key] = model
+        return model
+
+def close_clients() -> None:
+    """
+    Close every pooled client (e.g. when a long-running service shuts down).
+    """
+    global _gemini_api_key
+    with _lock:
+        for client in _openai_clients.values():
+            client.close()
+        _openai_clients.clear()
+        async_clients = list(_async_openai_clients.values())
+        _async_openai_clients.clear()
+        _gemini_models.clear()
+        _gemini_api_key = None
+    for client in async_clients:
+        run_async(client.close())
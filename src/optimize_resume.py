@@ -1,19 +1,16 @@
 import os  # Module for interacting with the operating system
 import re  # Module for regular expression operations
+from src.prompt_compaction import compact_job_description, count_tokens  # Token-budgeted job description compaction
 
-def generate_prompt(md_resume: str, job_description: str) -> str:
-    """
-    Generate a detailed prompt to optimize a resume according to a job description.
-    
-    Parameters:
-        md_resume (str): The resume content in Markdown format.
-        job_description (str): The job description text.
-    
-    Returns:
-        str: The complete prompt to send to a language model.
-    """
-    # Returns a formatted string containing instructions and input data for a language model
-    return f"""
+# Stable system message shared by every request (part of the cacheable prefix)
+SYSTEM_PROMPT = (
+    "You are an expert resume writer and ATS specialist. You tailor Markdown resumes "
+    "to job descriptions while preserving facts, structure and formatting."
+)
+
+# Static instructions: identical for every request, so they lead the prompt and
+# let providers reuse their cached prefix across calls
+PROMPT_INSTRUCTIONS = """
 I have a resume in Markdown format and a job description. Your task is to **refine and tailor my resume** to closely match the job requirements while ensuring it remains professional, well-structured, and ATS-friendly. Below are the details. You MUST follow the instructions carefully.
 
 ### **Key Objectives:**  
@@ -36,18 +33,107 @@ I have a resume in Markdown format and a job description. Your task is to **refi
 - Avoid automatic translation of section titles, degrees, or experience labels.  
 - Example of expected format in English: **Master’s in Data Science & AI**, *Evolve Academy* · January 2025 – June 2025
 
+### **Expected Output:**  
+- Return the **optimized resume in Markdown**, ensuring it is refined according to the outlined objectives.  
+- **Do not enclose the output in code blocks (` ``` `), return it as plain Markdown content.**
+
 ### **Input Data:**  
-#### **Resume (Markdown format):**  
+"""
+
+def generate_prompt(md_resume: str, job_description: str) -> str:
+    """
+    Generate a detailed prompt to optimize a resume according to a job description.
+
+    The prompt is laid out from most to least stable: static instructions, then
+    the resume, then the job description. Sending one resume against many
+    postings therefore repeats the same prefix, which providers can serve from
+    their prompt cache.
+    
+    Parameters:
+        md_resume (str): The resume content in Markdown format.
+        job_description (str): The job description text.
+    
+    Returns:
+        str: The complete prompt to send to a language model.
+    """
+    # Static instructions first, variable inputs last (job description at the very end)
+    return f"""{PROMPT_INSTRUCTIONS}#### **Resume (Markdown format):**  
 {md_resume}  
 
 #### **Job Description:**  
 {job_description}  
+"""
+
+# Static instructions for adapting one resume section at a time
+SECTION_PROMPT_INSTRUCTIONS = """
+Below is ONE section of my resume in Markdown format, followed by a job description. Your task is to **refine and tailor this section only** so it closely matches the job requirements while remaining professional and ATS-friendly. You MUST follow the instructions carefully.
+
+### **Key Objectives:**  
+- Emphasize **relevant skills, experiences, and achievements** for this job.  
+- **Incorporate** keywords and phrases from the job posting where they are truthful.  
+- **Enhance bullet points** by making them **quantifiable** and **impact-driven**.  
+- Keep the section's `##` heading exactly as it is and do not add other sections.  
+- Maintain the **Markdown format**, preserving bullet points, hyperlinks, and the `**Title**, *Institution* · Dates` line format.  
+- Keep the language of the section; do not translate headings, degrees, or labels.
 
 ### **Expected Output:**  
-- Return the **optimized resume in Markdown**, ensuring it is refined according to the outlined objectives.  
-- **Do not enclose the output in code blocks (` ``` `), return it as plain Markdown content.**
+- Return **only the optimized section in Markdown**, starting with its `##` heading.  
+- **Do not enclose the output in code blocks (` ``` `).**
+
+### **Input Data:**  
 """
 
+def generate_section_prompt(md_section: str, job_description: str) -> str:
+    """
+    Generate a prompt that adapts a single `##` section of the resume.
+
+    Like `generate_prompt`, static instructions come first and the job
+    description last, so every section prompt shares a cacheable prefix.
+
+    Parameters:
+        md_section (str): One resume section in Markdown, including its `##` heading.
+        job_description (str): The job description text.
+
+    Returns:
+        str: The prompt for this section.
+    """
+    return f"""{SECTION_PROMPT_INSTRUCTIONS}#### **Resume section (Markdown format):**  
+{md_section}  
+
+#### **Job Description:**  
+{job_description}  
+"""
+
+def generate_compact_prompt(md_resume: str, job_description: str, token_budget: int = None) -> tuple:
+    """
+    Generate the prompt after compacting the job description (boilerplate and
+    duplicated sentences removed) so the whole prompt fits in `token_budget`.
+
+    Parameters:
+        md_resume (str): The resume content in Markdown format.
+        job_description (str): The raw job description text.
+        token_budget (int): Optional maximum number of tokens for the whole prompt.
+
+    Returns:
+        tuple: (prompt, compaction report with token counts and `saved_tokens`).
+
+    Raises:
+        ValueError: If the instructions and resume alone exceed the budget.
+    """
+    max_jd_tokens = None
+    if token_budget is not None:
+        # Everything except the job description is fixed, so it sets the floor
+        fixed_tokens = count_tokens(generate_prompt(md_resume, ""))
+        if fixed_tokens >= token_budget:
+            raise ValueError(f"Token budget {token_budget} is too small: instructions and resume "
+                             f"already use {fixed_tokens} tokens.")
+        max_jd_tokens = token_budget - fixed_tokens
+
+    compacted, report = compact_job_description(job_description, max_jd_tokens)  # Strip boilerplate, enforce budget
+    prompt = generate_prompt(md_resume, compacted)
+    report["prompt_tokens"] = count_tokens(prompt)
+    return prompt, report
+
 def get_latest_docx_file(input_folder: str) -> str:
     """
     Retrieve the most recently modified .docx file from a folder.
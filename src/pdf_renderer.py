@@ -0,0 +1,238 @@
+import os
+import time
+import subprocess
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pdfkit
+
+from src.timing import span
+
+# -------------------- SETTINGS --------------------
+
+# Shared wkhtmltopdf options for every rendered resume
+PDF_OPTIONS = {
+    'encoding': 'UTF-8',
+    'page-size': 'A4',
+    'margin-top': '12.7mm',
+    'margin-bottom': '12.7mm',
+    'margin-left': '12.7mm',
+    'margin-right': '12.7mm',
+    'minimum-font-size': '14',
+    'enable-local-file-access': '',
+    'dpi': '300',
+}
+
+def restricted_pdf_options(allowed_dirs: list) -> dict:
+    """
+    PDF_OPTIONS for untrusted HTML: local file access is off except below
+    `allowed_dirs` (theme stylesheets, fonts), so a document cannot pull server
+    files such as file:///etc/passwd into its PDF.
+    """
+    options = {key: value for key, value in PDF_OPTIONS.items() if key != 'enable-local-file-access'}
+    options['disable-local-file-access'] = ''
+    options['allow'] = [os.path.abspath(path) for path in allowed_dirs]
+    return options
+
+# Number of documents handed to a single wkhtmltopdf process
+DEFAULT_CHUNK_SIZE = 16
+
+@lru_cache(maxsize=1)
+def get_pdfkit_configuration():
+    """
+    Locate wkhtmltopdf once per process instead of on every render.
+    """
+    return pdfkit.configuration()
+
+def _wkhtmltopdf_binary() -> str:
+    binary = get_pdfkit_configuration().wkhtmltopdf
+    return binary.decode("utf-8") if isinstance(binary, bytes) else binary
+
+def _option_args(options: dict) -> list:
+    args = []
+    for key, value in options.items():
+        for item in (value if isinstance(value, (list, tuple)) else [value]):  # Lists repeat the option, as in pdfkit
+            args.append(f"--{key}")
+            if item != '':
+                args.append(str(item))
+    return args
+
+def _quote(arg: str) -> str:
+    # wkhtmltopdf splits stdin lines on spaces and honours "..." and backslash escapes
+    return '"' + arg.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+# -------------------- RENDERING --------------------
+
+def render_file(html_path: str, pdf_path: str, options: dict = None) -> str:
+    """
+    Render one HTML file to PDF with a cached pdfkit configuration.
+
+    Returns:
+        str: Path to the generated PDF.
+    """
+    if not os.path.exists(html_path):
+        raise FileNotFoundError(f"HTML file not found: {html_path}")
+    with span("pdf.wkhtmltopdf", pdf=os.path.basename(pdf_path)):
+        pdfkit.from_file(html_path, pdf_path, configuration=get_pdfkit_configuration(),
+                         options=options or PDF_OPTIONS)
+    return pdf_path
+
+def render_string(html: str, options: dict = None) -> bytes:
+    """
+    Render an HTML string to PDF bytes (wkhtmltopdf reads stdin and writes stdout).
+    """
+    with span("pdf.wkhtmltopdf", source="string"):
+        return pdfkit.from_string(html, False, configuration=get_pdfkit_configuration(),
+                                  options=options or PDF_OPTIONS)
+
+def render_chunk(pairs: list, options: dict = None) -> dict:
+    """
+    Render several HTML files with a single wkhtmltopdf process.
+
+    wkhtmltopdf's --read-args-from-stdin mode runs one conversion per input
+    line, so the Qt/WebKit startup is paid once per chunk instead of once per
+    document. Files that the batch invocation failed to produce are retried
+    individually so one bad document cannot sink the whole chunk.
+
+    Parameters:
+        pairs (list): (html_path, pdf_path) tuples.
+        options (dict): wkhtmltopdf options (defaults to PDF_OPTIONS).
+
+    Returns:
+        dict: Maps each pdf_path to None on success or an error message.
+    """
+    options = options or PDF_OPTIONS
+    for html_path, _ in pairs:
+        if not os.path.exists(html_path):
+            raise FileNotFoundError(f"HTML file not found: {html_path}")
+
+    results = {}
+    for _, pdf_path in pairs:
+        if os.path.exists(pdf_path):
+            os.remove(pdf_path)  # Stale output would hide a failed conversion
+    if len(pairs) > 1:
+        option_line = " ".join(_quote(arg) for arg in _option_args(options))
+        stdin = "".join(
+            f"{option_line} {_quote(os.path.abspath(html))} {_quote(os.path.abspath(pdf))}\n"
+            for html, pdf in pairs
+        )
+        subprocess.run([_wkhtmltopdf_binary(), "--quiet", "--read-args-from-stdin"],
+                       input=stdin.encode("utf-8"), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    for html_path, pdf_path in pairs:
+        if os.path.exists(pdf_path) and os.path.getsize(pdf_path) > 0:
+            results[pdf_path] = None
+            continue
+        try:
+            render_file(html_path, pdf_path, options)
+            results[pdf_path] = None
+        except Exception as e:
+            results[pdf_path] = str(e)
+    return results
+
+class WkhtmltopdfBackend:
+    """
+    PDF backend that runs the wkhtmltopdf binary (one process per document).
+    """
+
+    name = "wkhtmltopdf"
+
+    def __init__(self, options: dict = None):
+        self.options = options or PDF_OPTIONS
+
+    def render_string(self, html: str, base_dir: str = None) -> bytes:
+        return render_string(html, self.options)
+
+    def render_file(self, html_path: str, pdf_path: str) -> str:
+        return render_file(html_path, pdf_path, self.options)
+
+    def close(self) -> None:
+        pass
+
+def _init_worker() -> None:
+    # Resolve the wkhtmltopdf binary as soon as the worker starts
+    get_pdfkit_configuration()
+
+# -------------------- RENDERER SERVICE --------------------
+
+class PDFRenderer:
+    """
+    Long-lived PDF rendering service.
+
+    Keeps a pool of worker processes (one per CPU by default), each with its
+    own cached pdfkit configuration, and feeds them chunks of documents that
+    are rendered by a single wkhtmltopdf invocation per chunk.
+
+    Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE, options: dict = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.options = options or PDF_OPTIONS
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return self._pool
+
+    def submit(self, html_path: str, pdf_path: str):
+        """
+        Queue a single document. Returns a Future resolving to the PDF path.
+        """
+        return self.pool.submit(render_file, html_path, pdf_path, self.options)
+
+    def submit_chunk(self, pairs: list):
+        """
+        Queue several documents for one wkhtmltopdf invocation.
+        Returns a Future resolving to the `render_chunk` result.
+        """
+        return self.pool.submit(render_chunk, list(pairs), self.options)
+
+    def render_many(self, pairs: list) -> dict:
+        """
+        Render many documents, spreading chunks across the worker pool.
+
+        Parameters:
+            pairs (list): (html_path, pdf_path) tuples.
+
+        Returns:
+            dict: `rendered`, `failed`, `errors` (pdf_path -> message),
+            `elapsed_seconds` and `pdfs_per_second`.
+        """
+        start = time.perf_counter()
+        pairs = list(pairs)
+        # Spread work evenly: never fewer chunks than workers when there is enough work
+        size = min(self.chunk_size, max(1, -(-len(pairs) // self.workers)))
+        chunks = [pairs[i:i + size] for i in range(0, len(pairs), size)]
+
+        errors = {}
+        futures = {self.submit_chunk(chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            try:
+                errors.update({pdf: err for pdf, err in future.result().items() if err})
+            except Exception as e:
+                errors.update({pdf: str(e) for _, pdf in futures[future]})
+
+        elapsed = time.perf_counter() - start
+        rendered = len(pairs) - len(errors)
+        return {
+            "rendered": rendered,
+            "failed": len(errors),
+            "errors": errors,
+            "elapsed_seconds": round(elapsed, 3),
+            "pdfs_per_second": round(rendered / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,177 @@
+import re  # Module for regular expression operations
+
+try:
+    import tiktoken  # Exact tokenizer for OpenAI models (optional)
+except ImportError:
+    tiktoken = None
+
+# Headings whose whole section is boilerplate (English and Spanish). Only a
+# heading consisting of one of these phrases matches, not any line starting with one.
+BOILERPLATE_HEADINGS = re.compile(
+    r"^\W*(benefits|perks|what we offer|why join us|about us|about the company|who we are|"
+    r"equal opportunity( employer)?|eeo statement|privacy( notice| policy)?|legal( notice)?|disclaimer|how to apply|"
+    r"beneficios|qu[ée] ofrecemos|sobre nosotros|qui[ée]nes somos|igualdad de oportunidades|"
+    r"protecci[óo]n de datos|aviso legal)\W*:?\W*$",
+    re.IGNORECASE,
+)
+
+# Sentences that carry no information about the role itself. Bare topics such
+# as "GDPR" or "personal data" are left alone: they are often the job itself.
+BOILERPLATE_SENTENCES = re.compile(
+    r"(equal opportunity|eeo\b|affirmative action|without regard to (race|age|gender)|"
+    r"reasonable accommodation|e-?verify|privacy (policy|notice)|"
+    r"background check|drug[- ]free|recruitment agencies|unsolicited resumes|"
+    r"igualdad de oportunidades|sin distinci[óo]n de|pol[íi]tica de privacidad)",
+    re.IGNORECASE,
+)
+
+# Below this share of the original tokens, compaction without a budget is
+# assumed to have misread the text and the uncompacted description is used
+MIN_KEPT_SHARE = 0.5
+
+# Words that mark sentences worth keeping when the budget is tight
+RELEVANCE_CUES = re.compile(
+    r"\b(require|required|requirements|must|experience|skills?|knowledge|proficien\w*|degree|years?|"
+    r"responsib\w+|you will|tools?|stack|python|sql|"
+    r"requisitos|experiencia|conocimientos|imprescindible|valorable|funciones|responsabilidades|"
+    r"titulaci[óo]n|a[ñn]os)\b",
+    re.IGNORECASE,
+)
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens with tiktoken when available, otherwise approximate them
+    (roughly one token per word or punctuation mark).
+
+    Parameters:
+        text (str): Text to measure.
+
+    Returns:
+        int: Number of tokens.
+    """
+    if tiktoken is not None:
+        return len(_encoding().encode(text))
+    return len(re.findall(r"\w+|[^\w\s]", text))
+
+_cached_encoding = None
+
+def _encoding():
+    global _cached_encoding
+    if _cached_encoding is None:
+        _cached_encoding = tiktoken.get_encoding("o200k_base")  # Tokenizer used by gpt-4o models
+    return _cached_encoding
+
+def _is_short_line(line: str) -> bool:
+    # Short unpunctuated lines that are not bullets: a heading or an item of an unbulleted list
+    return len(line) < 60 and line[0] not in "-*•·0123456789" and line[-1] not in ".,;!?"
+
+def _is_heading(line: str, next_line: str = None) -> bool:
+    # Markdown headings, "Title:" lines, known section names, and short lines followed by
+    # body text (a short line followed by another is an item of an unbulleted list)
+    if line.startswith("#") or line.endswith(":") or BOILERPLATE_HEADINGS.match(line.lstrip("#*- ").strip()):
+        return True
+    return _is_short_line(line) and next_line is not None and not _is_short_line(next_line)
+
+def _sentence_key(sentence: str) -> str:
+    return re.sub(r"\W+", " ", sentence.lower()).strip()
+
+def _render(items) -> str:
+    # Reassemble kept (line index, sentence, section) items into lines
+    lines = {}
+    for line_no, sentence, _ in items:
+        lines.setdefault(line_no, []).append(sentence)
+    return "\n".join(" ".join(parts) for _, parts in sorted(lines.items()))
+
+def _split(job_description: str, report: dict = None) -> tuple:
+    """
+    Split a job description into (line index, sentence, section index) items.
+
+    With a `report`, boilerplate and duplicated sentences are dropped and
+    counted in it. Returns the items and the set of boilerplate section indexes.
+    """
+    items = []
+    seen = set()
+    boilerplate_sections = set()
+    section = 0
+    lines = [(line_no, line.strip()) for line_no, line in enumerate(job_description.splitlines()) if line.strip()]
+    for i, (line_no, stripped) in enumerate(lines):
+        next_line = lines[i + 1][1] if i + 1 < len(lines) else None
+        if _is_heading(stripped, next_line):
+            section += 1  # Every heading ends the previous section
+            if BOILERPLATE_HEADINGS.match(stripped.lstrip("#*- ").strip()):
+                boilerplate_sections.add(section)
+        for sentence in SENTENCE_SPLIT.split(stripped):
+            key = _sentence_key(sentence)
+            if not key:
+                continue
+            if report is not None and BOILERPLATE_SENTENCES.search(sentence):
+                report["removed_boilerplate"] += 1
+            elif report is not None and key in seen:
+                report["removed_duplicates"] += 1
+            else:
+                seen.add(key)
+                items.append((line_no, sentence, section))
+    return items, boilerplate_sections
+
+def compact_job_description(job_description: str, max_tokens: int = None) -> tuple:
+    """
+    Shrink a job description before it goes into the prompt.
+
+    1. Drops boilerplate and duplicated sentences. If that removes most of the
+       text, the description is assumed to be misread and kept as it was.
+    2. If still above `max_tokens`, drops boilerplate sections (benefits,
+       about us, legal, privacy...), then the least relevant sentences (those
+       without requirement/skill cues) from the end, until it fits.
+
+    Parameters:
+        job_description (str): Raw job description text.
+        max_tokens (int): Optional token budget for the job description.
+
+    Returns:
+        tuple: (compacted text, report dict with token counts and removals).
+    """
+    original_tokens = count_tokens(job_description)
+    report = {"removed_sections": 0, "removed_boilerplate": 0, "removed_duplicates": 0, "removed_for_budget": 0,
+              "fallback": False}
+
+    # Step 1: sentence-level cleanup, undone if it would gut the description
+    kept, boilerplate_sections = _split(job_description, report)
+    text = _render(kept)
+    if count_tokens(text) < original_tokens * MIN_KEPT_SHARE:
+        kept, boilerplate_sections = _split(job_description)
+        text = _render(kept)
+        report.update(removed_boilerplate=0, removed_duplicates=0, fallback=True)
+
+    # Step 2: enforce the token budget: boilerplate sections first, then low-relevance sentences last-first
+    if max_tokens is not None and count_tokens(text) > max_tokens:
+        costs = [count_tokens(sentence) + 1 for _, sentence, _ in kept]
+        total = sum(costs)
+        drop = set()
+        for section in sorted(boilerplate_sections, reverse=True):
+            if total <= max_tokens:
+                break
+            members = [i for i, item in enumerate(kept) if item[2] == section]  # Heading included
+            drop.update(members)
+            total -= sum(costs[i] for i in members)
+            report["removed_sections"] += 1
+        candidates = sorted(
+            (i for i in range(len(kept)) if i not in drop),
+            key=lambda i: (bool(RELEVANCE_CUES.search(kept[i][1])), -i),  # Irrelevant first, then from the end
+        )
+        for i in candidates:
+            if total <= max_tokens:
+                break
+            drop.add(i)
+            total -= costs[i]
+        report["removed_for_budget"] = len(drop)
+        text = _render(item for i, item in enumerate(kept) if i not in drop)
+
+    compacted_tokens = count_tokens(text)
+    report.update(
+        original_tokens=original_tokens,
+        compacted_tokens=compacted_tokens,
+        saved_tokens=original_tokens - compacted_tokens,
+    )
+    return text, report
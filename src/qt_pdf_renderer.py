@@ -0,0 +1,145 @@
+import os
+import sys
+import time
+import tempfile
+
+from PyQt5.QtCore import QEventLoop, QMarginsF, QTimer, QUrl
+from PyQt5.QtGui import QPageLayout, QPageSize
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtWebEngineWidgets import QWebEnginePage, QWebEngineSettings
+
+from src.pdf_renderer import PDF_OPTIONS
+from src.timing import span
+
+# -------------------- SETTINGS --------------------
+
+# Chromium refuses setHtml() content above 2 MB; larger documents go through a file
+MAX_SET_HTML_BYTES = 2 * 1024 * 1024
+
+# Seconds to wait for a page load or a print job before giving up
+RENDER_TIMEOUT = 60
+
+def _millimeters(value: str) -> float:
+    return float(str(value).replace("mm", ""))
+
+def _page_layout(options: dict) -> QPageLayout:
+    # Same page size and margins as the wkhtmltopdf options
+    margins = QMarginsF(_millimeters(options["margin-left"]), _millimeters(options["margin-top"]),
+                        _millimeters(options["margin-right"]), _millimeters(options["margin-bottom"]))
+    return QPageLayout(QPageSize(QPageSize.A4), QPageLayout.Portrait, margins, QPageLayout.Millimeter)
+
+# -------------------- RENDERER --------------------
+
+class QtPdfBackend:
+    """
+    In-process PDF backend built on QtWebEngine's printToPdf.
+
+    One offscreen QWebEnginePage is created on first use and reused for every
+    document, so Chromium starts once per process instead of once per PDF as
+    with wkhtmltopdf. Qt objects belong to the thread that created them: use
+    one instance from a single thread (the main thread in the pipeline).
+    """
+
+    name = "qt"
+
+    def __init__(self, options: dict = None):
+        self.options = options or PDF_OPTIONS
+        self._app = None
+        self._page = None
+
+    @property
+    def page(self) -> QWebEnginePage:
+        if self._page is None:
+            os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # No window or display needed
+            self._app = QApplication.instance() or QApplication(sys.argv[:1])
+            self._page = QWebEnginePage()
+            settings = self._page.settings()
+            settings.setAttribute(QWebEngineSettings.LocalContentCanAccessFileUrls, True)
+            settings.setFontSize(QWebEngineSettings.MinimumFontSize, int(self.options.get("minimum-font-size", 0)))
+        return self._page
+
+    def _wait(self, signal, start) -> tuple:
+        # Run a local event loop until `signal` fires (or the timeout expires)
+        loop, result = QEventLoop(), []
+
+        def done(*args):
+            result.append(args)
+            loop.quit()
+
+        if signal is not None:
+            signal.connect(done)
+        start(done)
+        if not result:
+            QTimer.singleShot(RENDER_TIMEOUT * 1000, loop.quit)
+            loop.exec_()
+        if signal is not None:
+            signal.disconnect(done)
+        if not result:
+            raise TimeoutError(f"QtWebEngine did not finish within {RENDER_TIMEOUT}s")
+        return result[0]
+
+    def _load(self, html: str = None, url: QUrl = None, base_url: QUrl = None) -> None:
+        page = self.page
+        if html is not None:
+            (ok,) = self._wait(page.loadFinished, lambda _: page.setHtml(html, base_url))
+        else:
+            (ok,) = self._wait(page.loadFinished, lambda _: page.load(url))
+        if not ok:
+            raise RuntimeError("QtWebEngine failed to load the document")
+
+        # The load event does not wait for @font-face downloads; print only once fonts are in
+        deadline = time.perf_counter() + RENDER_TIMEOUT
+        while time.perf_counter() < deadline:
+            (status,) = self._wait(None, lambda done: page.runJavaScript("document.fonts.status", done))
+            if status != "loading":
+                break
+
+    def _print(self) -> bytes:
+        page = self.page
+        (data,) = self._wait(None, lambda done: page.printToPdf(done, _page_layout(self.options)))
+        if not data:
+            raise RuntimeError("QtWebEngine printToPdf returned no data")
+        return bytes(data)
+
+    def render_string(self, html: str, base_dir: str = None) -> bytes:
+        """
+        Render an HTML string to PDF bytes.
+
+        Parameters:
+            html (str): HTML document.
+            base_dir (str): Folder relative URLs resolve against (defaults to the working directory).
+        """
+        with span("pdf.qt", source="string"):
+            if len(html.encode("utf-8")) > MAX_SET_HTML_BYTES:
+                with tempfile.NamedTemporaryFile("w", suffix=".html", dir=base_dir, encoding="utf-8",
+                                                 delete=False) as tmp:
+                    tmp.write(html)
+                try:
+                    self._load(url=QUrl.fromLocalFile(tmp.name))
+                    return self._print()
+                finally:
+                    os.remove(tmp.name)
+            base = os.path.abspath(base_dir or os.getcwd())
+            self._load(html=html, base_url=QUrl.fromLocalFile(base + os.sep))
+            return self._print()
+
+    def render_file(self, html_path: str, pdf_path: str) -> str:
+        """
+        Render one HTML file to PDF.
+
+        Returns:
+            str: Path to the generated PDF.
+        """
+        if not os.path.exists(html_path):
+            raise FileNotFoundError(f"HTML file not found: {html_path}")
+        with span("pdf.qt", pdf=os.path.basename(pdf_path)):
+            self._load(url=QUrl.fromLocalFile(os.path.abspath(html_path)))
+            pdf = self._print()
+        with open(pdf_path, "wb") as f:
+            f.write(pdf)
+        return pdf_path
+
+    def close(self) -> None:
+        if self._page is not None:
+            self._page.deleteLater()
+            self._page = None
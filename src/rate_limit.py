@@ -0,0 +1,388 @@
+import os  # Module for reading limits from the environment
+import re  # Module for parsing reset durations such as "6m0s"
+import time  # Module for monotonic timing and sleeping
+import random  # Module for backoff jitter
+import asyncio  # Module for waiting without blocking the shared event loop
+import threading  # Module for guarding limiter state across threads
+
+# Fraction of a provider's quota actually used, so bursts land just under it
+HEADROOM = 0.95
+
+# Concurrency is halved at most once per this many seconds (one burst of 429s = one decrease)
+DECREASE_COOLDOWN = 2.0
+
+# Output tokens assumed per request until the provider reports real usage
+DEFAULT_OUTPUT_TOKENS = 2000
+
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+def parse_duration(value: str) -> float:
+    """
+    Parse rate-limit reset values ("1s", "6m0s", "20ms", "0.5") into seconds.
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_PART.findall(value)
+    if not parts:
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(number) * scale[unit] for number, unit in parts)
+
+def retry_after_seconds(headers) -> float:
+    """
+    Seconds to wait according to `retry-after-ms` / `retry-after` headers, or None.
+    """
+    if not headers:
+        return None
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    return parse_duration(headers.get("retry-after"))
+
+def backoff_delay(attempt: int, retry_after: float = None, base: float = 1.0, cap: float = 30.0) -> float:
+    """
+    Jittered wait before retry number `attempt` (0-based).
+
+    Honors the server's Retry-After plus a little jitter, so clients that were
+    throttled together do not come back together; otherwise uses full-jitter
+    exponential backoff.
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, min(1.0, 0.1 * retry_after + 0.1))
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+class TokenBucket:
+    """
+    Refills `per_minute` units per minute up to a burst of `per_minute`.
+    A limit of 0 means unlimited.
+    """
+
+    def __init__(self, per_minute: float = 0):
+        self.per_minute = 0
+        self.level = 0.0
+        self.updated = time.monotonic()
+        self.set_limit(per_minute)
+
+    def set_limit(self, per_minute: float) -> None:
+        self._refill()
+        per_minute = max(0.0, float(per_minute or 0))
+        if per_minute and not self.per_minute:
+            self.level = per_minute  # Start full when a limit first appears
+        self.per_minute = per_minute
+        self.level = min(self.level, per_minute)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self.per_minute:
+            self.level = min(self.per_minute, self.level + (now - self.updated) * self.per_minute / 60)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        Seconds until `amount` units are available (0 if available now).
+        """
+        if not self.per_minute:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.per_minute)  # A request larger than the burst still gets through eventually
+        return max(0.0, (amount - self.level) * 60 / self.per_minute)
+
+    def take(self, amount: float) -> None:
+        if self.per_minute:
+            self._refill()
+            self.level -= min(amount, self.per_minute)
+
+    def give_back(self, amount: float) -> None:
+        if self.per_minute:
+            self._refill()
+            self.level = min(self.per_minute, self.level + amount)
+
+    def cap_level(self, remaining: float) -> None:
+        # The provider knows better than our estimate how much is left
+        if self.per_minute:
+            self._refill()
+            self.level = min(self.level, remaining)
+
+class ProviderLimiter:
+    """
+    Client-side rate limiter for one LLM provider.
+
+    Combines a requests-per-minute and a tokens-per-minute token bucket with
+    an AIMD concurrency limit: every success raises the in-flight limit by
+    1/limit (about +1 per round of requests), every 429 halves it (at most once per
+    DECREASE_COOLDOWN) and pauses new requests for the server's Retry-After.
+    Rate-limit response headers (x-ratelimit-*) correct the buckets, so
+    throughput settles just under the real quota instead of oscillating.
+
+    Parameters:
+        name (str): Provider name.
+        rpm (float): Requests per minute (0 = unlimited until headers say otherwise).
+        tpm (float): Tokens per minute (0 = unlimited until headers say otherwise).
+        concurrency (int): Initial in-flight limit.
+        max_concurrency (int): Upper bound for the in-flight limit.
+    """
+
+    def __init__(self, name: str, rpm: float = 0, tpm: float = 0, concurrency: int = 4, max_concurrency: int = 32):
+        self.name = name
+        self.lock = threading.Lock()
+        self.requests = TokenBucket(rpm * HEADROOM)
+        self.tokens = TokenBucket(tpm * HEADROOM)
+        self.limit = float(max(1, concurrency))
+        self.max_concurrency = max(1, max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.counters = {"requests": 0, "succeeded": 0, "rate_limited": 0, "retried": 0, "waited_seconds": 0.0}
+
+    # -------------------- ADMISSION --------------------
+
+    def try_acquire(self, tokens: int) -> float:
+        """
+        Take a request slot if one is free right now.
+
+        Returns:
+            float: 0 if the slot was taken, otherwise seconds to wait before trying again.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            if self.in_flight >= int(self.limit):
+                return 0.05  # A slot frees up when a request finishes
+            wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+            if wait > 0:
+                return wait
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self.in_flight += 1
+            self.counters["requests"] += 1
+            return 0.0
+
+    def acquire(self, tokens: int) -> None:
+        """
+        Block until a request slot is available.
+        """
+        start = time.monotonic()
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                break
+            time.sleep(min(wait, 1.0))
+        self._count_wait(time.monotonic() - start)
+
+    async def acquire_async(self, tokens: int) -> None:
+        """
+        Wait for a request slot without blocking the event loop. Cancelling the
+        wait never leaks a slot, since slots are only taken atomically.
+        """
+        start = time.monotonic()
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                break
+            await asyncio.sleep(min(wait, 1.0))
+        self._count_wait(time.monotonic() - start)
+
+    def _count_wait(self, seconds: float) -> None:
+        with self.lock:
+            self.counters["waited_seconds"] += seconds
+
+    def release(self) -> None:
+        with self.lock:
+            self.in_flight = max(0, self.in_flight - 1)
+
+    # -------------------- FEEDBACK --------------------
+
+    def on_success(self, headers=None, estimated_tokens: int = 0, used_tokens: int = None) -> None:
+        """
+        Additive increase, plus bucket corrections from headers and real token usage.
+        """
+        with self.lock:
+            self.counters["succeeded"] += 1
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            if used_tokens is not None:
+                difference = estimated_tokens - used_tokens
+                if difference > 0:
+                    self.tokens.give_back(difference)
+                else:
+                    self.tokens.take(-difference)
+            self._apply_headers(headers)
+
+    def on_rate_limited(self, retry_after: float = None, headers=None) -> None:
+        """
+        Multiplicative decrease and a shared pause for every caller.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.counters["rate_limited"] += 1
+            if now - self.last_decrease >= DECREASE_COOLDOWN:
+                self.limit = max(1.0, self.limit / 2)
+                self.last_decrease = now
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+            self._apply_headers(headers)
+
+    def _apply_headers(self, headers) -> None:
+        # OpenAI-style x-ratelimit-* headers (Gemini does not send them)
+        if not headers:
+            return
+        for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            limit = headers.get(f"x-ratelimit-limit-{kind}")
+            if limit and limit.isdigit() and int(limit) > 0:
+                if abs(bucket.per_minute - int(limit) * HEADROOM) > 1:
+                    bucket.set_limit(int(limit) * HEADROOM)
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            if remaining and remaining.isdigit():
+                bucket.cap_level(int(remaining))
+                if int(remaining) == 0:
+                    reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                    if reset:
+                        self.paused_until = max(self.paused_until, time.monotonic() + reset)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "concurrency_limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "rpm_limit": round(self.requests.per_minute, 1),
+                "tpm_limit": round(self.tokens.per_minute, 1),
+                "paused_seconds": round(max(0.0, self.paused_until - time.monotonic()), 2),
+                **{key: round(value, 2) if isinstance(value, float) else value
+                   for key, value in self.counters.items()},
+            }
+
+# -------------------- REGISTRY --------------------
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(provider: str) -> ProviderLimiter:
+    """
+    Return the process-wide limiter for a provider, configured from
+    RESUME_<PROVIDER>_RPM / RESUME_<PROVIDER>_TPM, RESUME_LLM_CONCURRENCY and
+    RESUME_LLM_MAX_CONCURRENCY.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            prefix = f"RESUME_{provider.upper()}"
+            limiter = ProviderLimiter(
+                provider,
+                rpm=float(os.getenv(f"{prefix}_RPM", "0")),
+                tpm=float(os.getenv(f"{prefix}_TPM", "0")),
+                concurrency=int(os.getenv("RESUME_LLM_CONCURRENCY", "4")),
+                max_concurrency=int(os.getenv("RESUME_LLM_MAX_CONCURRENCY", "32")),
+            )
+            _limiters[provider] = limiter
+        return limiter
+
+def limiter_stats() -> dict:
+    """
+    Stats of every limiter created so far, by provider.
+    """
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {name: limiter.stats() for name, limiter in limiters.items()}
+
+# -------------------- CALLS --------------------
+
+def _retry_settings() -> tuple:
+    return int(os.getenv("RESUME_LLM_MAX_ATTEMPTS", "4")), float(os.getenv("RESUME_LLM_RETRY_DEADLINE", "60"))
+
+def open_with_limits(provider: str, call, tokens: int, classify) -> tuple:
+    """
+    Like `call_with_limits`, but the request slot stays taken when `call`
+    returns, for responses that are consumed later (streams). The caller must
+    finish with `limiter.release()` and, if the response was read to the end,
+    `limiter.on_success(...)`.
+
+    Returns:
+        tuple: (result of `call`, feedback dict).
+    """
+    limiter = get_limiter(provider)
+    max_attempts, deadline = _retry_settings()
+    start = time.monotonic()
+    attempt = 0
+    while True:
+        limiter.acquire(tokens)
+        feedback = {}
+        try:
+            return call(feedback), feedback
+        except Exception as e:
+            limiter.release()
+            delay = _handle_failure(limiter, e, classify, attempt, max_attempts, deadline - (time.monotonic() - start))
+        time.sleep(delay)
+        attempt += 1
+
+def call_with_limits(provider: str, call, tokens: int, classify):
+    """
+    Run `call` under the provider's limiter, retrying throttled and transient
+    failures with jittered backoff.
+
+    Parameters:
+        provider (str): Provider name (see `get_limiter`).
+        call (callable): Receives a feedback dict; may set `headers` and `used_tokens` in it.
+        tokens (int): Estimated tokens for the request (prompt + expected output).
+        classify (callable): Maps an exception to (kind, retry_after, headers), where
+            kind is "rate_limit", "transient" or None (not retryable).
+
+    Returns:
+        Whatever `call` returns. The last error is re-raised once attempts
+        (RESUME_LLM_MAX_ATTEMPTS) or the retry deadline (RESUME_LLM_RETRY_DEADLINE) run out.
+    """
+    limiter = get_limiter(provider)
+    result, feedback = open_with_limits(provider, call, tokens, classify)
+    limiter.release()
+    limiter.on_success(feedback.get("headers"), tokens, feedback.get("used_tokens"))
+    return result
+
+async def call_with_limits_async(provider: str, call, tokens: int, classify):
+    """
+    Async variant of `call_with_limits`; `call` receives the feedback dict and
+    returns an awaitable.
+    """
+    limiter = get_limiter(provider)
+    max_attempts, deadline = _retry_settings()
+    start = time.monotonic()
+    attempt = 0
+    while True:
+        await limiter.acquire_async(tokens)
+        feedback = {}
+        try:
+            result = await call(feedback)
+        except asyncio.CancelledError:
+            limiter.release()  # Lost a hedged race: not a failure
+            raise
+        except Exception as e:
+            limiter.release()
+            delay = _handle_failure(limiter, e, classify, attempt, max_attempts, deadline - (time.monotonic() - start))
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+        limiter.release()
+        limiter.on_success(feedback.get("headers"), tokens, feedback.get("used_tokens"))
+        return result
+
+def _handle_failure(limiter: ProviderLimiter, error: Exception, classify, attempt: int,
+                    max_attempts: int, time_left: float) -> float:
+    # Record the failure and return the backoff delay, or re-raise if it should not be retried
+    kind, retry_after, headers = classify(error)
+    if kind == "rate_limit":
+        limiter.on_rate_limited(retry_after, headers)
+    if kind is None:
+        raise error
+    delay = backoff_delay(attempt, retry_after)
+    if attempt + 1 >= max_attempts or delay > time_left:
+        raise error
+    with limiter.lock:
+        limiter.counters["retried"] += 1
+    print(f"⏳ {limiter.name}: {'rate limited' if kind == 'rate_limit' else type(error).__name__}, "
+          f"retrying in {delay:.1f}s (attempt {attempt + 2}/{max_attempts})")
+    return delay
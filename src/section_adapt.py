@@ -0,0 +1,171 @@
+import os  # Module for interacting with the operating system
+import json  # Module for writing the section manifest
+import time  # Module for measuring generation time
+import hashlib  # Module for hashing section inputs
+from concurrent.futures import ThreadPoolExecutor  # Thread pool for concurrent section requests
+from src.optimize_resume import generate_section_prompt  # Prompt for a single resume section
+from src.prompt_compaction import compact_job_description, count_tokens  # Token-budgeted job description compaction
+from src.adapt_resume import (  # Cached LLM generation, output helpers and model settings
+    generate_adapted_text, clean_adapted_markdown, load_api_keys, write_to_file,
+    OPENAI_MODEL, GOOGLE_MODEL, TEMPERATURE
+)
+
+# Default number of sections adapted concurrently
+DEFAULT_SECTION_WORKERS = 4
+
+def split_sections(md_resume: str) -> list:
+    """
+    Split a Markdown resume into its `##` sections.
+
+    Everything before the first `##` heading (name, contact line...) is
+    returned as a preamble section with heading None and is never sent to the LLM.
+
+    Parameters:
+        md_resume (str): Markdown produced by `convert_docx_to_md`.
+
+    Returns:
+        list: (heading, text) tuples in document order; text includes the heading line.
+    """
+    sections = []
+    heading, lines = None, []
+    for line in md_resume.splitlines():
+        if line.startswith("## "):
+            if heading is not None or any(l.strip() for l in lines):
+                sections.append((heading, "\n".join(lines).strip()))
+            heading, lines = line[3:].strip(), [line]
+        else:
+            lines.append(line)
+    if heading is not None or any(l.strip() for l in lines):
+        sections.append((heading, "\n".join(lines).strip()))
+    return sections
+
+def compact_for_sections(md_resume: str, job_description: str, token_budget: int = None) -> tuple:
+    """
+    Compact the job description so that every section prompt fits in
+    `token_budget` (the counterpart of `generate_compact_prompt`).
+
+    All sections share one compacted job description, sized for the largest
+    section prompt.
+
+    Parameters:
+        md_resume (str): Markdown resume.
+        job_description (str): The raw job description text.
+        token_budget (int): Optional maximum number of tokens per section prompt.
+
+    Returns:
+        tuple: (compacted job description, compaction report with token counts,
+        `saved_tokens` and `prompt_tokens` of the largest section prompt).
+
+    Raises:
+        ValueError: If the instructions and the largest section alone exceed the budget.
+    """
+    sections = [text for heading, text in split_sections(md_resume) if heading is not None]
+    max_jd_tokens = None
+    if token_budget is not None and sections:
+        # Everything except the job description is fixed, so the largest section sets the floor
+        fixed_tokens = max(count_tokens(generate_section_prompt(text, "")) for text in sections)
+        if fixed_tokens >= token_budget:
+            raise ValueError(f"Token budget {token_budget} is too small: instructions and the largest "
+                             f"section already use {fixed_tokens} tokens.")
+        max_jd_tokens = token_budget - fixed_tokens
+
+    compacted, report = compact_job_description(job_description, max_jd_tokens)
+    report["prompt_tokens"] = max((count_tokens(generate_section_prompt(text, compacted)) for text in sections),
+                                  default=0)
+    return compacted, report
+
+def section_hash(prompt: str) -> str:
+    """
+    Content hash of a section prompt (section text plus job description) and
+    the model settings that answer it.
+    """
+    settings = f"{OPENAI_MODEL}|{GOOGLE_MODEL}|{TEMPERATURE}\n"
+    return hashlib.sha256((settings + prompt).encode("utf-8")).hexdigest()
+
+def manifest_path_for(output_path: str) -> str:
+    """
+    Path of the section manifest stored next to an adapted resume.
+    """
+    return os.path.splitext(output_path)[0] + ".sections.json"
+
+def load_manifest(manifest_path: str) -> dict:
+    """
+    Adapted sections recorded by an earlier run, keyed by section hash.
+    A missing or unreadable manifest simply means nothing can be reused.
+    """
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        return {e["hash"]: e for e in entries if e.get("hash") and isinstance(e.get("text"), str)}
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return {}
+
+def _clean_section(raw: str, heading: str) -> str:
+    # Keep the original heading even if the model rewrote or dropped it
+    lines = clean_adapted_markdown(raw).strip().splitlines()
+    if lines and lines[0].startswith("## "):
+        lines = lines[1:]
+    return "\n".join([f"## {heading}"] + lines).strip()
+
+def adapt_sections(md_resume: str, job_description: str, output_path: str = None,
+                   workers: int = DEFAULT_SECTION_WORKERS, hedge: bool = False) -> dict:
+    """
+    Adapt each `##` section of the resume independently and in parallel.
+
+    A manifest next to the output (`<name>.sections.json`) records each
+    section's hash, adapted text and whether it was reused or regenerated. On
+    later runs with the same output path, sections whose hash is in the
+    manifest are reused from it, so only sections whose text (or the job
+    description) changed are sent to the LLM, even with the response cache
+    disabled. Other sections still go through the response cache.
+
+    Parameters:
+        md_resume (str): Markdown resume.
+        job_description (str): Job description text (compacted or not).
+        output_path (str): Optional destination for the adapted Markdown resume (and its manifest).
+        workers (int): Maximum concurrent section requests.
+        hedge (bool): Race Gemini against a slow or failing OpenAI call.
+
+    Returns:
+        dict: `markdown`, `sections`, `adapted`, `reused`, `elapsed_seconds` and `manifest_path`.
+    """
+    start = time.perf_counter()
+    keys = load_api_keys()  # Load API keys once for every section
+    sections = split_sections(md_resume)
+    manifest_path = manifest_path_for(output_path) if output_path else None
+    previous = load_manifest(manifest_path) if manifest_path else {}
+
+    def adapt_one(section):
+        heading, text = section
+        if heading is None:
+            return {"heading": None, "hash": None, "provider": None, "reused": True, "text": text}
+        prompt = generate_section_prompt(text, job_description)
+        digest = section_hash(prompt)
+        if digest in previous:
+            return {"heading": heading, "hash": digest, "provider": previous[digest].get("provider"),
+                    "reused": True, "text": previous[digest]["text"]}
+        provider, raw, from_cache = generate_adapted_text(prompt, keys, hedge=hedge)
+        return {"heading": heading, "hash": digest, "provider": provider,
+                "reused": from_cache, "text": _clean_section(raw, heading)}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(adapt_one, sections))  # Keeps document order
+
+    markdown = "\n\n".join(r["text"] for r in results) + "\n"
+    llm_sections = [r for r in results if r["heading"] is not None]
+    reused = sum(1 for r in llm_sections if r["reused"])
+
+    if output_path:
+        write_to_file(markdown, output_path)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump([{k: r[k] for k in ("heading", "hash", "provider", "reused", "text")} for r in llm_sections],
+                      f, indent=2, ensure_ascii=False)
+        print(f"✅ Resume saved to {output_path} ({len(llm_sections) - reused} sections adapted, {reused} reused)")
+    return {
+        "markdown": markdown,
+        "sections": len(llm_sections),
+        "adapted": len(llm_sections) - reused,
+        "reused": reused,
+        "elapsed_seconds": round(time.perf_counter() - start, 3),
+        "manifest_path": manifest_path,
+    }
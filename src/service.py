@@ -0,0 +1,433 @@
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import queue
+import base64
+import argparse
+import threading
+from collections import OrderedDict, deque
+from email.parser import BytesParser
+from email.policy import default as email_policy
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from dotenv import load_dotenv
+
+from src.convert_to_md import docx_to_markdown
+from src.optimize_resume import generate_compact_prompt
+from src.adapt_resume import generate_adapted_text, clean_adapted_markdown, load_api_keys
+from src.ats_score import score_delta
+from src.export_resume import (markdown_to_html, check_theme_name, resolve_theme, ASSETS_DIR,
+                               PDF_BACKENDS, DEFAULT_PDF_BACKEND)
+from src.pdf_renderer import WkhtmltopdfBackend, restricted_pdf_options
+from src.llm_clients import get_openai_client
+from src.rate_limit import limiter_stats
+from src.timing import span, get_tracer
+
+# Resume tailoring as a long-running HTTP service:
+#
+#   python -m src.service --port 8080 --workers 4
+#   curl -F docx=@cv.docx -F job_description=@job.txt http://127.0.0.1:8080/jobs
+#   curl http://127.0.0.1:8080/jobs/<id>            # status and stage timings
+#   curl -o cv.pdf http://127.0.0.1:8080/jobs/<id>/result
+#   curl http://127.0.0.1:8080/metrics
+
+# -------------------- SETTINGS --------------------
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 100
+# Finished jobs (and their PDFs) kept in memory for the result endpoint
+DEFAULT_MAX_JOBS = 500
+MAX_UPLOAD_BYTES = int(os.getenv("RESUME_SERVICE_MAX_UPLOAD_MB", "10")) * 1024 * 1024
+
+STAGES = ("convert_docx", "generate_prompt", "adapt_resume", "ats_score", "convert_md_to_html", "convert_html_to_pdf")
+# Latency samples kept per stage for the percentiles in /metrics
+LATENCY_WINDOW = 1000
+
+RESULT_FORMATS = {
+    "pdf": ("pdf", "application/pdf"),
+    "markdown": ("markdown", "text/markdown; charset=utf-8"),
+    "html": ("html", "text/html; charset=utf-8"),
+}
+
+def _percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+# -------------------- SERVICE --------------------
+
+class ResumeService:
+    """
+    Job queue plus a fixed pool of warm worker threads.
+
+    Each worker loads the API keys once, keeps the pooled LLM clients alive
+    and owns its own PDF backend instance (Qt objects are bound to the thread
+    that creates them), so a request pays none of the startup costs of
+    `python main.py`. Jobs run entirely in memory: DOCX bytes in, PDF bytes out.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 max_jobs: int = DEFAULT_MAX_JOBS, pdf_backend: str = None, theme: str = None,
+                 token_budget: int = None, hedge: bool = False):
+        self.workers = max(1, workers)
+        self.max_jobs = max_jobs
+        self.pdf_backend = pdf_backend or os.getenv("RESUME_PDF_BACKEND") or DEFAULT_PDF_BACKEND
+        if self.pdf_backend not in PDF_BACKENDS:
+            raise ValueError(f"Unknown PDF backend '{self.pdf_backend}' (available: {', '.join(sorted(PDF_BACKENDS))})")
+        if self.pdf_backend == "qt":
+            raise ValueError("The qt PDF backend must run on the main thread and cannot be used by service workers")
+        self.theme = theme
+        self.token_budget = token_budget
+        self.hedge = hedge
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.jobs = OrderedDict()  # id -> job, oldest first
+        self.lock = threading.Lock()
+        self.busy = 0
+        self.started_at = time.time()
+        self.latencies = {stage: deque(maxlen=LATENCY_WINDOW) for stage in STAGES + ("total",)}
+        self.counters = {"submitted": 0, "done": 0, "failed": 0, "rejected": 0}
+        self._threads = []
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"resume-worker-{i + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        for _ in self._threads:
+            self.queue.put(None)  # One sentinel per worker
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    # -------------------- JOBS --------------------
+
+    def submit(self, docx: bytes, job_description: str, filename: str = None, theme: str = None) -> dict:
+        """
+        Queue a resume for tailoring. A client-supplied `theme` must name a
+        theme under assets/themes/; only the service's own default may be a path.
+
+        Raises:
+            queue.Full: If the queue is at capacity.
+            ValueError: If `theme` is a path or an unknown theme.
+        """
+        if theme is not None:
+            check_theme_name(theme)
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "status": "queued",
+            "filename": filename,
+            "theme": theme or self.theme,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "stages": {},
+            "score": None,
+            "error": None,
+        }
+        with self.lock:
+            try:
+                self.queue.put_nowait((job, docx, job_description))
+            except queue.Full:
+                self.counters["rejected"] += 1
+                raise
+            self.jobs[job["id"]] = job
+            self.counters["submitted"] += 1
+            self._evict()
+        return job
+
+    def _evict(self) -> None:
+        # Drop the oldest finished jobs once more than max_jobs are kept
+        excess = len(self.jobs) - self.max_jobs
+        for job_id in [job_id for job_id, job in self.jobs.items() if job["status"] in ("done", "failed")][:max(0, excess)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> dict:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def status(self, job: dict) -> dict:
+        """
+        Public view of a job (results are served separately).
+        """
+        return {key: value for key, value in job.items() if not key.startswith("_")}
+
+    # -------------------- WORKERS --------------------
+
+    def _worker(self) -> None:
+        keys = load_api_keys()
+        if keys.get("openai"):
+            get_openai_client(keys["openai"])  # Open the pooled client before the first request
+        if PDF_BACKENDS[self.pdf_backend] is WkhtmltopdfBackend:
+            # Uploaded resumes are untrusted: wkhtmltopdf may only read theme and font files
+            backend = WkhtmltopdfBackend(restricted_pdf_options([ASSETS_DIR, resolve_theme(self.theme)]))
+        else:
+            backend = PDF_BACKENDS[self.pdf_backend]()
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                try:
+                    self._process(*item, keys=keys, backend=backend)
+                finally:
+                    self.queue.task_done()
+        finally:
+            backend.close()
+
+    def _process(self, job: dict, docx: bytes, job_description: str, keys: dict, backend) -> None:
+        with self.lock:
+            self.busy += 1
+            job.update(status="running", started_at=time.time())
+        start = time.perf_counter()
+        try:
+            with span("service.job", id=job["id"]) as root:
+                try:
+                    with span("convert_docx"):
+                        md_resume = docx_to_markdown(docx)
+                    if not md_resume.strip():
+                        raise ValueError("The .docx file contains no content")
+                    with span("generate_prompt"):
+                        prompt, _ = generate_compact_prompt(md_resume, job_description, self.token_budget)
+                    with span("adapt_resume"):
+                        _, raw, _ = generate_adapted_text(prompt, keys, hedge=self.hedge)
+                        adapted_md = clean_adapted_markdown(raw)
+                    with span("ats_score"):
+                        score = score_delta(md_resume, adapted_md, job_description)
+                    with span("convert_md_to_html"):
+                        html = markdown_to_html(adapted_md, for_editor=False, theme=job["theme"], safe=True)
+                    with span("convert_html_to_pdf"):
+                        pdf = backend.render_string(html)
+                finally:
+                    get_tracer().discard(root)
+            job.update(_markdown=adapted_md, _html=html, _pdf=pdf, score=score, status="done")
+            print(f"✅ [{job['id']}] Resume ready in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            job.update(status="failed", error=f"{type(e).__name__}: {e}")
+            print(f"❌ [{job['id']}] {job['error']}")
+        finally:
+            stages = {child["name"]: child["duration"] for child in root.get("children", [])}
+            total = round(time.perf_counter() - start, 4)
+            with self.lock:
+                self.busy -= 1
+                job.update(stages=stages, finished_at=time.time(), elapsed_seconds=total)
+                self.counters[job["status"]] += 1
+                for stage, duration in stages.items():
+                    self.latencies[stage].append(duration)
+                self.latencies["total"].append(total)
+
+    # -------------------- METRICS --------------------
+
+    def metrics(self) -> dict:
+        """
+        Queue depth, worker use, job counters, per-stage latency percentiles
+        over the last LATENCY_WINDOW jobs and the LLM rate limiter state.
+        """
+        with self.lock:
+            states = {}
+            for job in self.jobs.values():
+                states[job["status"]] = states.get(job["status"], 0) + 1
+            latency = {
+                stage: {
+                    "count": len(samples),
+                    "p50": round(_percentile(samples, 50), 4),
+                    "p95": round(_percentile(samples, 95), 4),
+                    "p99": round(_percentile(samples, 99), 4),
+                    "mean": round(sum(samples) / len(samples), 4) if samples else 0.0,
+                }
+                for stage, samples in self.latencies.items()
+            }
+            return {
+                "uptime_seconds": round(time.time() - self.started_at, 1),
+                "queue_depth": self.queue.qsize(),
+                "queue_capacity": self.queue.maxsize,
+                "workers": self.workers,
+                "busy_workers": self.busy,
+                "pdf_backend": self.pdf_backend,
+                "jobs": states,
+                "counters": dict(self.counters),
+                "latency_seconds": latency,
+                "rate_limits": limiter_stats(),
+            }
+
+# -------------------- HTTP --------------------
+
+def parse_upload(content_type: str, body: bytes) -> dict:
+    """
+    Read the fields of a job upload.
+
+    Accepts multipart/form-data (`docx` file, `job_description` text or file,
+    optional `theme`) or JSON with `docx` as base64.
+
+    Returns:
+        dict: `docx` (bytes), `job_description` (str), `filename` and `theme`.
+    """
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser(policy=email_policy).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body)
+        fields = {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if name:
+                fields[name] = (part.get_payload(decode=True) or b"", part.get_filename())
+        docx, filename = fields.get("docx", (None, None))
+        job_description = fields.get("job_description", (b"", None))[0].decode("utf-8", errors="replace")
+        theme = fields.get("theme", (b"", None))[0].decode("utf-8") or None
+        return {"docx": docx, "job_description": job_description, "filename": filename, "theme": theme}
+
+    if content_type.startswith("application/json"):
+        record = json.loads(body or b"{}")
+        if not isinstance(record, dict):
+            raise ValueError("Expected a JSON object")
+        if not isinstance(record.get("job_description") or "", str):
+            raise ValueError("'job_description' must be a string")
+        docx = base64.b64decode(record["docx"]) if record.get("docx") else None
+        return {"docx": docx, "job_description": record.get("job_description") or "",
+                "filename": record.get("filename"), "theme": record.get("theme")}
+
+    raise ValueError("Expected multipart/form-data or application/json")
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """
+    Routes:
+        POST /jobs                  Upload a DOCX and a job description (202 + job id)
+        GET  /jobs/<id>             Job status, score and per-stage timings
+        GET  /jobs/<id>/result      Tailored resume (?format=pdf|markdown|html)
+        GET  /metrics               Queue depth, workers and stage latency percentiles
+        GET  /health                Liveness check
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self) -> ResumeService:
+        return self.server.service
+
+    def log_message(self, *args):
+        pass  # Jobs are logged by the workers
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: dict = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json", headers)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            return self._send_json(200, {"status": "ok"})
+        if url.path == "/metrics":
+            return self._send_json(200, self.service.metrics())
+
+        match = re.fullmatch(r"/jobs/([0-9a-f]+)(/result)?", url.path)
+        job = self.service.get(match.group(1)) if match else None
+        if job is None:
+            return self._send_json(404, {"error": "Not found"})
+        if not match.group(2):
+            return self._send_json(200, self.service.status(job))
+
+        if job["status"] != "done":
+            return self._send_json(409, {"error": f"Job is {job['status']}", "status": job["status"]})
+        fmt = parse_qs(url.query).get("format", ["pdf"])[0]
+        if fmt not in RESULT_FORMATS:
+            return self._send_json(400, {"error": f"Unknown format '{fmt}' (use pdf, markdown or html)"})
+        key, content_type = RESULT_FORMATS[fmt]
+        content = job[f"_{key}"]
+        self._send(200, content if isinstance(content, bytes) else content.encode("utf-8"), content_type)
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/jobs":
+            return self._send_json(404, {"error": "Not found"})
+        if self.headers.get("Content-Length") is None:
+            self.close_connection = True
+            return self._send_json(411, {"error": "Content-Length is required"})
+        try:
+            length = int(self.headers["Content-Length"])
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            return self._send_json(400, {"error": "Invalid Content-Length"})
+        if length > MAX_UPLOAD_BYTES:
+            self.close_connection = True
+            return self._send_json(413, {"error": f"Upload larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB"})
+        try:
+            upload = parse_upload(self.headers.get("Content-Type", ""), self.rfile.read(length))
+        except (ValueError, KeyError) as e:
+            return self._send_json(400, {"error": str(e)})
+        if not upload["docx"] or not upload["job_description"].strip():
+            return self._send_json(400, {"error": "Both 'docx' and 'job_description' are required"})
+
+        try:
+            job = self.service.submit(upload["docx"], upload["job_description"].strip(),
+                                      upload["filename"], upload["theme"])
+        except ValueError as e:
+            return self._send_json(400, {"error": str(e)})
+        except queue.Full:
+            return self._send_json(503, {"error": "Queue is full, retry later"}, {"Retry-After": "5"})
+        self._send_json(202, {
+            "id": job["id"],
+            "status": job["status"],
+            "status_url": f"/jobs/{job['id']}",
+            "result_url": f"/jobs/{job['id']}/result",
+        }, {"Location": f"/jobs/{job['id']}"})
+
+def make_server(service: ResumeService, host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+    """
+    Build the HTTP server for a started service (port 0 picks a free port).
+    """
+    server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Resume tailoring HTTP service")
+    parser.add_argument("--host", default=os.getenv("RESUME_SERVICE_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("RESUME_SERVICE_PORT", "8080")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("RESUME_SERVICE_WORKERS", DEFAULT_WORKERS)),
+                        help="Jobs processed concurrently")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Queued jobs before uploads are rejected with 503")
+    parser.add_argument("--max-jobs", type=int, default=DEFAULT_MAX_JOBS,
+                        help="Finished jobs kept in memory for the result endpoint")
+    parser.add_argument("--pdf-backend", default=None, help="PDF backend (default: RESUME_PDF_BACKEND or wkhtmltopdf)")
+    parser.add_argument("--theme", default=None, help="Default theme for rendered resumes")
+    parser.add_argument("--token-budget", type=int, default=None, help="Maximum prompt size in tokens")
+    parser.add_argument("--hedge", action="store_true", help="Race Gemini against a slow OpenAI call")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    if args.token_budget is None and os.getenv("RESUME_PROMPT_TOKEN_BUDGET"):
+        args.token_budget = int(os.getenv("RESUME_PROMPT_TOKEN_BUDGET"))
+    service = ResumeService(workers=args.workers, queue_size=args.queue_size, max_jobs=args.max_jobs,
+                            pdf_backend=args.pdf_backend, theme=args.theme, token_budget=args.token_budget,
+                            hedge=args.hedge)
+    service.start()
+    server = make_server(service, args.host, args.port)
+    print(f"🚀 Resume service on http://{args.host}:{server.server_address[1]} "
+          f"({service.workers} workers, {service.pdf_backend} PDF backend)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Shutting down...")
+    finally:
+        server.shutdown()
+        service.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import json  # Module for writing the timing report
+import time  # Module for high-resolution timestamps
+import threading  # Module for per-thread span stacks
+from contextlib import contextmanager  # Decorator for the span context manager
+from datetime import datetime  # Module for the run start timestamp
+
+class Tracer:
+    """
+    Collects nested timing spans for one pipeline run.
+
+    Spans opened inside another span on the same thread become its children;
+    spans opened on worker threads start their own tree, tagged with the
+    thread name.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.roots = []
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """
+        Time the enclosed block. Extra keyword arguments are stored with the span.
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        record = {"name": name, "start": round(time.perf_counter() - self._origin, 4), "duration": None}
+        if attrs:
+            record["attrs"] = attrs
+        if stack:
+            stack[-1].setdefault("children", []).append(record)
+        else:
+            if threading.current_thread() is not threading.main_thread():
+                record["thread"] = threading.current_thread().name
+            with self._lock:
+                self.roots.append(record)
+        stack.append(record)
+        begin = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record["error"] = type(e).__name__
+            raise
+        finally:
+            record["duration"] = round(time.perf_counter() - begin, 4)
+            stack.pop()
+
+    def discard(self, record: dict) -> None:
+        """
+        Forget a finished top-level span, so long-running services do not keep
+        every request's spans in memory.
+        """
+        with self._lock:
+            self.roots = [root for root in self.roots if root is not record]
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {"started_at": self.started_at, "spans": list(self.roots)}
+
+    def write(self, path: str) -> None:
+        """
+        Save every recorded span as JSON.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+_tracer = Tracer()
+
+def get_tracer() -> Tracer:
+    """
+    Return the process-wide tracer.
+    """
+    return _tracer
+
+def span(name: str, **attrs):
+    """
+    Shortcut for `get_tracer().span(...)`:
+
+        with span("llm.openai", model=OPENAI_MODEL):
+            ...
+    """
+    return _tracer.span(name, **attrs)
@@ -0,0 +1,116 @@
+import os  # Module for interacting with the operating system
+import time  # Module for polling and debounce timing
+
+# Seconds between directory scans
+DEFAULT_POLL_INTERVAL = 1.0
+
+# A file must stay unchanged this long before it is handled (Word and file copies write in bursts)
+DEFAULT_DEBOUNCE = 2.0
+
+def scan(folder: str, suffix: str) -> dict:
+    """
+    Stat every file ending in `suffix` with a single os.scandir pass.
+
+    Parameters:
+        folder (str): Directory to scan.
+        suffix (str): File extension to keep, e.g. ".docx".
+
+    Returns:
+        dict: File name -> (mtime_ns, size). Word lock files (`~$*`) are ignored.
+    """
+    files = {}
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if not entry.name.endswith(suffix) or entry.name.startswith("~$"):
+                    continue
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+                except FileNotFoundError:
+                    continue  # Deleted between listing and stat
+    except FileNotFoundError:
+        pass
+    return files
+
+def file_signature(path: str) -> tuple:
+    """
+    (mtime_ns, size) of a file, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+class ChangeDetector:
+    """
+    Debounced change detection over (mtime, size) signatures.
+
+    `update` is fed the current signature of every watched key on each poll
+    and returns the keys whose new signature has been stable for `debounce`
+    seconds and differs from the last one reported. A burst of writes
+    therefore produces a single event once the file settles.
+    """
+
+    def __init__(self, debounce: float = DEFAULT_DEBOUNCE, initial: dict = None):
+        self.debounce = debounce
+        self.reported = dict(initial or {})  # key -> signature already handled
+        self.pending = {}  # key -> (signature, first seen at)
+
+    def update(self, signatures: dict, now: float = None) -> list:
+        now = time.monotonic() if now is None else now
+        ready = []
+        for key, signature in signatures.items():
+            if signature is None or signature == self.reported.get(key):
+                self.pending.pop(key, None)
+                continue
+            seen = self.pending.get(key)
+            if seen is None or seen[0] != signature:
+                self.pending[key] = (signature, now)  # New or still being written: restart the timer
+            elif now - seen[1] >= self.debounce:
+                del self.pending[key]
+                self.reported[key] = signature
+                ready.append(key)
+        for key in set(self.reported) - set(signatures):
+            del self.reported[key]  # Deleted: handle it again if it comes back
+        for key in set(self.pending) - set(signatures):
+            del self.pending[key]
+        return sorted(ready)
+
+def watch(docx_dir: str, job_path: str, handle, poll_interval: float = DEFAULT_POLL_INTERVAL,
+          debounce: float = DEFAULT_DEBOUNCE, stop=None) -> None:
+    """
+    Poll `docx_dir` and `job_path` and call `handle` with the affected work.
+
+    Files present at startup are treated as already handled. Each cycle:
+    - every new or edited .docx is queued once it has settled;
+    - a settled change to the job description queues the newest .docx
+      (the resume the regular pipeline would use), unless it is already queued.
+
+    Work runs in the calling thread, one document at a time, so clients and
+    renderers created by the handler stay warm between events.
+
+    Parameters:
+        docx_dir (str): Folder of input resumes.
+        job_path (str): Job description file.
+        handle (callable): Called with (docx_filename, reason); reason is "docx" or "job".
+        poll_interval (float): Seconds between scans.
+        debounce (float): Seconds a file must stay unchanged before it is handled.
+        stop (callable): Returns True to end the loop (default: run until interrupted).
+    """
+    docs = scan(docx_dir, ".docx")
+    docx_changes = ChangeDetector(debounce, docs)
+    job_changes = ChangeDetector(debounce, {job_path: file_signature(job_path)})
+
+    while not (stop and stop()):
+        docs = scan(docx_dir, ".docx")
+        queue = [(name, "docx") for name in docx_changes.update(docs)]
+        if job_changes.update({job_path: file_signature(job_path)}) and docs:
+            latest = max(docs, key=lambda name: docs[name][0])
+            if latest not in {name for name, _ in queue}:
+                queue.append((latest, "job"))
+        for name, reason in queue:
+            handle(name, reason)
+        time.sleep(poll_interval)
@@ -0,0 +1,29 @@
+from src import adapt_resume
+from src.adapt_resume import generate_adapted_text, stream_to_file
+
+
+def test_each_streamed_heading_triggers_one_section_callback(tmp_path):
+    sections = []
+    # The second fragment ends with a whole "\n## ", the last heading is split across fragments
+    chunks = ["# Ada\n", "intro\n## ", "Skills\n- SQL", "\n#", "# Experience\n- ETL"]
+    result = stream_to_file(chunks, str(tmp_path / "adapted.md"), sections.append)
+    assert len(sections) == 2
+    assert result["text"] == "".join(chunks)
+
+
+def test_streaming_cache_hit_writes_the_file_and_renders_one_preview(tmp_path, monkeypatch):
+    class Cache:
+        def get_any(self, prompt, candidates):
+            return "openai", "## Skills\n- SQL\n\n## Experience\n- ETL\n"
+
+    previews = []
+    monkeypatch.setattr(adapt_resume, "get_default_cache", lambda: Cache())
+    monkeypatch.setattr(adapt_resume, "render_stream_preview", lambda md, html: previews.append(md))
+    output = str(tmp_path / "adapted.md")
+
+    provider, raw, from_cache = generate_adapted_text("prompt", keys={}, stream=True, output_path=output,
+                                                      preview_path=str(tmp_path / "preview.html"))
+    assert (provider, from_cache) == ("openai", True)
+    assert previews == [output]
+    with open(output, encoding="utf-8") as f:
+        assert f.read() == raw
@@ -0,0 +1,19 @@
+import os
+import re
+
+from src.export_resume import compile_template, markdown_to_html, resolve_theme
+
+RESUME = "# Ada Lovelace\n**Data Engineer**\n\n## Experience\n- Built pipelines.\n"
+
+
+def test_jobs_in_different_folders_share_one_compiled_template(tmp_path):
+    compile_template.cache_clear()
+    stylesheet = os.path.join(resolve_theme(), "resume.css")
+    for html_dir in (tmp_path / "job_1", tmp_path / "nested" / "job_2"):
+        html = markdown_to_html(RESUME, html_dir=str(html_dir), embed_fonts=False)
+        # Links stay relative to each job's own folder
+        hrefs = re.findall(r'<link rel="stylesheet" href="([^"]+)">', html)
+        assert os.path.normpath(os.path.join(html_dir, hrefs[0])) == stylesheet
+    info = compile_template.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
@@ -0,0 +1,12 @@
+from src.llm_cache import ResponseCache
+
+
+def test_overwriting_an_entry_keeps_size_and_count_accurate(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    for i in range(5):
+        cache.put("same prompt", "openai", "gpt-4o-mini", 0.25, "x" * (10 + i))
+    cache.put("other prompt", "openai", "gpt-4o-mini", 0.25, "y")
+    running = (cache._bytes, cache._entries)
+    cache.evict()  # Rescans the directory
+    assert running == (cache._bytes, cache._entries)
+    assert cache._entries == 2
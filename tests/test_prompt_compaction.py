@@ -0,0 +1,67 @@
+from src.prompt_compaction import compact_job_description, count_tokens
+
+ABOUT_US_FIRST = """About us
+We are a fast-growing fintech company based in Madrid.
+What you'll do
+Build and maintain data pipelines in Python and Airflow.
+Requirements
+5+ years of SQL experience."""
+
+PRIVACY_REQUIREMENT = """Responsibilities
+Design the data platform for analytics teams.
+Requirements
+Privacy engineering experience with GDPR tooling
+3+ years with Python, SQL and Kafka.
+Strong knowledge of data modelling."""
+
+UNBULLETED_BENEFITS = """What you'll do
+Build and maintain data pipelines in Python and Airflow.
+Benefits
+Flexible working hours
+Private health insurance
+Yearly budget for Python and SQL conferences
+About us
+A fast-growing fintech company
+Offices in Madrid and Lisbon
+Requirements
+5+ years of SQL experience."""
+
+
+def test_about_us_section_is_kept_without_budget():
+    text, report = compact_job_description(ABOUT_US_FIRST)
+    assert "5+ years of SQL experience." in text
+    assert "Build and maintain data pipelines" in text
+    assert report["removed_sections"] == 0
+
+
+def test_line_starting_with_privacy_is_not_a_boilerplate_heading():
+    text, report = compact_job_description(PRIVACY_REQUIREMENT)
+    assert "Privacy engineering experience with GDPR tooling" in text
+    assert "3+ years with Python, SQL and Kafka." in text
+    assert "Strong knowledge of data modelling." in text
+    assert report["compacted_tokens"] == report["original_tokens"]
+
+
+def test_budget_drops_boilerplate_sections_first():
+    text, report = compact_job_description(ABOUT_US_FIRST, max_tokens=30)
+    assert "fintech company" not in text
+    assert "5+ years of SQL experience." in text
+    assert report["removed_sections"] == 1
+    assert count_tokens(text) <= 30
+
+
+def test_falls_back_to_original_when_most_text_is_removed():
+    job_description = ("We are an equal opportunity employer. Reasonable accommodation is available. "
+                       "Background check required. Python developer.")
+    text, report = compact_job_description(job_description)
+    assert text == job_description
+    assert report["fallback"] is True
+
+
+def test_unbulleted_lines_stay_in_their_boilerplate_section():
+    # Short lines listed under a heading are body text, not headings of their own
+    text, report = compact_job_description(UNBULLETED_BENEFITS, max_tokens=30)
+    assert report["removed_sections"] == 2
+    assert report["removed_for_budget"] == 7  # The two sections, headings included, and nothing else
+    assert text == ("What you'll do\nBuild and maintain data pipelines in Python and Airflow.\n"
+                    "Requirements\n5+ years of SQL experience.")
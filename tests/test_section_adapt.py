@@ -0,0 +1,25 @@
+from src import section_adapt
+
+RESUME = "# Eve\n\n## Summary\nData person.\n\n## Skills\n- Python\n"
+
+
+def test_unchanged_sections_are_reused_from_the_manifest(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_generate(prompt, keys, hedge=False):
+        calls.append(prompt)
+        return "openai", "## Heading\nAdapted.", False  # As if the response cache were disabled
+
+    monkeypatch.setattr(section_adapt, "load_api_keys", lambda: {})
+    monkeypatch.setattr(section_adapt, "generate_adapted_text", fake_generate)
+    output = str(tmp_path / "adapted_resume.md")
+
+    first = section_adapt.adapt_sections(RESUME, "Python role", output)
+    second = section_adapt.adapt_sections(RESUME, "Python role", output)
+    third = section_adapt.adapt_sections(RESUME.replace("Python", "Python, SQL"), "Python role", output)
+
+    assert (first["adapted"], first["reused"]) == (2, 0)
+    assert (second["adapted"], second["reused"]) == (0, 2)
+    assert second["markdown"] == first["markdown"]
+    assert (third["adapted"], third["reused"]) == (1, 1)
+    assert len(calls) == 3
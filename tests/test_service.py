@@ -0,0 +1,44 @@
+import json
+import threading
+import http.client
+
+import pytest
+
+from src.service import ResumeService, make_server, parse_upload
+
+
+@pytest.fixture
+def server():
+    server = make_server(ResumeService(), port=0)  # Workers are not started: no job runs
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post_jobs(server, body: bytes, content_length: str = None) -> tuple:
+    connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+    connection.putrequest("POST", "/jobs")
+    connection.putheader("Content-Type", "application/json")
+    if content_length is not None:
+        connection.putheader("Content-Length", content_length)
+    connection.endheaders(body)
+    response = connection.getresponse()
+    result = response.status, json.loads(response.read())
+    connection.close()
+    return result
+
+
+@pytest.mark.parametrize("body", [b"[]", b'"x"', b"3", b'{"docx": "", "job_description": ["x"]}'])
+def test_json_upload_that_is_not_an_object_is_rejected(server, body):
+    with pytest.raises(ValueError):
+        parse_upload("application/json", body)
+    status, payload = post_jobs(server, body, str(len(body)))
+    assert status == 400
+    assert "error" in payload
+
+
+@pytest.mark.parametrize("content_length, status", [(None, 411), ("-1", 400), ("abc", 400)])
+def test_missing_or_invalid_content_length_is_rejected(server, content_length, status):
+    # The handler must answer without waiting for a body it cannot size
+    assert post_jobs(server, b"", content_length)[0] == status